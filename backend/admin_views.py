@@ -0,0 +1,430 @@
+import datetime
+
+from flask import Blueprint, Response, abort, current_app, request, jsonify, stream_with_context
+from sqlalchemy.exc import IntegrityError
+
+from extensions import (
+    db, image_store, invalidation_bus, auction_scheduler, lot_registry, event_broker,
+    refresh_lot_registry, publish_status_transitions, STATS_SOURCES
+)
+from invalidation_bus import USER, CARRIER, AUCTION
+from models import User, Carrier, Auction, Lot
+from auth import admin_required
+from auction_export import EXPORT_FORMATS, EXPORT_REPORTS, open_report, iter_csv, iter_xlsx
+from auction_scheduler import apply_status_transitions
+from image_store import ImageFetchError
+from pagination import paginate
+from serializers import USER as USER_FIELDS, ADMIN_AUCTION_LIST, ADMIN_AUCTION, ADMIN_LOT
+from view_helpers import allowed_file, parse_datetime_string, filter_bool_arg, filter_datetime_arg, filter_int_arg
+from winners import determine_winners
+
+# lot_ingest, user_import and auction_export pull in pandas/openpyxl, so the endpoints
+# that use them import them on first use and other workers never load the spreadsheet stack.
+admin_bp = Blueprint("admin", __name__, url_prefix="/admin")
+
+# --- Admin User Management Endpoints ---
+@admin_bp.route('/users', methods=['POST'])
+@admin_required
+def create_user_by_admin(current_admin):
+    data = request.get_json()
+    if not data or not data.get('email') or not data.get('password'):
+        return jsonify({'message': 'Email and password are required for new user'}), 400
+    if User.query.filter_by(email=data['email']).first():
+        return jsonify({'message': 'User with this email already exists'}), 409
+    new_user = User(
+        email=data['email'],
+        company_name=data.get('company_name'),
+        role=data.get('role', 'client'),  # Default to client, admin can specify
+        deposit_status=data.get('deposit_status', 'pending'),
+        is_active=data.get('is_active', True)
+    )
+    new_user.set_password(data['password'])
+    db.session.add(new_user)
+    db.session.commit()
+    return jsonify({'message': 'User created successfully', 'user_id': new_user.user_id}), 201
+
+@admin_bp.route('/users', methods=['GET'])
+@admin_required
+def get_all_users_by_admin(current_admin):
+    fields = USER_FIELDS.requested()
+    query = db.session.query(*USER_FIELDS.columns(fields, keys=['user_id']))
+    if request.args.get('role'):
+        query = query.filter(User.role == request.args['role'])
+    if request.args.get('deposit_status'):
+        query = query.filter(User.deposit_status == request.args['deposit_status'])
+    is_active = filter_bool_arg('is_active')
+    if is_active is not None:
+        query = query.filter(User.is_active == is_active)
+    users, next_cursor = paginate(query, [User.user_id], descending=False)
+    return jsonify({'users': USER_FIELDS.dump(users, fields), 'next_cursor': next_cursor})
+
+@admin_bp.route('/users/<int:user_id>', methods=['GET'])
+@admin_required
+def get_user_by_admin(current_admin, user_id):
+    fields = USER_FIELDS.requested()
+    user = db.session.query(*USER_FIELDS.columns(fields)).filter(User.user_id == user_id).first()
+    if user is None:
+        abort(404)
+    return jsonify(USER_FIELDS.dump_one(user, fields))
+
+@admin_bp.route('/users/<int:user_id>', methods=['PUT'])
+@admin_required
+def update_user_by_admin(current_admin, user_id):
+    user = User.query.get_or_404(user_id)
+    data = request.get_json()
+    if 'email' in data and data['email'] != user.email:
+        if User.query.filter_by(email=data['email']).first():
+            return jsonify({'message': 'User with this email already exists'}), 409
+        user.email = data['email']
+    if 'password' in data and data['password']: # Allow changing password
+        user.set_password(data['password'])
+    user.company_name = data.get('company_name', user.company_name)
+    user.role = data.get('role', user.role)
+    user.deposit_status = data.get('deposit_status', user.deposit_status)
+    user.is_active = data.get('is_active', user.is_active)
+    db.session.commit()
+    invalidation_bus.publish(USER, [user_id])
+    return jsonify({'message': 'User updated successfully'})
+
+@admin_bp.route('/users/<int:user_id>', methods=['DELETE'])
+@admin_required
+def delete_user_by_admin(current_admin, user_id):
+    user = User.query.get_or_404(user_id)
+    if user.email == 'admin@phonescanada.com': # Prevent deleting the default admin
+        return jsonify({'message': 'Cannot delete the primary admin account'}), 403
+    db.session.delete(user)
+    db.session.commit()
+    invalidation_bus.publish(USER, [user_id])
+    return jsonify({'message': 'User deleted successfully'})
+
+def bulk_user_records():
+    """Rows of a bulk user request: an uploaded CSV/XLSX ("file") or a JSON array."""
+    from user_import import UserImportError, records_from_frames, records_from_json
+    if "file" in request.files:
+        from lot_ingest import iter_csv_chunks, iter_xlsx_chunks
+        file = request.files["file"]
+        if not allowed_file(file.filename):
+            raise UserImportError("File type not allowed")
+        chunk_rows = current_app.config["LOT_UPLOAD_CHUNK_ROWS"]
+        if file.filename.rsplit(".", 1)[1].lower() == "csv":
+            return records_from_frames(iter_csv_chunks(file.stream, chunk_rows))
+        return records_from_frames(iter_xlsx_chunks(file.stream, chunk_rows))
+    return records_from_json(request.get_json(silent=True))
+
+@admin_bp.route('/users/bulk-create', methods=['POST'])
+@admin_required
+def bulk_create_users(current_admin):
+    from user_import import UserImportError, create_users
+    try:
+        results, created = create_users(bulk_user_records())
+    except UserImportError as e:
+        return jsonify({'message': str(e)}), 400
+    try:
+        db.session.commit()
+    except IntegrityError:
+        # An email taken by a concurrent request after the uniqueness check.
+        db.session.rollback()
+        return jsonify({'message': 'Another request created one of these users meanwhile. No users were created; please retry.'}), 409
+    return jsonify({
+        'message': f'Created {created} users; {len(results) - created} rows failed.',
+        'created': created,
+        'failed': len(results) - created,
+        'results': results
+    }), 201 if created else 200
+
+@admin_bp.route('/users/bulk-update', methods=['POST'])
+@admin_required
+def bulk_update_users(current_admin):
+    from user_import import UserImportError, update_users
+    try:
+        results, user_ids = update_users(bulk_user_records())
+    except UserImportError as e:
+        return jsonify({'message': str(e)}), 400
+    db.session.commit()
+    invalidation_bus.publish(USER, user_ids)
+    updated = sum(1 for result in results if result['status'] == 'updated')
+    return jsonify({
+        'message': f'Updated {len(user_ids)} users; {len(results) - updated} rows failed.',
+        'updated': len(user_ids),
+        'failed': len(results) - updated,
+        'results': results
+    })
+
+@admin_bp.route('/stats', methods=['GET'])
+@admin_required
+def get_runtime_stats(current_admin):
+    return jsonify({name: stats() for name, stats in STATS_SOURCES.items()})
+
+# --- Carrier Management Endpoints ---
+@admin_bp.route("/carriers", methods=["POST"])
+@admin_required
+def create_carrier(current_admin):
+    data = request.get_json()
+    if not data or not data.get("name"):
+        return jsonify({"message": "Carrier name is required"}), 400
+    if Carrier.query.filter_by(name=data["name"]).first():
+        return jsonify({"message": "Carrier with this name already exists"}), 409
+
+    new_carrier = Carrier(name=data["name"])
+    db.session.add(new_carrier)
+    db.session.commit()
+    invalidation_bus.publish(CARRIER, [new_carrier.carrier_id])
+    return jsonify({"message": "Carrier created successfully", "carrier_id": new_carrier.carrier_id}), 201
+
+@admin_bp.route("/carriers", methods=["GET"])
+@admin_required
+def get_all_carriers(current_admin):
+    carriers, next_cursor = paginate(Carrier.query, [Carrier.carrier_id], descending=False)
+    output = []
+    for carrier_obj in carriers: # Renamed carrier to carrier_obj
+        output.append({
+            "carrier_id": carrier_obj.carrier_id,
+            "name": carrier_obj.name,
+            "created_at": carrier_obj.created_at.isoformat() if carrier_obj.created_at else None
+        })
+    return jsonify({"carriers": output, "next_cursor": next_cursor})
+
+# --- Auction Management Endpoints ---
+@admin_bp.route("/auctions", methods=["POST"])
+@admin_required
+def create_auction(current_admin):
+    data = request.get_json()
+    required_fields = ["name", "carrier_id", "end_time"]
+    for field in required_fields:
+        if field not in data or not data[field]:
+            return jsonify({"message": f"{field} is required"}), 400
+
+    carrier = Carrier.query.get(data["carrier_id"])
+    if not carrier:
+        return jsonify({"message": "Carrier not found"}), 404
+
+    end_time_obj = parse_datetime_string(data["end_time"])
+    if not end_time_obj:
+        return jsonify({"message": "Invalid end_time format. Use ISO format like YYYY-MM-DDTHH:MM:SSZ or YYYY-MM-DDTHH:MM:SS+00:00"}), 400
+
+    start_time_obj = parse_datetime_string(data.get("start_time")) if data.get("start_time") else datetime.datetime.now(datetime.timezone.utc)
+
+    new_auction = Auction(
+        name=data["name"],
+        carrier_id=data["carrier_id"],
+        start_time=start_time_obj,
+        end_time=end_time_obj,
+        status=data.get("status", "scheduled"),
+        grading_guide=data.get("grading_guide"),
+        is_visible=data.get("is_visible", False),
+        created_by_user_id=current_admin.user_id
+    )
+    db.session.add(new_auction)
+    db.session.commit()
+    auction_scheduler.schedule(new_auction)
+    invalidation_bus.publish(AUCTION, [new_auction.auction_id])
+    lot_registry.load(new_auction.auction_id)
+    return jsonify({"message": "Auction created successfully", "auction_id": new_auction.auction_id}), 201
+
+@admin_bp.route("/auctions", methods=["GET"])
+@admin_required
+def get_all_auctions(current_admin):
+    fields = ADMIN_AUCTION_LIST.requested()
+    query = db.session.query(*ADMIN_AUCTION_LIST.columns(fields, keys=["auction_id"]))
+    if request.args.get("status"):
+        query = query.filter(Auction.status == request.args["status"])
+    carrier_id = filter_int_arg("carrier_id")
+    if carrier_id is not None:
+        query = query.filter(Auction.carrier_id == carrier_id)
+    is_visible = filter_bool_arg("is_visible")
+    if is_visible is not None:
+        query = query.filter(Auction.is_visible == is_visible)
+    ends_after = filter_datetime_arg("ends_after")
+    if ends_after:
+        query = query.filter(Auction.end_time >= ends_after)
+    ends_before = filter_datetime_arg("ends_before")
+    if ends_before:
+        query = query.filter(Auction.end_time < ends_before)
+    # Newest first; auction_id follows creation order and is the primary key.
+    auctions, next_cursor = paginate(query, [Auction.auction_id])
+    return jsonify({"auctions": ADMIN_AUCTION_LIST.dump(auctions, fields), "next_cursor": next_cursor})
+
+@admin_bp.route("/auctions/<int:auction_id>", methods=["GET"])
+@admin_required
+def get_auction_details(current_admin, auction_id):
+    """The auction with all of its lots; ?fields= picks auction fields and ?lot_fields= lot fields."""
+    fields = ADMIN_AUCTION.requested()
+    lot_fields = ADMIN_LOT.requested("lot_fields")
+    auction = db.session.query(*ADMIN_AUCTION.columns(fields)).filter(Auction.auction_id == auction_id).first()
+    if auction is None:
+        abort(404)
+    lots = db.session.query(*ADMIN_LOT.columns(lot_fields)).filter(Lot.auction_id == auction_id).all()
+    return jsonify({**ADMIN_AUCTION.dump_one(auction, fields), "lots": ADMIN_LOT.dump(lots, lot_fields)})
+
+@admin_bp.route("/auctions/<int:auction_id>", methods=["PUT"])
+@admin_required
+def update_auction(current_admin, auction_id):
+    auction = Auction.query.get_or_404(auction_id)
+    data = request.get_json()
+    previous_status, previous_visible, previous_end_time = auction.status, auction.is_visible, auction.end_time
+
+    auction.name = data.get("name", auction.name)
+    if "carrier_id" in data:
+        carrier = Carrier.query.get(data["carrier_id"])
+        if not carrier:
+            return jsonify({"message": "Carrier not found"}), 404
+        auction.carrier_id = data["carrier_id"]
+    if "start_time" in data:
+        st = parse_datetime_string(data["start_time"])
+        if not st: return jsonify({"message": "Invalid start_time format"}),400
+        auction.start_time = st
+    if "end_time" in data:
+        et = parse_datetime_string(data["end_time"])
+        if not et: return jsonify({"message": "Invalid end_time format"}),400
+        auction.end_time = et
+
+    auction.status = data.get("status", auction.status)
+    auction.grading_guide = data.get("grading_guide", auction.grading_guide)
+    auction.is_visible = data.get("is_visible", auction.is_visible)
+
+    auction.updated_at = datetime.datetime.now(datetime.timezone.utc)
+    db.session.commit()
+    auction_scheduler.schedule(auction)
+    invalidation_bus.publish(AUCTION, [auction_id])
+    lot_registry.load(auction_id)
+    if (auction.status, auction.is_visible) != (previous_status, previous_visible):
+        event_broker.publish("status", auction_id, {"status": auction.status, "is_visible": auction.is_visible})
+    if auction.end_time != previous_end_time:
+        event_broker.publish("end_time", auction_id, {"end_time": auction.end_time.isoformat()})
+    return jsonify({"message": "Auction updated successfully"})
+
+@admin_bp.route("/auctions/<int:auction_id>", methods=["DELETE"])
+@admin_required
+def delete_auction(current_admin, auction_id):
+    auction = Auction.query.get_or_404(auction_id)
+    db.session.delete(auction)
+    db.session.commit()
+    invalidation_bus.publish(AUCTION, [auction_id])
+    event_broker.publish("status", auction_id, {"status": "deleted"})
+    return jsonify({"message": "Auction deleted successfully"})
+
+@admin_bp.route("/auctions/<int:auction_id>/upload_lots", methods=["POST"])
+@admin_required
+def upload_lots_file(current_admin, auction_id):
+    auction = Auction.query.get_or_404(auction_id)
+    if "file" not in request.files:
+        return jsonify({"message": "No file part"}), 400
+    file = request.files["file"]
+    if file.filename == "":
+        return jsonify({"message": "No selected file"}), 400
+    if file and allowed_file(file.filename):
+        # The upload is parsed straight from its request-scoped spooled buffer in bounded
+        # chunks, so nothing is written under a shared path and memory does not grow with
+        # the size of the manifest.
+        from lot_ingest import ingest_lot_chunks, iter_csv_chunks, iter_xlsx_chunks, LotFileError
+        extension = file.filename.rsplit(".", 1)[1].lower()
+        chunk_rows = current_app.config["LOT_UPLOAD_CHUNK_ROWS"]
+        if extension == "csv":
+            chunks = iter_csv_chunks(file.stream, chunk_rows)
+        else:
+            chunks = iter_xlsx_chunks(file.stream, chunk_rows)
+
+        try:
+            lots_added, errors = ingest_lot_chunks(auction.auction_id, chunks)
+            if errors:
+                db.session.rollback()
+                return jsonify({"message": "Errors occurred while processing the file. No lots were added.", "errors": errors}), 400
+            db.session.commit()
+        except LotFileError as e:
+            db.session.rollback()
+            return jsonify({"message": str(e)}), 400
+        except Exception as e:
+            db.session.rollback()
+            return jsonify({"message": f"Error processing file: {str(e)}"}), 500
+
+        # Images are not fetched here: a manifest can reference thousands of remote images.
+        # POST /auctions/<id>/ingest_images or `flask ingest-images` copies them into the store.
+        invalidation_bus.publish(AUCTION, [auction_id])
+        lot_registry.load(auction_id)
+        return jsonify({
+            "message": f"Successfully added {lots_added} lots to auction {auction_id}",
+            "errors": errors
+        }), 201
+
+    else:
+        return jsonify({"message": "File type not allowed"}), 400
+
+@admin_bp.route("/auctions/<int:auction_id>/ingest_images", methods=["POST"])
+@admin_required
+def ingest_auction_images(current_admin, auction_id):
+    """(Re)try fetching the auction's lot images that are not in the image store yet."""
+    from lot_ingest import ingest_lot_images
+    auction = Auction.query.get_or_404(auction_id)
+    images_linked, image_errors = ingest_lot_images(image_store, auction.auction_id)
+    db.session.commit()
+    invalidation_bus.publish(AUCTION, [auction.auction_id])
+    return jsonify({"images_linked": images_linked, "image_errors": image_errors})
+
+@admin_bp.route("/lots/<int:lot_id>/image", methods=["POST"])
+@admin_required
+def upload_lot_image(current_admin, lot_id):
+    lot = Lot.query.get_or_404(lot_id)
+    file = request.files.get("file")
+    if file is None or file.filename == "":
+        return jsonify({"message": "No image file provided"}), 400
+    try:
+        image_key = image_store.put(file.stream.read(image_store.max_bytes + 1))
+    except ImageFetchError as e:
+        return jsonify({"message": str(e)}), 400
+    lot.image_key = image_key
+    db.session.commit()
+    invalidation_bus.publish(AUCTION, [lot.auction_id])
+    return jsonify({"message": "Image stored", "lot_id": lot_id, "image_key": image_key,
+                    **image_store.lot_image_urls(image_key, None)}), 201
+
+# --- Auction Status Processing Endpoint (Admin) ---
+@admin_bp.route("/auctions/process-statuses", methods=["POST"])
+@admin_required
+def process_auction_statuses(current_admin):
+    activated_ids, closed_ids = apply_status_transitions()
+    db.session.commit()
+    updated_count = len(activated_ids) + len(closed_ids)
+    if updated_count:
+        invalidation_bus.publish(AUCTION, [*activated_ids, *closed_ids])
+        refresh_lot_registry(activated_ids, closed_ids)
+        publish_status_transitions(activated_ids, closed_ids)
+    return jsonify({"message": f"Processed auction statuses. {updated_count} auctions updated."}), 200
+
+# --- Winner Determination Endpoint (Admin) ---
+@admin_bp.route("/auctions/<int:auction_id>/determine-winners", methods=["POST"])
+@admin_required
+def determine_winners_endpoint(current_admin, auction_id):
+    auction = Auction.query.get_or_404(auction_id)
+
+    if auction.status != "closed":
+        return jsonify({"message": "Winners can only be determined for closed auctions."}), 400
+
+    lots_processed, winners_determined = determine_winners(auction.auction_id)
+    db.session.commit()
+    invalidation_bus.publish(AUCTION, [auction.auction_id])
+    return jsonify({
+        "message": f"Winner determination complete for auction {auction.name}.",
+        "lots_processed": lots_processed,
+        "winners_determined": winners_determined
+    }), 200
+
+@admin_bp.route("/auctions/<int:auction_id>/export/<report>", methods=["GET"])
+@admin_required
+def export_auction_report(current_admin, auction_id, report):
+    """Stream an auction's winners, bid book or lot summary as CSV (default) or XLSX (?format=xlsx)."""
+    auction = Auction.query.get_or_404(auction_id)
+    if report not in EXPORT_REPORTS:
+        return jsonify({"message": f"Unknown report. Available reports: {', '.join(EXPORT_REPORTS)}"}), 404
+    export_format = request.args.get("format", "csv").lower()
+    if export_format not in EXPORT_FORMATS:
+        return jsonify({"message": f"Unsupported format. Use one of: {', '.join(EXPORT_FORMATS)}"}), 400
+
+    # Rows are fetched in batches and encoded as they arrive, so the response starts
+    # before the query finishes and memory does not grow with the auction's size.
+    batch_rows = current_app.config["EXPORT_BATCH_ROWS"]
+    result = open_report(report, auction.auction_id, batch_rows)
+    encode = iter_csv if export_format == "csv" else iter_xlsx
+    response = Response(stream_with_context(encode(result, batch_rows)), mimetype=EXPORT_FORMATS[export_format])
+    response.headers["Content-Disposition"] = f'attachment; filename="auction-{auction.auction_id}-{report}.{export_format}"'
+    response.headers["X-Accel-Buffering"] = "no" # Stop nginx from buffering the stream
+    return response
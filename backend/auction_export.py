@@ -0,0 +1,149 @@
+import csv
+import io
+import tempfile
+from datetime import datetime, timezone
+
+from sqlalchemy import func, select
+
+from extensions import db
+from models import User, Lot, Bid, AuctionWinner
+
+# Rows fetched per round trip; on PostgreSQL this is a server-side (named) cursor.
+DEFAULT_EXPORT_BATCH_ROWS = 2000
+# Bytes per chunk when streaming a finished XLSX file.
+XLSX_CHUNK_BYTES = 64 * 1024
+
+EXPORT_FORMATS = {
+    "csv": "text/csv",
+    "xlsx": "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+}
+
+
+def winners_report(auction_id):
+    return select(
+        Lot.lot_identifier.label("Lot ID"),
+        Lot.device_name.label("Device Name"),
+        Lot.quantity.label("Quantity"),
+        User.email.label("Winner Email"),
+        User.company_name.label("Winner Company"),
+        AuctionWinner.winning_amount.label("Winning Amount"),
+        AuctionWinner.awarded_at.label("Awarded At"),
+    ).select_from(AuctionWinner)\
+        .join(Lot, Lot.lot_id == AuctionWinner.lot_id)\
+        .join(User, User.user_id == AuctionWinner.user_id)\
+        .where(Lot.auction_id == auction_id)\
+        .order_by(Lot.lot_id)
+
+
+def bids_report(auction_id):
+    # Each lot's bids best first, the order winner determination ranks them in.
+    return select(
+        Lot.lot_identifier.label("Lot ID"),
+        Lot.device_name.label("Device Name"),
+        User.email.label("Bidder Email"),
+        User.company_name.label("Bidder Company"),
+        Bid.bid_amount.label("Bid Amount"),
+        Bid.bid_time.label("Bid Time"),
+        Bid.status.label("Status"),
+    ).select_from(Bid)\
+        .join(Lot, Lot.lot_id == Bid.lot_id)\
+        .join(User, User.user_id == Bid.user_id)\
+        .where(Lot.auction_id == auction_id)\
+        .order_by(Lot.lot_id, Bid.bid_amount.desc(), Bid.bid_time.asc())
+
+
+def lots_report(auction_id):
+    bid_totals = select(
+        Bid.lot_id,
+        func.count().label("bid_count"),
+        func.max(Bid.bid_amount).label("high_bid")
+    ).join(Lot, Lot.lot_id == Bid.lot_id)\
+        .where(Lot.auction_id == auction_id)\
+        .group_by(Bid.lot_id)\
+        .subquery("bid_totals")
+    return select(
+        Lot.lot_identifier.label("Lot ID"),
+        Lot.device_name.label("Device Name"),
+        Lot.condition.label("Condition"),
+        Lot.quantity.label("Quantity"),
+        Lot.min_bid.label("Minimum Bid"),
+        func.coalesce(bid_totals.c.bid_count, 0).label("Bid Count"),
+        bid_totals.c.high_bid.label("High Bid"),
+        User.email.label("Winner Email"),
+        AuctionWinner.winning_amount.label("Winning Amount"),
+    ).select_from(Lot)\
+        .outerjoin(bid_totals, bid_totals.c.lot_id == Lot.lot_id)\
+        .outerjoin(AuctionWinner, AuctionWinner.lot_id == Lot.lot_id)\
+        .outerjoin(User, User.user_id == AuctionWinner.user_id)\
+        .where(Lot.auction_id == auction_id)\
+        .order_by(Lot.lot_id)
+
+
+# Report name -> statement builder taking the auction_id.
+EXPORT_REPORTS = {
+    "winners": winners_report,
+    "bids": bids_report,
+    "lots": lots_report,
+}
+
+
+def open_report(report, auction_id, batch_rows=DEFAULT_EXPORT_BATCH_ROWS):
+    """
+    Execute a report and return its un-fetched result; rows are then read ``batch_rows``
+    at a time, so memory stays flat however many rows the auction has.
+    """
+    statement = EXPORT_REPORTS[report](auction_id).execution_options(yield_per=batch_rows)
+    return db.session.execute(statement)
+
+
+def _csv_value(value):
+    if isinstance(value, datetime):
+        return value.isoformat()
+    return "" if value is None else value
+
+
+def iter_csv(result, batch_rows=DEFAULT_EXPORT_BATCH_ROWS):
+    """Encode a result as CSV, yielding one chunk of text per fetched batch."""
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(result.keys())
+    for rows in result.partitions(batch_rows):
+        writer.writerows([_csv_value(value) for value in row] for row in rows)
+        yield buffer.getvalue()
+        buffer.seek(0)
+        buffer.truncate()
+    yield buffer.getvalue()
+
+
+def _xlsx_value(value):
+    # Excel has no time zones; times are written as UTC.
+    if isinstance(value, datetime) and value.tzinfo is not None:
+        return value.astimezone(timezone.utc).replace(tzinfo=None)
+    return value
+
+
+def iter_xlsx(result, batch_rows=DEFAULT_EXPORT_BATCH_ROWS):
+    """
+    Encode a result as an XLSX workbook and yield its bytes.
+
+    An XLSX file is a zip archive, so nothing can be sent before the last row is
+    written. A write-only workbook spools rows to disk as they are appended, and the
+    finished file is then streamed from a temporary file.
+    """
+    # openpyxl is imported on first use so CSV-only workers never load it.
+    from openpyxl import Workbook
+
+    workbook = Workbook(write_only=True)
+    sheet = workbook.create_sheet("Export")
+    sheet.append(list(result.keys()))
+    for rows in result.partitions(batch_rows):
+        for row in rows:
+            sheet.append([_xlsx_value(value) for value in row])
+    with tempfile.TemporaryFile() as spool:
+        workbook.save(spool)
+        spool.seek(0)
+        while True:
+            chunk = spool.read(XLSX_CHUNK_BYTES)
+            if not chunk:
+                break
+            yield chunk
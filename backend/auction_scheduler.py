@@ -0,0 +1,160 @@
+import heapq
+import threading
+import time
+from datetime import datetime, timezone
+
+from sqlalchemy import select, update
+
+from extensions import db
+from models import Auction
+from winners import determine_winners
+
+
+def _epoch(dt):
+    # SQLite hands back naive datetimes; everything is stored in UTC.
+    if dt.tzinfo is None:
+        dt = dt.replace(tzinfo=timezone.utc)
+    return dt.timestamp()
+
+
+def apply_status_transitions(now=None):
+    """
+    Move due auctions scheduled -> active and active -> closed with two conditional UPDATEs.
+
+    Only rows whose status actually changed are returned, so when several processes race
+    on the same transition exactly one of them sees each auction. The caller commits.
+
+    Returns ``(activated_ids, closed_ids)``.
+    """
+    now = now or datetime.now(timezone.utc)
+    activated_ids = db.session.execute(
+        update(Auction)
+        .where(Auction.status == "scheduled", Auction.start_time <= now, Auction.end_time > now)
+        .values(status="active", updated_at=now)
+        .returning(Auction.auction_id),
+        execution_options={"synchronize_session": False}
+    ).scalars().all()
+    closed_ids = db.session.execute(
+        update(Auction)
+        .where(Auction.status == "active", Auction.end_time <= now)
+        .values(status="closed", updated_at=now)
+        .returning(Auction.auction_id),
+        execution_options={"synchronize_session": False}
+    ).scalars().all()
+    return activated_ids, closed_ids
+
+
+class AuctionScheduler:
+    """
+    Applies auction start/end transitions at the moment they fall due.
+
+    Upcoming ``start_time``/``end_time`` values are kept in a heap ordered by time. The
+    worker thread sleeps until the earliest one, then applies every due transition with
+    :func:`apply_status_transitions`. The heap is rebuilt from the database every
+    ``resync_interval`` seconds, so edits made by other processes are picked up too;
+    admin endpoints in this process call :meth:`schedule` to be picked up immediately.
+    """
+
+    def __init__(self, app=None, resync_interval=300, determine_winners_on_close=False):
+        self.app = app
+        self.resync_interval = resync_interval
+        self.determine_winners_on_close = determine_winners_on_close
+        self._queue = []
+        self._condition = threading.Condition()
+        self._thread = None
+        self._stopping = False
+        self._next_resync = 0.0
+        # Called with (activated_ids, closed_ids) after a pass that changed any auction.
+        self.listeners = []
+
+    def init_app(self, app):
+        self.app = app
+        self.resync_interval = app.config.get("AUCTION_SCHEDULER_RESYNC_SECONDS", self.resync_interval)
+        self.determine_winners_on_close = app.config.get("AUCTION_SCHEDULER_DETERMINE_WINNERS", self.determine_winners_on_close)
+
+    def schedule(self, auction):
+        """Queue the transitions of a created or edited auction."""
+        with self._condition:
+            if auction.status == "scheduled" and auction.start_time:
+                heapq.heappush(self._queue, (_epoch(auction.start_time), auction.auction_id))
+            if auction.status in ("scheduled", "active") and auction.end_time:
+                heapq.heappush(self._queue, (_epoch(auction.end_time), auction.auction_id))
+            self._condition.notify()
+
+    def resync(self):
+        """Rebuild the queue from every auction that still has a transition ahead of it."""
+        rows = db.session.execute(
+            select(Auction.auction_id, Auction.status, Auction.start_time, Auction.end_time)
+            .where(Auction.status.in_(["scheduled", "active"]))
+        ).all()
+        queue = []
+        for auction_id, status, start_time, end_time in rows:
+            if status == "scheduled":
+                queue.append((_epoch(start_time), auction_id))
+            queue.append((_epoch(end_time), auction_id))
+        heapq.heapify(queue)
+        with self._condition:
+            self._queue = queue
+        self._next_resync = time.monotonic() + self.resync_interval
+
+    def run_pending(self):
+        """Apply due transitions and optionally award closed auctions. Returns ``(activated, closed)``."""
+        with self._condition:
+            now = time.time()
+            while self._queue and self._queue[0][0] <= now:
+                heapq.heappop(self._queue)
+
+        activated_ids, closed_ids = apply_status_transitions()
+        db.session.commit()
+
+        if self.determine_winners_on_close:
+            for auction_id in closed_ids:
+                try:
+                    determine_winners(auction_id)
+                    db.session.commit()
+                except Exception:
+                    db.session.rollback()
+                    self.app.logger.exception(f"Winner determination failed for auction {auction_id}")
+
+        if activated_ids or closed_ids:
+            for listener in self.listeners:
+                listener(activated_ids, closed_ids)
+        return activated_ids, closed_ids
+
+    def _seconds_until_due(self):
+        wait = self._next_resync - time.monotonic()
+        if self._queue:
+            wait = min(wait, self._queue[0][0] - time.time())
+        return max(wait, 0)
+
+    def run_forever(self):
+        with self.app.app_context():
+            while not self._stopping:
+                try:
+                    if time.monotonic() >= self._next_resync:
+                        self.resync()
+                    self.run_pending()
+                except Exception:
+                    db.session.rollback()
+                    self.app.logger.exception("Auction scheduler pass failed")
+                    # Due entries were already popped; retry from a fresh resync soon.
+                    self._next_resync = time.monotonic() + min(self.resync_interval, 30)
+                finally:
+                    db.session.remove()
+
+                with self._condition:
+                    if not self._stopping:
+                        self._condition.wait(self._seconds_until_due())
+
+    def start(self):
+        if self._thread is None:
+            self._thread = threading.Thread(target=self.run_forever, name="auction-scheduler", daemon=True)
+            self._thread.start()
+
+    def stop(self):
+        with self._condition:
+            self._stopping = True
+            self._condition.notify()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
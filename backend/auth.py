@@ -0,0 +1,163 @@
+import datetime
+from datetime import timedelta, timezone
+from functools import wraps
+
+import jwt
+from flask import Blueprint, current_app, request, jsonify
+
+from extensions import db, password_hasher, principal_cache
+from models import User
+from principal_cache import Principal
+
+auth_bp = Blueprint("auth", __name__)
+
+# The "purpose" claim of event stream tickets; login tokens have none.
+STREAM_TICKET_PURPOSE = "event_stream"
+
+
+def load_principal(user_id):
+    principal = principal_cache.get(user_id)
+    if principal is None:
+        row = db.session.execute(
+            db.select(User.user_id, User.role, User.is_active, User.deposit_status).filter_by(user_id=user_id)
+        ).first()
+        if row is None:
+            return None
+        principal = Principal(*row)
+        principal_cache.put(principal)
+    return principal
+
+# --- Decorator for JWT Required ---
+# Endpoints receive a cached Principal (user_id, role, is_active, deposit_status), not the User row.
+def token_required(f):
+    @wraps(f)
+    def decorated(*args, **kwargs):
+        token = None
+        if 'x-access-token' in request.headers:
+            token = request.headers['x-access-token']
+        if not token:
+            return jsonify({'message': 'Token is missing!'}), 401
+        try:
+            data = jwt.decode(token, current_app.config['JWT_SECRET_KEY'], algorithms=['HS256'])
+            if 'purpose' in data:
+                # A stream ticket only opens event streams.
+                return jsonify({'message': 'Token is invalid!'}), 401
+            current_user = load_principal(data['user_id'])
+            if not current_user:
+                return jsonify({'message': 'Token is invalid!'}), 401
+        except jwt.ExpiredSignatureError:
+            return jsonify({'message': 'Token has expired!'}), 401
+        except jwt.InvalidTokenError:
+            return jsonify({'message': 'Token is invalid!'}), 401
+        return f(current_user, *args, **kwargs)
+    return decorated
+
+# --- Event Stream Tickets ---
+# EventSource cannot send headers, so streams are opened with ?ticket=: a token that only
+# opens streams and expires after EVENT_STREAM_TICKET_SECONDS, so one that ends up in an
+# access log is useless. It is checked when the stream connects, not while it stays open.
+def issue_stream_ticket(user_id):
+    return jwt.encode({
+        'user_id': user_id,
+        'purpose': STREAM_TICKET_PURPOSE,
+        'exp': datetime.datetime.now(timezone.utc) + timedelta(seconds=current_app.config['EVENT_STREAM_TICKET_SECONDS'])
+    }, current_app.config['JWT_SECRET_KEY'], algorithm='HS256')
+
+def stream_ticket_required(f):
+    @wraps(f)
+    def decorated(*args, **kwargs):
+        ticket = request.args.get('ticket')
+        if not ticket:
+            return jsonify({'message': 'Stream ticket is missing!'}), 401
+        try:
+            data = jwt.decode(ticket, current_app.config['JWT_SECRET_KEY'], algorithms=['HS256'])
+        except jwt.ExpiredSignatureError:
+            return jsonify({'message': 'Stream ticket has expired!'}), 401
+        except jwt.InvalidTokenError:
+            return jsonify({'message': 'Stream ticket is invalid!'}), 401
+        current_user = load_principal(data['user_id']) if data.get('purpose') == STREAM_TICKET_PURPOSE else None
+        if not current_user:
+            return jsonify({'message': 'Stream ticket is invalid!'}), 401
+        return f(current_user, *args, **kwargs)
+    return decorated
+
+# --- Admin Role Required Decorator ---
+def admin_required(f):
+    @wraps(f)
+    @token_required # Ensures token_required is also applied
+    def decorated(current_user, *args, **kwargs):
+        if current_user.role != 'admin':
+            return jsonify({'message': 'Admin role required!'}), 403
+        return f(current_user, *args, **kwargs)
+    return decorated
+
+# --- Client Role Required Decorator ---
+def client_required(f):
+    @wraps(f)
+    @token_required # Leverages the existing token_required to decode token and get user
+    def decorated(current_user, *args, **kwargs):
+        if current_user.role != "client":
+            return jsonify({"message": "Client role required!"}), 403
+        return f(current_user, *args, **kwargs)
+    return decorated
+
+# --- Admin Login Endpoint ---
+@auth_bp.route('/admin/login', methods=['POST'])
+def admin_login():
+    data = request.get_json()
+    if not data or not data.get('email') or not data.get('password'):
+        return jsonify({'message': 'Email and password required'}), 400
+    user = User.query.filter_by(email=data['email']).first()
+    if user and user.role == 'admin' and user.check_password(data['password']):
+        token = jwt.encode({
+            'user_id': user.user_id,
+            'role': user.role,
+            'exp': datetime.datetime.now(timezone.utc) + timedelta(hours=24) # Use timezone.utc
+        }, current_app.config['JWT_SECRET_KEY'], algorithm='HS256')
+        # Update last_login
+        user.last_login = datetime.datetime.now(timezone.utc)
+        if password_hasher.needs_rehash(user.password_hash):
+            user.set_password(data['password'])
+        db.session.commit()
+        return jsonify({'message': 'Admin login successful', 'token': token})
+    return jsonify({'message': 'Invalid credentials or not an admin'}), 401
+
+# --- Client Login Endpoint ---
+@auth_bp.route("/login", methods=["POST"]) # General login, could be for clients
+def client_login():
+    data = request.get_json()
+    if not data or not data.get("email") or not data.get("password"):
+        return jsonify({"message": "Email and password required"}), 400
+
+    user = User.query.filter_by(email=data["email"]).first()
+
+    if user and user.role == "client" and user.check_password(data["password"]):
+        if not user.is_active:
+            return jsonify({"message": "Client account is inactive. Please contact support."}), 403
+
+        token = jwt.encode({
+            "user_id": user.user_id,
+            "role": user.role,
+            "email": user.email,
+            "company_name": user.company_name,
+            "deposit_status": user.deposit_status,
+            "exp": datetime.datetime.now(timezone.utc) + timedelta(hours=24)
+        }, current_app.config["JWT_SECRET_KEY"], algorithm="HS256")
+
+        user.last_login = datetime.datetime.now(timezone.utc)
+        if password_hasher.needs_rehash(user.password_hash):
+            user.set_password(data["password"])
+        db.session.commit()
+
+        return jsonify({
+            "message": "Client login successful",
+            "token": token,
+            "user": {
+                "email": user.email,
+                "company_name": user.company_name,
+                "role": user.role,
+                "deposit_status": user.deposit_status
+            }
+        })
+
+    return jsonify({"message": "Invalid credentials or not a client account"}), 401
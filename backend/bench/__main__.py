@@ -0,0 +1,97 @@
+"""
+Seed a scratch database and benchmark the backend endpoints.
+
+    python -m bench --database-url sqlite:////tmp/bench.db --scale small --output results.json
+
+Writes a JSON report with throughput, p50/p95/p99 latency and SQL query counts per
+operation; compare two reports to see whether a change made an endpoint slower.
+"""
+import argparse
+import json
+import os
+import platform
+import subprocess
+import sys
+from datetime import datetime, timezone
+
+
+def parse_args(argv):
+    parser = argparse.ArgumentParser(prog="python -m bench", description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--database-url", help="Database to use (default: DATABASE_URL). It is seeded, so use a scratch one.")
+    parser.add_argument("--scale", default="small", help="Dataset size: small, medium or large.")
+    parser.add_argument("--no-seed", action="store_true", help="Reuse an already seeded database.")
+    parser.add_argument("--workers", type=int, default=8, help="Concurrent client threads.")
+    parser.add_argument("--operations", type=int, default=200, help="Requests per worker.")
+    parser.add_argument("--seed", type=int, default=1, help="Random seed for the request mix.")
+    parser.add_argument("--upload-rows", type=int, default=500, help="Rows per upload_lots file.")
+    parser.add_argument("--mix", help='Operation weights as JSON, e.g. \'{"submit_bid": 1}\'.')
+    parser.add_argument("--output", help="Write the JSON report here instead of stdout.")
+    return parser.parse_args(argv)
+
+
+def git_revision():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True,
+                              cwd=os.path.dirname(os.path.abspath(__file__))).stdout.strip() or None
+    except OSError:
+        return None
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    # create_app() reads its configuration from the environment.
+    if args.database_url:
+        os.environ["DATABASE_URL"] = args.database_url
+
+    from app import create_app
+    from extensions import db
+    from commands import create_default_admin
+    from models import Auction
+    from bench.seed import SCALES, CLIENT_PASSWORD, seed_dataset
+    from bench.runner import run_benchmark
+
+    if args.scale not in SCALES:
+        sys.exit(f"Unknown scale {args.scale!r}; choose from {', '.join(SCALES)}.")
+    scale = SCALES[args.scale]
+
+    app = create_app()
+    with app.app_context():
+        create_default_admin()
+        if not args.no_seed:
+            if db.session.query(Auction.auction_id).first() is not None:
+                sys.exit("Refusing to seed: the database already has auctions (use --no-seed to reuse it).")
+            seed_dataset(password=CLIENT_PASSWORD, **scale)
+        results = run_benchmark(
+            workers=args.workers,
+            operations=args.operations,
+            clients=scale["clients"],
+            mix=json.loads(args.mix) if args.mix else None,
+            seed=args.seed,
+            upload_rows=args.upload_rows
+        )
+        dialect = db.engine.dialect.name
+
+    report = {
+        "meta": {
+            "started_at": datetime.now(timezone.utc).isoformat(),
+            "git_revision": git_revision(),
+            "python": platform.python_version(),
+            "dialect": dialect,
+            "scale": args.scale,
+            "dataset": scale,
+            "workers": args.workers,
+            "operations_per_worker": args.operations,
+            "seed": args.seed
+        },
+        **results
+    }
+    output = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(output + "\n")
+    else:
+        print(output)
+
+
+if __name__ == "__main__":
+    main()
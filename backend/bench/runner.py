@@ -0,0 +1,217 @@
+import io
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta, timezone
+
+from flask import current_app
+from sqlalchemy import event, select
+
+from extensions import db
+from models import Auction, Lot
+from bench.seed import CLIENT_EMAIL, CLIENT_PASSWORD
+
+ADMIN_EMAIL = "admin@phonescanada.com"
+ADMIN_PASSWORD = "AdminPass123!"
+
+# Relative frequency of each operation in the mixed workload.
+DEFAULT_MIX = {
+    "browse": 25,
+    "auction_detail": 20,
+    "submit_bid": 35,
+    "my_bids": 12,
+    "login": 5,
+    "determine_winners": 2,
+    "upload_lots": 1,
+}
+
+
+def percentile(sorted_values, fraction):
+    """Nearest-rank percentile of an already sorted list."""
+    if not sorted_values:
+        return None
+    rank = max(int(round(fraction * len(sorted_values) + 0.5)) - 1, 0)
+    return sorted_values[min(rank, len(sorted_values) - 1)]
+
+
+class QueryCounter:
+    """Counts statements sent to the database by the current thread."""
+
+    def __init__(self, engine):
+        self._local = threading.local()
+        event.listen(engine, "before_cursor_execute", self._count)
+
+    def _count(self, *args):
+        self._local.count = getattr(self._local, "count", 0) + 1
+
+    def reset(self):
+        self._local.count = 0
+
+    @property
+    def count(self):
+        return getattr(self._local, "count", 0)
+
+
+class Recorder:
+    def __init__(self):
+        self._lock = threading.Lock()
+        # operation -> list of (latency_ms, sql_queries, ok)
+        self.samples = {}
+
+    def add(self, operation, latency_ms, sql_queries, ok):
+        with self._lock:
+            self.samples.setdefault(operation, []).append((latency_ms, sql_queries, ok))
+
+    def summary(self, wall_seconds):
+        endpoints = {}
+        for operation, samples in sorted(self.samples.items()):
+            latencies = sorted(sample[0] for sample in samples)
+            queries = [sample[1] for sample in samples]
+            endpoints[operation] = {
+                "count": len(samples),
+                "errors": sum(1 for sample in samples if not sample[2]),
+                "throughput_per_s": round(len(samples) / wall_seconds, 2) if wall_seconds else None,
+                "latency_ms": {
+                    "mean": round(sum(latencies) / len(latencies), 3),
+                    "p50": round(percentile(latencies, 0.50), 3),
+                    "p95": round(percentile(latencies, 0.95), 3),
+                    "p99": round(percentile(latencies, 0.99), 3),
+                    "max": round(latencies[-1], 3)
+                },
+                "sql_queries": {
+                    "total": sum(queries),
+                    "per_request_mean": round(sum(queries) / len(queries), 2),
+                    "per_request_max": max(queries)
+                }
+            }
+        total = sum(endpoint["count"] for endpoint in endpoints.values())
+        return {
+            "wall_seconds": round(wall_seconds, 3),
+            "requests": total,
+            "errors": sum(endpoint["errors"] for endpoint in endpoints.values()),
+            "throughput_per_s": round(total / wall_seconds, 2) if wall_seconds else None,
+            "endpoints": endpoints
+        }
+
+
+class Workload:
+    """
+    Shared, read-only facts about the seeded data plus the operations the workers run.
+
+    Every operation goes through the real Flask routes with ``app.test_client()``, so
+    results include routing, auth, serialisation and the database, but not the network.
+    """
+
+    def __init__(self, clients, upload_rows):
+        self.upload_rows = upload_rows
+        self.client_emails = [CLIENT_EMAIL.format(n) for n in range(clients)]
+        self.active_lots = db.session.execute(
+            select(Lot.lot_id, Lot.auction_id, Lot.min_bid)
+            .join(Auction, Lot.auction_id == Auction.auction_id)
+            .where(Auction.status == "active", Auction.is_visible == True)
+        ).all()
+        self.active_auction_ids = sorted({lot.auction_id for lot in self.active_lots})
+        self.closed_auction_ids = db.session.scalars(
+            select(Auction.auction_id).where(Auction.status == "closed")
+        ).all()
+        if not self.active_lots or not self.closed_auction_ids:
+            raise RuntimeError("The database needs active and closed auctions; seed it first.")
+        self.upload_auction_id = self._upload_auction(db.session.scalar(select(Auction.carrier_id).limit(1)))
+        self._upload_counter = 0
+        self._upload_lock = threading.Lock()
+        db.session.commit()
+
+    def _upload_auction(self, carrier_id):
+        # Uploads go into one scheduled auction so they never touch the bidding data.
+        auction = Auction(
+            carrier_id=carrier_id, name="Bench Upload Target", status="scheduled", is_visible=False,
+            start_time=datetime.now(timezone.utc) + timedelta(days=30),
+            end_time=datetime.now(timezone.utc) + timedelta(days=31)
+        )
+        db.session.add(auction)
+        db.session.flush()
+        return auction.auction_id
+
+    def login(self, client, session, rng):
+        response = client.post("/login", json={"email": session["email"], "password": CLIENT_PASSWORD})
+        if response.status_code == 200:
+            session["token"] = response.get_json()["token"]
+        return response
+
+    def browse(self, client, session, rng):
+        return client.get("/auctions", headers={"x-access-token": session["token"]})
+
+    def auction_detail(self, client, session, rng):
+        auction_id = rng.choice(self.active_auction_ids)
+        return client.get(f"/auctions/{auction_id}", headers={"x-access-token": session["token"]})
+
+    def submit_bid(self, client, session, rng):
+        lot = rng.choice(self.active_lots)
+        amount = float(lot.min_bid or 0) + rng.randint(1, 500)
+        return client.post(f"/auctions/{lot.auction_id}/lots/{lot.lot_id}/bid",
+                           json={"bid_amount": amount}, headers={"x-access-token": session["token"]})
+
+    def my_bids(self, client, session, rng):
+        return client.get("/my-bids", headers={"x-access-token": session["token"]})
+
+    def determine_winners(self, client, session, rng):
+        auction_id = rng.choice(self.closed_auction_ids)
+        return client.post(f"/admin/auctions/{auction_id}/determine-winners",
+                           headers={"x-access-token": session["admin_token"]})
+
+    def upload_lots(self, client, session, rng):
+        with self._upload_lock:
+            self._upload_counter += 1
+            batch = self._upload_counter
+        rows = "".join(f"U{batch}-{n},Upload Device {n},{10 + n % 90}\n" for n in range(self.upload_rows))
+        data = {"file": (io.BytesIO(("Lot ID,Device Name,Minimum Bid\n" + rows).encode("utf-8")), "lots.csv")}
+        return client.post(f"/admin/auctions/{self.upload_auction_id}/upload_lots", data=data,
+                           headers={"x-access-token": session["admin_token"]},
+                           content_type="multipart/form-data")
+
+
+def admin_token():
+    response = current_app.test_client().post("/admin/login", json={"email": ADMIN_EMAIL, "password": ADMIN_PASSWORD})
+    if response.status_code != 200:
+        raise RuntimeError(f"Admin login failed ({response.status_code}); run the default admin setup first.")
+    return response.get_json()["token"]
+
+
+def run_benchmark(workers=8, operations=200, clients=100, mix=None, seed=1, upload_rows=500):
+    """
+    Run ``operations`` requests on each of ``workers`` threads and summarise per operation.
+
+    Worker ``n`` draws its operations from ``random.Random(seed + n)`` and logs in as its
+    own client, so two runs against the same dataset issue the same request sequence.
+    """
+    mix = mix or DEFAULT_MIX
+    # The worker threads run outside this app context, so they hold the app itself.
+    app = current_app._get_current_object()
+    names, weights = list(mix), list(mix.values())
+    counter = QueryCounter(db.engine)
+    recorder = Recorder()
+    workload = Workload(clients, upload_rows)
+    token = admin_token()
+
+    def worker(index):
+        rng = random.Random(seed + index)
+        session = {"email": workload.client_emails[index % len(workload.client_emails)], "admin_token": token}
+        client = app.test_client()
+        workload.login(client, session, rng)
+        for _ in range(operations):
+            operation = rng.choices(names, weights)[0]
+            counter.reset()
+            started = time.perf_counter()
+            try:
+                response = getattr(workload, operation)(client, session, rng)
+                ok = response.status_code < 400
+            except Exception:
+                app.logger.exception(f"Benchmark operation {operation} failed")
+                ok = False
+            recorder.add(operation, (time.perf_counter() - started) * 1000.0, counter.count, ok)
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        list(executor.map(worker, range(workers)))
+    return recorder.summary(time.perf_counter() - started)
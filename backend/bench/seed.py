@@ -0,0 +1,89 @@
+from datetime import datetime, timedelta, timezone
+from decimal import Decimal
+
+from sqlalchemy import insert, select
+
+from extensions import db, password_hasher
+from models import User, Carrier, Auction, Lot, Bid
+from winners import determine_winners
+
+# Named dataset sizes for seed_dataset(**SCALES[name]).
+SCALES = {
+    "small": {"auctions": 20, "lots_per_auction": 50, "clients": 100, "bids_per_lot": 5},
+    "medium": {"auctions": 200, "lots_per_auction": 100, "clients": 1000, "bids_per_lot": 10},
+    "large": {"auctions": 1000, "lots_per_auction": 200, "clients": 10000, "bids_per_lot": 20},
+}
+
+CLIENT_EMAIL = "bench-client-{}@example.com"
+CLIENT_PASSWORD = "BenchPass123!"
+
+
+def seed_dataset(auctions=200, lots_per_auction=100, clients=1000, bids_per_lot=10, password=None):
+    """
+    Fill an empty database with a realistic auction history using bulk inserts.
+
+    Auctions are spread over closed, active and scheduled states, every lot gets
+    ``bids_per_lot`` bids from different clients, and closed auctions get winners.
+    Clients are ``CLIENT_EMAIL.format(n)``; with ``password`` they can log in (one hash is
+    shared by all of them), otherwise they get an unusable placeholder hash.
+    Only meant for a scratch database: the rows are committed.
+    """
+    now = datetime.now(timezone.utc)
+    password_hash = password_hasher.hash(password) if password else "$2b$04$" + "." * 53
+
+    db.session.execute(insert(Carrier), [{"name": f"Seed Carrier {i}"} for i in range(10)])
+    carrier_ids = db.session.scalars(select(Carrier.carrier_id)).all()
+    db.session.execute(insert(User), [
+        {"email": CLIENT_EMAIL.format(i), "password_hash": password_hash,
+         "role": "client", "deposit_status": "on_file", "is_active": True}
+        for i in range(clients)
+    ])
+    client_ids = db.session.scalars(select(User.user_id).where(User.role == "client")).all()
+
+    auction_rows = []
+    for i in range(auctions):
+        # 80% closed history, then active, then scheduled, as on a long-running system.
+        if i < auctions * 0.8:
+            status, start = "closed", now - timedelta(days=auctions - i + 1)
+        elif i < auctions * 0.95:
+            status, start = "active", now - timedelta(hours=1)
+        else:
+            status, start = "scheduled", now + timedelta(days=1)
+        auction_rows.append({
+            "carrier_id": carrier_ids[i % len(carrier_ids)], "name": f"Seed Auction {i}",
+            "start_time": start, "end_time": start + timedelta(days=1),
+            "status": status, "is_visible": status != "scheduled"
+        })
+    db.session.execute(insert(Auction), auction_rows)
+    auction_ids = db.session.scalars(select(Auction.auction_id).order_by(Auction.auction_id)).all()
+
+    db.session.execute(insert(Lot), [
+        {"auction_id": auction_id, "lot_identifier": f"L{n}", "device_name": f"Device {n}",
+         "quantity": 1, "min_bid": Decimal("10.00")}
+        for auction_id in auction_ids for n in range(lots_per_auction)
+    ])
+    lots = db.session.execute(select(Lot.lot_id, Lot.auction_id).order_by(Lot.lot_id)).all()
+
+    bid_rows = []
+    for index, (lot_id, auction_id) in enumerate(lots):
+        for n in range(bids_per_lot):
+            bid_rows.append({
+                "lot_id": lot_id, "user_id": client_ids[(index * 7 + n * 13) % len(client_ids)],
+                "bid_amount": Decimal(10 + (index + n * 3) % 500),
+                "bid_time": now - timedelta(minutes=index + n), "status": "active"
+            })
+            if len(bid_rows) >= 50000:
+                db.session.execute(insert(Bid), bid_rows)
+                bid_rows = []
+    if bid_rows:
+        db.session.execute(insert(Bid), bid_rows)
+
+    for auction_id, row in zip(auction_ids, auction_rows):
+        if row["status"] == "closed":
+            determine_winners(auction_id)
+    db.session.commit()
+
+    # Fresh planner statistics, as autovacuum would have on a live database.
+    with db.engine.connect() as conn:
+        conn.exec_driver_sql("ANALYZE")
+        conn.commit()
@@ -0,0 +1,102 @@
+"""
+Measure worker cold start: import the app, build it and serve a first request, in fresh interpreters.
+
+    python -m bench.startup --runs 10 --output startup.json
+    python -m bench.startup --backend-dir /path/to/other/checkout/backend   # compare a revision
+
+Each run reports import and build time, the first request, peak RSS and which of the
+heavy optional libraries got loaded; the JSON summary has the median, min and max.
+No database connection is opened, so any DATABASE_URL works.
+"""
+import argparse
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+
+# Libraries only some endpoints need; a cold worker should not have loaded them.
+HEAVY_MODULES = ("pandas", "numpy", "openpyxl", "PIL")
+
+# Runs in the child interpreter, with the backend directory as the working directory.
+PROBE = r"""
+import json, resource, sys, time
+started = time.perf_counter()
+import app as app_module
+imported = time.perf_counter()
+# Revisions before the app factory built the app at import time.
+app = app_module.create_app() if hasattr(app_module, "create_app") else app_module.app
+built = time.perf_counter()
+app.test_client().get("/")
+served = time.perf_counter()
+rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+print(json.dumps({
+    "import_ms": (imported - started) * 1000.0,
+    "create_app_ms": (built - imported) * 1000.0,
+    "first_request_ms": (served - built) * 1000.0,
+    "total_ms": (served - started) * 1000.0,
+    # ru_maxrss is in KiB on Linux and in bytes on macOS.
+    "max_rss_mb": rss / (1024.0 * 1024.0 if sys.platform == "darwin" else 1024.0),
+    "loaded": [name for name in %r if name in sys.modules],
+}))
+""" % (HEAVY_MODULES,)
+
+METRICS = ("import_ms", "create_app_ms", "first_request_ms", "total_ms", "max_rss_mb")
+
+
+def parse_args(argv):
+    parser = argparse.ArgumentParser(prog="python -m bench.startup", description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--runs", type=int, default=10, help="Fresh interpreters to start.")
+    parser.add_argument("--backend-dir", default=os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                        help="Backend directory to measure (default: this checkout).")
+    parser.add_argument("--output", help="Write the JSON report here instead of stdout.")
+    return parser.parse_args(argv)
+
+
+def run_once(backend_dir):
+    env = dict(os.environ)
+    env.setdefault("DATABASE_URL", "sqlite://")
+    result = subprocess.run([sys.executable, "-c", PROBE], cwd=backend_dir, env=env,
+                            capture_output=True, text=True)
+    if result.returncode != 0:
+        raise RuntimeError(f"Startup probe failed:\n{result.stderr}")
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+def summarise(runs):
+    summary = {}
+    for metric in METRICS:
+        values = [run[metric] for run in runs]
+        summary[metric] = {
+            "median": round(statistics.median(values), 1),
+            "min": round(min(values), 1),
+            "max": round(max(values), 1)
+        }
+    summary["loaded"] = sorted({name for run in runs for name in run["loaded"]})
+    return summary
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    # One discarded run warms the filesystem cache and writes any missing bytecode.
+    run_once(args.backend_dir)
+    runs = [run_once(args.backend_dir) for _ in range(args.runs)]
+    report = {
+        "meta": {
+            "backend_dir": os.path.abspath(args.backend_dir),
+            "python": platform.python_version(),
+            "runs": args.runs
+        },
+        "startup": summarise(runs)
+    }
+    output = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(output + "\n")
+    else:
+        print(output)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,189 @@
+import os
+import queue
+import threading
+import time
+from concurrent.futures import Future, TimeoutError as FutureTimeoutError
+
+from sqlalchemy.exc import IntegrityError
+
+from extensions import db
+from bid_writes import upsert_bids
+
+
+class BidIntakeUnavailable(Exception):
+    """Raised when the intake queue is full or a bid was not acknowledged in time."""
+
+
+class BidIntakeQueue:
+    """
+    Group-commit writer for bids: requests enqueue validated bids and wait for their own
+    acknowledgement while one writer thread per process commits them in batches.
+
+    The writer takes whatever is queued, waiting at most ``max_wait_ms`` after the first
+    bid for up to ``max_batch`` bids, and writes them with one multi-row upsert and one
+    commit, so a closing-minute surge costs one fsync per batch instead of per bid.
+    Bids are written in accepted ``bid_time`` order. When one user re-bids a lot within a
+    batch, the re-bid goes into a second upsert in the same transaction, so each request
+    gets its own outcome and the later bid wins, as when committing them one by one.
+
+    A request that stops waiting cancels its queued bid, which is then never written; a
+    bid the writer has already taken is waited for, so a reported failure is never live.
+    If a batch fails with an IntegrityError it is retried row by row, so only the
+    offending bids see the error; each of those bids is answered as soon as its row
+    commits, so a later failure never reports an already written bid as failed.
+    """
+
+    def __init__(self, app=None, max_batch=500, max_wait_ms=5, max_pending=10000, ack_timeout=5):
+        self.app = app
+        self.max_batch = max_batch
+        self.max_wait_ms = max_wait_ms
+        self.max_pending = max_pending
+        self.ack_timeout = ack_timeout
+        self._queue = queue.Queue(max_pending)
+        self._lock = threading.Lock()
+        self._thread = None
+        self._thread_pid = None
+        self.batches = 0
+        self.bids_written = 0
+        self.rejected = 0
+        self.last_batch_size = 0
+        self.max_batch_size = 0
+        self.last_commit_ms = 0.0
+        self.max_commit_ms = 0.0
+        self.total_commit_ms = 0.0
+
+    def init_app(self, app):
+        self.app = app
+        self.max_batch = app.config.get("BID_INTAKE_MAX_BATCH", self.max_batch)
+        self.max_wait_ms = app.config.get("BID_INTAKE_MAX_WAIT_MS", self.max_wait_ms)
+        self.max_pending = app.config.get("BID_INTAKE_MAX_PENDING", self.max_pending)
+        self.ack_timeout = app.config.get("BID_INTAKE_ACK_TIMEOUT_SECONDS", self.ack_timeout)
+        self._queue = queue.Queue(self.max_pending)
+
+    def _ensure_writer(self):
+        # Started lazily and per process, so forked web workers each run their own writer.
+        with self._lock:
+            if self._thread is None or self._thread_pid != os.getpid():
+                self._thread = threading.Thread(target=self._run, name="bid-intake-writer", daemon=True)
+                self._thread_pid = os.getpid()
+                self._thread.start()
+
+    def submit(self, row):
+        """
+        Queue one bid (lot_id, user_id, bid_amount, bid_time) and block until it is committed.
+
+        Returns the :class:`~bid_writes.WrittenBid` from :func:`upsert_bids`.
+        Raises IntegrityError if the bid was rejected by the database, and
+        BidIntakeUnavailable if it was not written within ``ack_timeout``.
+        """
+        self._ensure_writer()
+        future = Future()
+        try:
+            self._queue.put_nowait((row, future))
+        except queue.Full:
+            with self._lock:
+                self.rejected += 1
+            raise BidIntakeUnavailable("Bid intake is at capacity, please retry shortly.")
+        try:
+            return future.result(timeout=self.ack_timeout)
+        except FutureTimeoutError:
+            if future.cancel():
+                raise BidIntakeUnavailable("Your bid could not be placed in time and was not recorded. Please retry.")
+            # The writer already took it; its batch decides the outcome.
+            return future.result()
+
+    def _next_batch(self):
+        batch = [self._queue.get()]
+        deadline = time.monotonic() + self.max_wait_ms / 1000.0
+        while len(batch) < self.max_batch:
+            remaining = deadline - time.monotonic()
+            try:
+                batch.append(self._queue.get(timeout=remaining) if remaining > 0 else self._queue.get_nowait())
+            except queue.Empty:
+                break
+        return batch
+
+    def _run(self):
+        with self.app.app_context():
+            while True:
+                batch = self._next_batch()
+                try:
+                    self._write(batch)
+                except Exception as e:
+                    db.session.rollback()
+                    self.app.logger.exception("Bid intake batch failed")
+                    for _row, future in batch:
+                        if not future.done():
+                            future.set_exception(e)
+                finally:
+                    db.session.remove()
+
+    def _write(self, batch):
+        # Bids whose request stopped waiting were cancelled and are dropped.
+        batch = [(row, future) for row, future in batch if future.set_running_or_notify_cancel()]
+        if not batch:
+            return
+        # Accepted order, split into rounds with at most one bid per (lot_id, user_id):
+        # one statement may not upsert the same row twice.
+        batch.sort(key=lambda item: item[0]["bid_time"])
+        rounds, seen = [], {}
+        for row, future in batch:
+            key = (row["lot_id"], row["user_id"])
+            position = seen[key] = seen.get(key, -1) + 1
+            if position == len(rounds):
+                rounds.append([])
+            rounds[position].append((row, future))
+
+        started = time.perf_counter()
+        try:
+            outcomes = []
+            for entries in rounds:
+                written = {(r.lot_id, r.user_id): r for r in upsert_bids([row for row, _future in entries])}
+                outcomes.extend((future, written[(row["lot_id"], row["user_id"])]) for row, future in entries)
+            db.session.commit()
+        except IntegrityError:
+            db.session.rollback()
+            self._write_one_by_one(batch)
+        else:
+            with self._lock:
+                self.bids_written += len(outcomes)
+            for future, result in outcomes:
+                future.set_result(result)
+        elapsed_ms = (time.perf_counter() - started) * 1000.0
+
+        with self._lock:
+            self.batches += 1
+            self.last_batch_size = len(batch)
+            self.max_batch_size = max(self.max_batch_size, len(batch))
+            self.last_commit_ms = elapsed_ms
+            self.max_commit_ms = max(self.max_commit_ms, elapsed_ms)
+            self.total_commit_ms += elapsed_ms
+
+    def _write_one_by_one(self, batch):
+        # Each bid is resolved as soon as its own commit settles, so if a later row fails
+        # for another reason (e.g. a dropped connection) only the bids not yet written see it.
+        for row, future in batch:
+            try:
+                result = upsert_bids([row])[0]
+                db.session.commit()
+            except IntegrityError as e:
+                db.session.rollback()
+                future.set_exception(e)
+                continue
+            with self._lock:
+                self.bids_written += 1
+            future.set_result(result)
+
+    def stats(self):
+        with self._lock:
+            return {
+                "queue_depth": self._queue.qsize(),
+                "batches": self.batches,
+                "bids_written": self.bids_written,
+                "rejected": self.rejected,
+                "last_batch_size": self.last_batch_size,
+                "max_batch_size": self.max_batch_size,
+                "last_commit_ms": round(self.last_commit_ms, 3),
+                "max_commit_ms": round(self.max_commit_ms, 3),
+                "avg_commit_ms": round(self.total_commit_ms / self.batches, 3) if self.batches else 0.0
+            }
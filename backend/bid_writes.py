@@ -0,0 +1,87 @@
+from collections import namedtuple
+
+from sqlalchemy import Boolean, literal_column, select, update
+from sqlalchemy.dialects import postgresql, sqlite
+
+from extensions import db
+from models import Bid
+
+# One written bid; ``inserted`` is False when it replaced the user's existing bid on the lot.
+WrittenBid = namedtuple("WrittenBid", ["lot_id", "user_id", "bid_id", "inserted"])
+
+# Dialects whose INSERT supports ON CONFLICT ... DO UPDATE.
+_UPSERT_INSERTS = {
+    "postgresql": postgresql.insert,
+    "sqlite": sqlite.insert,
+}
+
+
+def _existing_bid_ids(rows, for_update=False):
+    """(lot_id, user_id) -> bid_id for the rows' users that already bid on those lots."""
+    keys = {(row["lot_id"], row["user_id"]) for row in rows}
+    query = select(Bid.lot_id, Bid.user_id, Bid.bid_id).where(
+        Bid.lot_id.in_({lot_id for lot_id, _user_id in keys}),
+        Bid.user_id.in_({user_id for _lot_id, user_id in keys})
+    )
+    if for_update:
+        query = query.with_for_update()
+    return {(r.lot_id, r.user_id): r.bid_id for r in db.session.execute(query) if (r.lot_id, r.user_id) in keys}
+
+
+def _upsert(dialect, rows):
+    stmt = _UPSERT_INSERTS[dialect](Bid).values([dict(row, status="active") for row in rows])
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[Bid.lot_id, Bid.user_id],
+        set_={
+            "bid_amount": stmt.excluded.bid_amount,
+            "bid_time": stmt.excluded.bid_time,
+            "status": stmt.excluded.status
+        }
+    )
+    if dialect == "postgresql":
+        # A freshly inserted row version has no deleting transaction; an updated one does.
+        stmt = stmt.returning(Bid.lot_id, Bid.user_id, Bid.bid_id, literal_column("(xmax = 0)", Boolean))
+        return [WrittenBid(*row) for row in db.session.execute(stmt)]
+    # Other dialects cannot tell the two apart from RETURNING, so look first; the
+    # upsert itself stays atomic either way.
+    existing = _existing_bid_ids(rows)
+    stmt = stmt.returning(Bid.lot_id, Bid.user_id, Bid.bid_id)
+    return [WrittenBid(*row, (row.lot_id, row.user_id) not in existing) for row in db.session.execute(stmt)]
+
+
+def _lock_and_write(rows):
+    # No ON CONFLICT: lock the users' existing bids, update those and insert the rest. A
+    # concurrent first bid on the same lot still hits _user_lot_bid_uc as an IntegrityError.
+    existing = _existing_bid_ids(rows, for_update=True)
+    updates = [
+        {"bid_id": existing[(row["lot_id"], row["user_id"])], "bid_amount": row["bid_amount"],
+         "bid_time": row["bid_time"], "status": "active"}
+        for row in rows if (row["lot_id"], row["user_id"]) in existing
+    ]
+    if updates:
+        db.session.execute(update(Bid), updates)
+    new_bids = [Bid(**row, status="active") for row in rows if (row["lot_id"], row["user_id"]) not in existing]
+    db.session.add_all(new_bids)
+    db.session.flush()
+    written = [WrittenBid(bid.lot_id, bid.user_id, bid.bid_id, True) for bid in new_bids]
+    written.extend(WrittenBid(lot_id, user_id, bid_id, False) for (lot_id, user_id), bid_id in existing.items())
+    return written
+
+
+def upsert_bids(rows):
+    """
+    Write bids, inserting each or replacing the user's existing bid on the lot.
+
+    ``rows`` is a list of dicts with lot_id, user_id, bid_amount and bid_time, at most one
+    per (lot_id, user_id). A replaced bid is set back to ``active``. PostgreSQL and SQLite
+    use one INSERT ... ON CONFLICT (lot_id, user_id) DO UPDATE statement, so two
+    concurrent submits from the same user cannot race on ``_user_lot_bid_uc``; the last
+    write wins. Other dialects lock the existing bids and update or insert. The caller
+    commits.
+
+    Returns a :class:`WrittenBid` per row.
+    """
+    dialect = db.session.get_bind().dialect.name
+    if dialect in _UPSERT_INSERTS:
+        return _upsert(dialect, rows)
+    return _lock_and_write(rows)
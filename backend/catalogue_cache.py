@@ -0,0 +1,94 @@
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+
+from flask import Response, current_app, request
+
+from db_routing import reads_on_primary
+
+
+class CatalogueCache:
+    """
+    Shared cache of rendered client catalogue responses, keyed by request path and query.
+
+    Every entry is stamped with the cache ``version``; :meth:`invalidate` bumps the version,
+    so anything built before an admin change is never served afterwards. Every worker
+    invalidates on carrier and auction events from the invalidation bus; entries also
+    expire after ``ttl_seconds``, which bounds staleness if an event is lost.
+    """
+
+    def __init__(self, max_entries=1024, ttl_seconds=30):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.version = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def init_app(self, app):
+        self.max_entries = app.config.get("CATALOGUE_CACHE_MAX_ENTRIES", self.max_entries)
+        self.ttl_seconds = app.config.get("CATALOGUE_CACHE_TTL_SECONDS", self.ttl_seconds)
+
+    def get(self, key):
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry[0] != self.version or entry[1] <= now:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[2], entry[3]
+
+    def put(self, key, version, body, etag):
+        with self._lock:
+            # A response built while an invalidation happened is already stale; drop it.
+            if version != self.version or self.max_entries <= 0:
+                return
+            self._entries[key] = (version, time.monotonic() + self.ttl_seconds, body, etag)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def invalidate(self):
+        with self._lock:
+            self.version += 1
+            self._entries.clear()
+
+    def stats(self):
+        with self._lock:
+            return {
+                "version": self.version,
+                "size": len(self._entries),
+                "hits": self.hits,
+                "misses": self.misses
+            }
+
+
+def cached_json_response(cache, build):
+    """
+    Serve ``build()`` (a JSON-serialisable payload) through ``cache`` with a strong ETag.
+
+    The ETag is a hash of the body, so a rebuilt but unchanged payload keeps its ETag and
+    clients revalidating with If-None-Match still get 304 Not Modified. Entries are built
+    from the primary even in views routed to a replica: one built from a lagging replica
+    right after an invalidation would serve stale data to every user until it expires.
+    """
+    key = request.full_path
+    entry = cache.get(key)
+    if entry is None:
+        version = cache.version
+        with reads_on_primary():
+            body = current_app.json.dumps(build()).encode("utf-8")
+        etag = hashlib.sha256(body).hexdigest()
+        cache.put(key, version, body, etag)
+    else:
+        body, etag = entry
+
+    response = Response(body, mimetype="application/json")
+    response.set_etag(etag)
+    # Clients may keep the body but must revalidate on every use; it is per-login data.
+    response.headers["Cache-Control"] = "private, no-cache"
+    return response.make_conditional(request)
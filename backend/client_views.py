@@ -0,0 +1,284 @@
+import datetime
+from datetime import timezone
+
+from flask import Blueprint, Response, current_app, request, jsonify, abort, send_file
+from sqlalchemy.exc import IntegrityError
+
+from extensions import db, read_router, image_store, catalogue_cache, lot_registry, lot_search, event_broker, bid_intake
+from models import User, Auction, Lot, Bid, AuctionWinner
+from auth import token_required, client_required, stream_ticket_required, issue_stream_ticket
+from bid_intake import BidIntakeUnavailable
+from bid_writes import upsert_bids
+from catalogue_cache import cached_json_response
+from image_store import THUMBNAIL_MIMETYPE
+from pagination import paginate
+from serializers import USER, CLIENT_AUCTION_LIST, CLIENT_AUCTION, LOT, BID, WINNER, computed
+from view_helpers import filter_datetime_arg, filter_int_arg
+from winners import leading_bidder_subquery
+
+client_bp = Blueprint("client", __name__)
+
+@client_bp.route('/')
+def hello_world():
+    return 'Hello from Backend! User management is being set up.'
+
+# --- Client Profile Endpoint ---
+@client_bp.route("/profile", methods=["GET"])
+@client_required # Protect with client_required decorator
+def client_profile(current_client): # current_client is passed by the decorator
+    if not current_client.is_active:
+         return jsonify({"message": "Client account is inactive."}), 403
+    fields = USER.requested()
+    profile = db.session.query(*USER.columns(fields)).filter(User.user_id == current_client.user_id).first()
+    if profile is None:
+        abort(404)
+    return jsonify(USER.dump_one(profile, fields)), 200
+
+# --- Bid Submission Endpoint ---
+@client_bp.route("/auctions/<int:auction_id>/lots/<int:lot_id>/bid", methods=["POST"])
+@client_required # Only authenticated clients can bid
+def submit_bid(current_client, auction_id, lot_id):
+    data = request.get_json()
+    bid_amount_str = data.get("bid_amount")
+
+    if not bid_amount_str:
+        return jsonify({"message": "Bid amount is required"}), 400
+
+    try:
+        bid_amount = float(bid_amount_str)
+        if bid_amount <= 0:
+            raise ValueError("Bid amount must be positive")
+    except ValueError as e:
+        return jsonify({"message": f"Invalid bid amount: {str(e)}"}), 400
+
+    if not current_client.is_active:
+        return jsonify({"message": "Your account is inactive. Cannot place bids."}), 403
+
+    if current_client.deposit_status not in ["on_file", "cleared"]:
+        return jsonify({"message": "Bidding restricted. Your deposit is not on file or cleared. Please contact support."}), 403
+
+    # Served from the in-process registry for active auctions; only a cold lot reaches the database.
+    target = lot_registry.fetch(lot_id)
+    if target is None:
+        abort(404)
+
+    if target.auction_id != auction_id:
+        return jsonify({"message": "Lot does not belong to the specified auction."}), 400
+
+    if target.status != "active":
+        return jsonify({"message": f"Auction is not active. Current status: {target.status}"}), 403
+    if not target.is_visible:
+        return jsonify({"message": "Auction is not visible."}), 403
+    if datetime.datetime.now(timezone.utc) >= target.end_time:
+        return jsonify({"message": "Auction has already ended."}), 403
+
+    if target.min_bid is not None and bid_amount < target.min_bid:
+        return jsonify({"message": f"Your bid must be at least ${target.min_bid:.2f}"}), 400
+
+    # Atomic insert-or-replace on (lot_id, user_id); concurrent submits cannot hit the unique constraint.
+    try:
+        bid_time = datetime.datetime.now(timezone.utc)
+        bid_row = {
+            "lot_id": lot_id,
+            "user_id": current_client.user_id,
+            "bid_amount": bid_amount,
+            "bid_time": bid_time
+        }
+        if current_app.config['BID_INTAKE_ENABLED']:
+            # Release this request's connection (and any read snapshot) while it waits for the writer.
+            db.session.close()
+            written = [bid_intake.submit(bid_row)]
+        else:
+            written = upsert_bids([bid_row])
+            db.session.commit()
+    except IntegrityError as e:
+        # e.g. the lot or the account was deleted between validation and the write.
+        db.session.rollback()
+        current_app.logger.warning(f"Bid conflict on lot {lot_id}: {str(e.orig)}")
+        return jsonify({"message": "Your bid conflicted with a concurrent change. Please refresh and try again."}), 409
+    except BidIntakeUnavailable:
+        raise
+    except Exception as e:
+        db.session.rollback()
+        current_app.logger.error(f"Error committing bid: {str(e)}")
+        return jsonify({"message": "Could not submit bid due to a server error."}), 500
+
+    read_router.note_write(current_client.user_id)
+    bid_action_message = "Bid submitted successfully." if written[0].inserted else "Your bid has been updated."
+    # Ack to the bidder's own open streams in this process (e.g. another tab); amounts are never broadcast.
+    event_broker.publish("bid_accepted", auction_id, {
+        "lot_id": lot_id,
+        "bid_id": written[0].bid_id,
+        "bid_amount": bid_amount,
+        "bid_time": bid_time.isoformat()
+    }, user_id=current_client.user_id)
+    return jsonify({"message": bid_action_message, "lot_id": lot_id, "bid_amount": bid_amount}), 201
+
+# --- List Client's Bids Endpoint ---
+@client_bp.route("/my-bids", methods=["GET"])
+@client_required
+@read_router.reads
+def get_my_bids(current_client):
+    # One joined projection, like /my-wins; the leading flag is a correlated subquery that is
+    # only evaluated for the rows on the returned page, and only when it is asked for.
+    serializer = BID.extend(is_leading=computed(leading_bidder_subquery(Bid.lot_id) == current_client.user_id, encode=bool))
+    fields = serializer.requested()
+    query = db.session.query(*serializer.columns(fields, keys=["bid_time", "bid_id"]))\
+     .select_from(Bid)\
+     .join(Lot, Bid.lot_id == Lot.lot_id)\
+     .join(Auction, Lot.auction_id == Auction.auction_id)\
+     .filter(Bid.user_id == current_client.user_id)
+    if request.args.get("status"):
+        query = query.filter(Bid.status == request.args["status"])
+    auction_id = filter_int_arg("auction_id")
+    if auction_id is not None:
+        query = query.filter(Lot.auction_id == auction_id)
+    placed_after = filter_datetime_arg("placed_after")
+    if placed_after:
+        query = query.filter(Bid.bid_time >= placed_after)
+    placed_before = filter_datetime_arg("placed_before")
+    if placed_before:
+        query = query.filter(Bid.bid_time < placed_before)
+    bids, next_cursor = paginate(query, [Bid.bid_time, Bid.bid_id])
+    return jsonify({"bids": serializer.dump(bids, fields), "next_cursor": next_cursor}), 200
+
+# --- Client-Facing Auction Endpoints ---
+@client_bp.route("/auctions", methods=["GET"])
+@token_required
+@read_router.reads
+def get_active_auctions_for_clients(current_user):
+    carrier_filter = request.args.get("carrier_id")
+    fields = CLIENT_AUCTION_LIST.requested()
+    # The carrier is always fetched, for the grouping, whether or not the page renders it.
+    query = db.session.query(*CLIENT_AUCTION_LIST.columns(fields, keys=["carrier_id", "carrier_name"]))\
+        .filter(Auction.status == "active", Auction.is_visible == True)
+
+    if carrier_filter:
+        try:
+            carrier_id_int = int(carrier_filter)
+            query = query.filter(Auction.carrier_id == carrier_id_int)
+        except ValueError:
+            return jsonify({"message": "Invalid carrier_id format."}), 400
+
+    def build_catalogue():
+        auctions = query.order_by(Auction.end_time.asc()).all()
+
+        output = CLIENT_AUCTION_LIST.dump(auctions, fields)
+        auctions_by_carrier = {}
+
+        for auction, auction_data in zip(auctions, output):
+            if auction.carrier_name not in auctions_by_carrier:
+                auctions_by_carrier[auction.carrier_name] = {
+                    "carrier_id": auction.carrier_id,
+                    "carrier_name": auction.carrier_name,
+                    "auctions": []
+                }
+            auctions_by_carrier[auction.carrier_name]["auctions"].append(auction_data)
+
+        return {"auctions_list": output, "auctions_by_carrier": auctions_by_carrier}
+
+    return cached_json_response(catalogue_cache, build_catalogue)
+
+@client_bp.route("/auctions/<int:auction_id>", methods=["GET"])
+@token_required
+@read_router.reads
+def get_auction_details_for_clients(current_user, auction_id):
+    """A live auction and a page of its lots; ?fields= picks auction fields and ?lot_fields= lot fields."""
+    fields = CLIENT_AUCTION.requested()
+    lot_fields = LOT.requested("lot_fields")
+
+    def build_auction_details():
+        auction = db.session.query(*CLIENT_AUCTION.columns(fields))\
+            .filter(Auction.auction_id == auction_id, Auction.status == "active", Auction.is_visible == True)\
+            .first()
+        if auction is None:
+            abort(404)
+
+        lots_query = db.session.query(*LOT.columns(lot_fields, keys=["lot_id"])).filter(Lot.auction_id == auction_id)
+        if request.args.get("condition"):
+            lots_query = lots_query.filter(Lot.condition == request.args["condition"])
+        lots, lots_next_cursor = paginate(lots_query, [Lot.lot_id], descending=False)
+
+        return {
+            **CLIENT_AUCTION.dump_one(auction, fields),
+            "lots": LOT.dump(lots, lot_fields),
+            "lots_next_cursor": lots_next_cursor
+        }
+
+    return cached_json_response(catalogue_cache, build_auction_details)
+
+@client_bp.route("/lots/search", methods=["GET"])
+@token_required
+@read_router.reads
+def search_lots(current_user):
+    """Lots of live auctions matching ?q=, filtered by carrier_id, condition and auction_id, with facets."""
+    params = {
+        "q": request.args.get("q"),
+        "carrier_id": filter_int_arg("carrier_id"),
+        "condition": request.args.get("condition") or None,
+        "auction_id": filter_int_arg("auction_id"),
+        "cursor": request.args.get("cursor"),
+        "limit": request.args.get("limit")
+    }
+    return cached_json_response(catalogue_cache, lambda: lot_search.search(**params))
+
+# --- Live Auction Events (Server-Sent Events) ---
+def event_stream_response(subscription):
+    response = Response(event_broker.stream(subscription), mimetype="text/event-stream")
+    response.headers["Cache-Control"] = "no-cache"
+    response.headers["X-Accel-Buffering"] = "no" # Stop nginx from buffering the stream
+    return response
+
+@client_bp.route("/auctions/events/ticket", methods=["POST"])
+@token_required
+def create_event_stream_ticket(current_user):
+    """A short-lived ticket for opening event streams, passed to them as ?ticket=."""
+    return jsonify({
+        "ticket": issue_stream_ticket(current_user.user_id),
+        "expires_in": current_app.config["EVENT_STREAM_TICKET_SECONDS"]
+    }), 201
+
+# Each open stream holds a worker thread; see EventBroker for the worker model they need.
+@client_bp.route("/auctions/events", methods=["GET"])
+@stream_ticket_required
+def stream_all_auction_events(current_user):
+    # Status and end-time changes of every auction, for the auction browse page.
+    return event_stream_response(event_broker.subscribe())
+
+@client_bp.route("/auctions/<int:auction_id>/events", methods=["GET"])
+@stream_ticket_required
+def stream_auction_events(current_user, auction_id):
+    return event_stream_response(event_broker.subscribe(auction_id, current_user.user_id))
+
+# --- List Client's Won Lots Endpoint ---
+@client_bp.route("/my-wins", methods=["GET"])
+@client_required # Only authenticated clients can see their wins
+@read_router.reads
+def get_my_wins(current_client):
+    # AuctionWinner joined with Lot, Auction, and Bid for the details of each win.
+    fields = WINNER.requested()
+    query = db.session.query(*WINNER.columns(fields, keys=["awarded_at", "winner_id"]))\
+     .select_from(AuctionWinner)\
+     .join(Lot, AuctionWinner.lot_id == Lot.lot_id)\
+     .join(Auction, Lot.auction_id == Auction.auction_id)\
+     .join(Bid, AuctionWinner.winning_bid_id == Bid.bid_id)\
+     .filter(AuctionWinner.user_id == current_client.user_id)
+    awarded_after = filter_datetime_arg("awarded_after")
+    if awarded_after:
+        query = query.filter(AuctionWinner.awarded_at >= awarded_after)
+    awarded_before = filter_datetime_arg("awarded_before")
+    if awarded_before:
+        query = query.filter(AuctionWinner.awarded_at < awarded_before)
+    won_items, next_cursor = paginate(query, [AuctionWinner.awarded_at, AuctionWinner.winner_id])
+    return jsonify({"wins": WINNER.dump(won_items, fields), "next_cursor": next_cursor}), 200
+
+@client_bp.route("/images/<image_key>/<variant>.webp", methods=["GET"])
+def serve_image(image_key, variant):
+    # Content-addressed and never rewritten, so caches may keep it for a year without revalidating.
+    path = image_store.path(image_key, variant)
+    if path is None:
+        abort(404)
+    response = send_file(path, mimetype=THUMBNAIL_MIMETYPE, max_age=31536000, etag=f"{image_key}-{variant}")
+    response.cache_control.public = True
+    response.cache_control.immutable = True
+    return response
@@ -0,0 +1,71 @@
+import click
+from flask.cli import with_appcontext
+
+from extensions import db, auction_scheduler, image_store, invalidation_bus
+from invalidation_bus import AUCTION
+from models import User, Lot
+
+DEFAULT_ADMIN_EMAIL = 'admin@phonescanada.com'
+
+
+@click.command('auction-scheduler')
+@with_appcontext
+def run_auction_scheduler():
+    """Run the auction lifecycle scheduler in the foreground as a dedicated worker."""
+    auction_scheduler.run_forever()
+
+
+@click.command('check-query-plans')
+@click.option('--seed', is_flag=True, help='Fill an empty (scratch) database with a realistic dataset first.')
+@with_appcontext
+def check_query_plans_command(seed):
+    """EXPLAIN the hot endpoints' queries; exit non-zero if any fully scans a hot table."""
+    from query_plans import check_query_plans
+    if check_query_plans(seed=seed, echo=click.echo):
+        raise SystemExit(1)
+
+
+@click.command('ingest-images')
+@click.argument('auction_id', type=int, required=False)
+@with_appcontext
+def ingest_images_command(auction_id):
+    """Copy lot images into the image store, for AUCTION_ID or every auction with missing ones."""
+    from lot_ingest import ingest_lot_images
+    if auction_id is None:
+        auction_ids = db.session.scalars(
+            db.select(Lot.auction_id).where(Lot.image_url.isnot(None), Lot.image_key.is_(None)).distinct()
+        ).all()
+    else:
+        auction_ids = [auction_id]
+    for auction_id in auction_ids:
+        images_linked, image_errors = ingest_lot_images(image_store, auction_id)
+        db.session.commit()
+        invalidation_bus.publish(AUCTION, [auction_id])
+        click.echo(f'Auction {auction_id}: {images_linked} lots linked, {len(image_errors)} image errors.')
+        for error in image_errors:
+            click.echo(f'  {error}')
+
+
+def create_default_admin():
+    """Create any missing tables and the default admin account. Needs an app context."""
+    db.create_all()
+    if not User.query.filter_by(email=DEFAULT_ADMIN_EMAIL).first():
+        admin_user = User(email=DEFAULT_ADMIN_EMAIL, role='admin', company_name='PhonesCanada Admin')
+        admin_user.set_password('AdminPass123!')
+        db.session.add(admin_user)
+        db.session.commit()
+        return True
+    return False
+
+
+@click.command('bootstrap')
+@with_appcontext
+def bootstrap_command():
+    """Create missing tables and the default admin; run once per deploy, not on every start."""
+    if create_default_admin():
+        click.echo('Default admin user created.')
+    else:
+        click.echo('Default admin user already exists.')
+
+
+COMMANDS = [run_auction_scheduler, check_query_plans_command, ingest_images_command, bootstrap_command]
@@ -0,0 +1,132 @@
+import itertools
+import os
+import threading
+import time
+from contextlib import contextmanager
+from functools import wraps
+
+from flask import g, has_app_context
+from flask_sqlalchemy.session import Session
+from sqlalchemy.sql.dml import UpdateBase
+
+READ_BIND_PREFIX = "read_"
+
+
+def engine_options(prefix):
+    """
+    Pool settings for one engine from ``<prefix>POOL_SIZE``, ``<prefix>MAX_OVERFLOW``,
+    ``<prefix>POOL_TIMEOUT`` and ``<prefix>POOL_RECYCLE``; unset ones keep SQLAlchemy's defaults.
+    """
+    options = {"pool_pre_ping": True}
+    for name, option, cast in (
+        ("POOL_SIZE", "pool_size", int),
+        ("MAX_OVERFLOW", "max_overflow", int),
+        ("POOL_TIMEOUT", "pool_timeout", float),
+        ("POOL_RECYCLE", "pool_recycle", int),
+    ):
+        value = os.environ.get(prefix + name)
+        if value:
+            options[option] = cast(value)
+    return options
+
+
+def read_binds(urls, prefix="READ_DB_"):
+    """``SQLALCHEMY_BINDS`` entries ``read_0``, ``read_1``, ... for a comma-separated URL list."""
+    return {
+        f"{READ_BIND_PREFIX}{index}": dict(engine_options(prefix), url=url.strip())
+        for index, url in enumerate(url for url in (urls or "").split(",") if url.strip())
+    }
+
+
+@contextmanager
+def reads_on_primary():
+    """Send the current request's reads to the primary within the block, even in a routed view."""
+    read_bind = g.pop("db_read_bind", None) if has_app_context() else None
+    try:
+        yield
+    finally:
+        if read_bind is not None:
+            g.db_read_bind = read_bind
+
+
+class RoutingSession(Session):
+    """
+    Session that sends a request's reads to the read engine chosen by :class:`ReadRouter`.
+
+    Writes (INSERT/UPDATE/DELETE statements and ORM flushes) always go to the primary,
+    as does everything outside a routed request (scheduler, bid intake writer, CLI).
+    """
+
+    def get_bind(self, mapper=None, clause=None, bind=None, **kwargs):
+        if bind is None and not self._flushing and not isinstance(clause, UpdateBase) and has_app_context():
+            read_bind = g.get("db_read_bind")
+            if read_bind is not None:
+                return self._db.engines[read_bind]
+        return super().get_bind(mapper=mapper, clause=clause, bind=bind, **kwargs)
+
+
+class ReadRouter:
+    """
+    Chooses read engines for the endpoints wrapped with :meth:`reads`.
+
+    Read engines are the ``read_*`` binds, used in turn. A user who wrote within the last
+    ``read_your_writes_seconds`` (see :meth:`note_write`) is kept on the primary, so a
+    replica that lags behind cannot hide their own bid. That window is tracked per
+    process, like the other in-process caches. Data shared between users, such as
+    catalogue cache entries, is built under :func:`reads_on_primary` instead.
+    """
+
+    def __init__(self, app=None, read_your_writes_seconds=5):
+        self.read_your_writes_seconds = read_your_writes_seconds
+        self.bind_keys = []
+        self._next = itertools.count()
+        self._recent_writers = {}  # user_id -> monotonic expiry
+        self._lock = threading.Lock()
+        self.routed_reads = 0
+        self.pinned_reads = 0
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        self.read_your_writes_seconds = app.config.get("READ_YOUR_WRITES_SECONDS", self.read_your_writes_seconds)
+        self.bind_keys = sorted(key for key in app.config.get("SQLALCHEMY_BINDS", {}) if key.startswith(READ_BIND_PREFIX))
+
+    def note_write(self, user_id):
+        now = time.monotonic()
+        with self._lock:
+            self._recent_writers[user_id] = now + self.read_your_writes_seconds
+            # Drop expired entries now and then so the map stays small.
+            if len(self._recent_writers) > 10000:
+                self._recent_writers = {uid: expiry for uid, expiry in self._recent_writers.items() if expiry > now}
+
+    def _pinned(self, user_id):
+        with self._lock:
+            expiry = self._recent_writers.get(user_id)
+            return expiry is not None and expiry > time.monotonic()
+
+    def reads(self, f):
+        """Route a read-only view (taking ``current_user`` first) to a read engine."""
+        @wraps(f)
+        def decorated(current_user, *args, **kwargs):
+            if not self.bind_keys:
+                return f(current_user, *args, **kwargs)
+            if self._pinned(current_user.user_id):
+                with self._lock:
+                    self.pinned_reads += 1
+                return f(current_user, *args, **kwargs)
+            g.db_read_bind = self.bind_keys[next(self._next) % len(self.bind_keys)]
+            with self._lock:
+                self.routed_reads += 1
+            try:
+                return f(current_user, *args, **kwargs)
+            finally:
+                g.pop("db_read_bind", None)
+        return decorated
+
+    def stats(self):
+        with self._lock:
+            return {
+                "read_engines": len(self.bind_keys),
+                "routed_reads": self.routed_reads,
+                "pinned_reads": self.pinned_reads
+            }
@@ -0,0 +1,127 @@
+import json
+import queue
+import threading
+from datetime import datetime, timezone
+
+
+class Subscription:
+    """One connected event stream: a bounded queue of encoded messages."""
+
+    def __init__(self, auction_id, user_id, max_queued):
+        self.auction_id = auction_id
+        self.user_id = user_id
+        self.queue = queue.Queue(max_queued)
+        # Set when the client fell behind; the stream closes and the client reconnects and refetches.
+        self.overflowed = False
+
+
+def format_event(event, data):
+    return f"event: {event}\ndata: {json.dumps(data, separators=(',', ':'))}\n\n".encode("utf-8")
+
+
+def server_time_event():
+    return format_event("time", {"server_time": datetime.now(timezone.utc).isoformat()})
+
+
+class EventBroker:
+    """
+    Fans out compact auction events to Server-Sent Events streams.
+
+    Each event is encoded once by :meth:`publish` and the same bytes are queued for every
+    matching subscriber, so one status change reaches all connected bidders without any
+    of them re-fetching the auction. Subscribers to ``auction_id=None`` get the status
+    and end-time events of every auction; events with a ``user_id`` (bid acks) only go
+    to that user's streams for the auction. Streams also send the server time on connect
+    and every ``heartbeat_seconds``, which keeps proxies from closing idle connections and
+    lets clients correct their clocks.
+
+    Streams are connected to one process, so :meth:`publish` also passes auction-wide
+    events to ``relay`` (the invalidation bus), and events relayed by other processes, such
+    as other web workers or the ``flask auction-scheduler`` process, arrive through
+    :meth:`deliver`. Per-user events are not relayed: a bid ack would otherwise cost a
+    NOTIFY on the bid path even when the bidder has no stream open, and the bid response
+    already carries the same outcome, so only the bidder's streams on this process get it.
+
+    Each open stream holds its worker thread for as long as the client stays connected,
+    so serve the app with threaded or async workers (e.g. gunicorn ``-k gthread --threads
+    100`` or ``-k gevent``); with sync workers every connected bidder pins a whole worker.
+    """
+
+    def __init__(self, heartbeat_seconds=15, max_queued=100, relay=None):
+        self.heartbeat_seconds = heartbeat_seconds
+        self.max_queued = max_queued
+        # Called with each published event as a dict, to pass it on to the other processes.
+        self.relay = relay
+        # auction_id (None for all auctions) -> set of Subscription
+        self._subscribers = {}
+        self._lock = threading.Lock()
+        self.published = 0
+        self.dropped = 0
+
+    def init_app(self, app):
+        self.heartbeat_seconds = app.config.get("EVENT_STREAM_HEARTBEAT_SECONDS", self.heartbeat_seconds)
+        self.max_queued = app.config.get("EVENT_STREAM_MAX_QUEUED", self.max_queued)
+
+    def subscribe(self, auction_id=None, user_id=None):
+        subscription = Subscription(auction_id, user_id, self.max_queued)
+        with self._lock:
+            self._subscribers.setdefault(auction_id, set()).add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription):
+        with self._lock:
+            subscribers = self._subscribers.get(subscription.auction_id)
+            if subscribers is not None:
+                subscribers.discard(subscription)
+                if not subscribers:
+                    del self._subscribers[subscription.auction_id]
+
+    def publish(self, event, auction_id, data, user_id=None):
+        """
+        Send an event to the matching streams of this process and, through ``relay``, of all
+        others; events for one ``user_id`` stay in this process.
+        """
+        self._fan_out(event, auction_id, data, user_id)
+        if self.relay is not None and user_id is None:
+            self.relay({"event": event, "auction_id": auction_id, "data": data, "user_id": user_id})
+
+    def deliver(self, message):
+        """Send an event relayed by another process to the matching streams of this one."""
+        self._fan_out(message["event"], message["auction_id"], message["data"], message["user_id"])
+
+    def _fan_out(self, event, auction_id, data, user_id):
+        message = format_event(event, dict(data, auction_id=auction_id))
+        with self._lock:
+            targets = list(self._subscribers.get(auction_id, ()))
+            if user_id is None:
+                targets.extend(self._subscribers.get(None, ()))
+            self.published += 1
+        for subscription in targets:
+            if user_id is not None and subscription.user_id != user_id:
+                continue
+            try:
+                subscription.queue.put_nowait(message)
+            except queue.Full:
+                subscription.overflowed = True
+                with self._lock:
+                    self.dropped += 1
+
+    def stream(self, subscription):
+        """Generator of SSE bytes for ``subscription``; unsubscribes when the client goes away."""
+        try:
+            yield f"retry: {self.heartbeat_seconds * 1000}\n".encode("utf-8") + server_time_event()
+            while not subscription.overflowed:
+                try:
+                    yield subscription.queue.get(timeout=self.heartbeat_seconds)
+                except queue.Empty:
+                    yield server_time_event()
+        finally:
+            self.unsubscribe(subscription)
+
+    def stats(self):
+        with self._lock:
+            return {
+                "connections": sum(len(subscribers) for subscribers in self._subscribers.values()),
+                "published": self.published,
+                "dropped": self.dropped
+            }
@@ -0,0 +1,124 @@
+"""
+The app's extensions and shared components, created unbound and attached by ``create_app``.
+
+Modules import what they need from here rather than from ``app``, so nothing has to build
+an application to import a model or a helper.
+"""
+from flask_sqlalchemy import SQLAlchemy
+from flask_migrate import Migrate
+from flask_bcrypt import Bcrypt
+
+from password_hashing import PasswordHasher
+from instrumentation import RequestMetrics
+from image_store import ImageStore
+from db_routing import RoutingSession, ReadRouter
+from invalidation_bus import InvalidationBus, USER, CARRIER, AUCTION, AUCTION_EVENT
+
+db = SQLAlchemy(session_options={"class_": RoutingSession})
+migrate = Migrate()
+bcrypt = Bcrypt()
+password_hasher = PasswordHasher()
+request_metrics = RequestMetrics()
+read_router = ReadRouter()
+image_store = ImageStore()
+# Admin changes publish here, after committing; every worker then drops what they made stale.
+invalidation_bus = InvalidationBus()
+
+# These components import the models, which import db from here, so they come after it.
+from auction_scheduler import AuctionScheduler
+from principal_cache import PrincipalCache
+from catalogue_cache import CatalogueCache
+from lot_registry import LotRegistry
+from lot_search import LotSearch
+from event_broker import EventBroker
+from bid_intake import BidIntakeQueue
+
+auction_scheduler = AuctionScheduler()
+principal_cache = PrincipalCache()
+# Client catalogue responses, invalidated by every carrier and auction event.
+catalogue_cache = CatalogueCache()
+# Other workers learn about the scheduler's transitions too, e.g. from a dedicated scheduler process.
+auction_scheduler.listeners.append(lambda activated_ids, closed_ids: invalidation_bus.publish(AUCTION, [*activated_ids, *closed_ids]))
+# The in-process search index is rebuilt whenever the catalogue cache is invalidated.
+lot_search = LotSearch(version=lambda: catalogue_cache.version)
+# Bid validation data for active auctions; evicted by auction events, then reloaded on demand.
+lot_registry = LotRegistry()
+
+
+def invalidate_principals(user_ids):
+    if user_ids is None:
+        principal_cache.clear()
+    for user_id in user_ids or ():
+        principal_cache.invalidate(user_id)
+
+
+def evict_auctions(auction_ids):
+    if auction_ids is None:
+        lot_registry.clear()
+    for auction_id in auction_ids or ():
+        lot_registry.evict(auction_id)
+
+
+invalidation_bus.subscribe(USER, invalidate_principals)
+invalidation_bus.subscribe(CARRIER, lambda carrier_ids: catalogue_cache.invalidate())
+invalidation_bus.subscribe(AUCTION, lambda auction_ids: catalogue_cache.invalidate())
+invalidation_bus.subscribe(AUCTION, evict_auctions)
+
+
+def refresh_lot_registry(activated_ids, closed_ids):
+    for auction_id in activated_ids:
+        lot_registry.load(auction_id)
+    for auction_id in closed_ids:
+        lot_registry.evict(auction_id)
+
+
+auction_scheduler.listeners.append(refresh_lot_registry)
+# Live auction events for the SSE streams, relayed to and from the other processes over the bus.
+event_broker = EventBroker(relay=lambda message: invalidation_bus.relay(AUCTION_EVENT, message))
+invalidation_bus.subscribe(AUCTION_EVENT, event_broker.deliver)
+
+
+def publish_status_transitions(activated_ids, closed_ids):
+    for auction_id in activated_ids:
+        event_broker.publish("status", auction_id, {"status": "active"})
+    for auction_id in closed_ids:
+        event_broker.publish("status", auction_id, {"status": "closed"})
+
+
+auction_scheduler.listeners.append(publish_status_transitions)
+bid_intake = BidIntakeQueue()
+
+# The /admin/stats counters, also exported as gauges on /metrics.
+STATS_SOURCES = {
+    'principal_cache': principal_cache.stats,
+    'password_hasher': password_hasher.stats,
+    'catalogue_cache': catalogue_cache.stats,
+    'lot_registry': lot_registry.stats,
+    'lot_search': lot_search.stats,
+    'event_streams': event_broker.stats,
+    'bid_intake': bid_intake.stats,
+    'image_store': image_store.stats,
+    'read_router': read_router.stats,
+    'invalidation_bus': invalidation_bus.stats
+}
+
+
+def init_extensions(app):
+    """Bind every extension and component to ``app``."""
+    db.init_app(app)
+    migrate.init_app(app, db)
+    bcrypt.init_app(app)
+    password_hasher.init_app(app)
+    request_metrics.init_app(app)
+    read_router.init_app(app)
+    image_store.init_app(app)
+    invalidation_bus.init_app(app)
+    auction_scheduler.init_app(app)
+    principal_cache.init_app(app)
+    catalogue_cache.init_app(app)
+    lot_search.init_app(app)
+    lot_registry.init_app(app)
+    event_broker.init_app(app)
+    bid_intake.init_app(app)
+    for name, stats in STATS_SOURCES.items():
+        request_metrics.add_source(name, stats)
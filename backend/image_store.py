@@ -0,0 +1,314 @@
+import hashlib
+import http.client
+import io
+import ipaddress
+import multiprocessing
+import os
+import re
+import socket
+import tempfile
+import threading
+import urllib.request
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from urllib.parse import urlsplit
+
+IMAGE_KEY = re.compile(r"^[0-9a-f]{64}$")
+# Derivative name -> longest edge in pixels. "thumb" is for lot cards, "medium" for detail views.
+THUMBNAIL_SIZES = {"thumb": 320, "medium": 960}
+THUMBNAIL_FORMAT = "webp"
+THUMBNAIL_MIMETYPE = "image/webp"
+
+
+class ImageFetchError(Exception):
+    """Raised when an image cannot be fetched or is not a readable image."""
+
+
+def _connect_public(address, timeout=socket._GLOBAL_DEFAULT_TIMEOUT, source_address=None, *args):
+    """
+    ``socket.create_connection`` for image fetches: resolve the host once and connect only
+    if every address is public, so manifests cannot reach loopback, private, link-local
+    (e.g. cloud metadata) or other reserved addresses, directly or through a redirect.
+    """
+    host, port = address
+    try:
+        infos = socket.getaddrinfo(host, port, type=socket.SOCK_STREAM)
+    except socket.gaierror as e:
+        raise ImageFetchError(f"Download failed ({e}).")
+    addresses = []
+    for _family, _type, _proto, _name, sockaddr in infos:
+        ip = ipaddress.ip_address(sockaddr[0].split("%", 1)[0])
+        if ip.version == 6 and ip.ipv4_mapped:
+            ip = ip.ipv4_mapped
+        if not ip.is_global or ip.is_multicast:
+            raise ImageFetchError(f"Image host {host} resolves to a non-public address.")
+        addresses.append(str(ip))
+    # Connect to the vetted address, not the name, so a second lookup cannot be rebound.
+    return socket.create_connection((addresses[0], port), timeout, source_address)
+
+
+class _PublicHTTPConnection(http.client.HTTPConnection):
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._create_connection = _connect_public
+
+
+class _PublicHTTPSConnection(http.client.HTTPSConnection):
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._create_connection = _connect_public
+
+
+class _PublicHTTPHandler(urllib.request.HTTPHandler):
+    def http_open(self, req):
+        return self.do_open(_PublicHTTPConnection, req)
+
+
+class _PublicHTTPSHandler(urllib.request.HTTPSHandler):
+    def https_open(self, req):
+        return self.do_open(_PublicHTTPSConnection, req, context=self._context)
+
+
+class _CheckedRedirectHandler(urllib.request.HTTPRedirectHandler):
+    """Checks every redirect target like the original URL (urllib alone would follow ftp:// too)."""
+
+    def __init__(self, check_url):
+        self.check_url = check_url
+
+    def redirect_request(self, req, fp, code, msg, headers, newurl):
+        self.check_url(newurl)
+        return super().redirect_request(req, fp, code, msg, headers, newurl)
+
+
+def _write_atomically(path, write):
+    # Readers never see a half-written file, and racing writers of the same key are harmless.
+    handle, temp_path = tempfile.mkstemp(dir=os.path.dirname(path), prefix=".tmp-")
+    try:
+        with os.fdopen(handle, "wb") as output:
+            write(output)
+        os.replace(temp_path, path)
+    except BaseException:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+        raise
+
+
+def _make_thumbnails(original_path, directory, sizes, quality):
+    """Render every derivative of one original; runs in the thumbnail worker pool."""
+    from PIL import Image, ImageOps
+
+    with Image.open(original_path) as image:
+        # Let JPEG decode at reduced size when it can; large photos then decode several times faster.
+        image.draft("RGB", (max(sizes.values()),) * 2)
+        image = ImageOps.exif_transpose(image)
+        image = image.convert("RGBA" if image.mode in ("RGBA", "LA", "P") else "RGB")
+        for name, edge in sizes.items():
+            derivative = image.copy()
+            derivative.thumbnail((edge, edge), Image.LANCZOS)
+            _write_atomically(
+                os.path.join(directory, f"{name}.{THUMBNAIL_FORMAT}"),
+                lambda output: derivative.save(output, THUMBNAIL_FORMAT, quality=quality, method=4)
+            )
+    return len(sizes)
+
+
+class ImageStore:
+    """
+    Content-addressed store of lot images with pre-rendered thumbnails.
+
+    An image's key is the SHA-256 of its bytes, so the same picture referenced by many
+    lots (or uploaded twice) is stored and resized once. Each key has a directory under
+    ``root`` holding the original and one WebP per entry of ``THUMBNAIL_SIZES``; files
+    never change once written, so they can be served with year-long cache headers.
+
+    Thumbnails are rendered in a process pool of ``workers`` (``workers=0`` renders on
+    the calling thread); remote images are downloaded by ``fetch_workers`` threads, only
+    from public addresses and, when ``allowed_hosts`` is set, only from those hosts.
+    """
+
+    def __init__(self, root=None, workers=None, fetch_workers=8, fetch_timeout=5,
+                 max_bytes=10 * 1024 * 1024, quality=80, allowed_hosts=()):
+        self.root = root
+        self.workers = os.cpu_count() if workers is None else workers
+        self.fetch_workers = fetch_workers
+        self.fetch_timeout = fetch_timeout
+        self.max_bytes = max_bytes
+        self.quality = quality
+        self.allowed_hosts = frozenset(host.lower() for host in allowed_hosts)
+        self.base_url = ""
+        self._lock = threading.Lock()
+        self._executor = None
+        self._executor_pid = None
+        self._key_locks = {}  # key -> lock held while that image is being stored
+        self.stored = 0
+        self.duplicates = 0
+        self.fetch_errors = 0
+
+    def init_app(self, app):
+        self.root = app.config.get("IMAGE_STORE_ROOT") or self.root or os.path.join(app.instance_path, "images")
+        self.workers = app.config.get("IMAGE_THUMBNAIL_WORKERS", self.workers)
+        self.fetch_workers = app.config.get("IMAGE_FETCH_WORKERS", self.fetch_workers)
+        self.fetch_timeout = app.config.get("IMAGE_FETCH_TIMEOUT_SECONDS", self.fetch_timeout)
+        self.max_bytes = app.config.get("IMAGE_MAX_BYTES", self.max_bytes)
+        self.base_url = app.config.get("IMAGE_BASE_URL", self.base_url).rstrip("/")
+        self.allowed_hosts = frozenset(
+            host.lower() for host in app.config.get("IMAGE_FETCH_ALLOWED_HOSTS", self.allowed_hosts)
+        )
+
+    def _get_executor(self):
+        # Created lazily and per process, so forked web workers each get their own pool.
+        with self._lock:
+            if self._executor is None or self._executor_pid != os.getpid():
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.workers,
+                    mp_context=multiprocessing.get_context("spawn")
+                )
+                self._executor_pid = os.getpid()
+            return self._executor
+
+    def directory(self, key):
+        return os.path.join(self.root, key[:2], key)
+
+    def path(self, key, variant):
+        """Filesystem path of a rendered derivative, or None if the key or variant is unknown."""
+        if not IMAGE_KEY.match(key) or variant not in THUMBNAIL_SIZES:
+            return None
+        path = os.path.join(self.directory(key), f"{variant}.{THUMBNAIL_FORMAT}")
+        return path if os.path.isfile(path) else None
+
+    def url(self, key, variant):
+        return f"{self.base_url}/images/{key}/{variant}.{THUMBNAIL_FORMAT}"
+
+    def has(self, key):
+        return all(self.path(key, variant) is not None for variant in THUMBNAIL_SIZES)
+
+    def put(self, data):
+        """Store image bytes and render their thumbnails unless already present; returns the key."""
+        if len(data) > self.max_bytes:
+            raise ImageFetchError(f"Image is larger than {self.max_bytes} bytes.")
+        key = hashlib.sha256(data).hexdigest()
+        with self._lock:
+            key_lock = self._key_locks.setdefault(key, threading.Lock())
+        # The same picture behind two URLs of one manifest is rendered once, not by both fetchers.
+        with key_lock:
+            try:
+                if self.has(key):
+                    with self._lock:
+                        self.duplicates += 1
+                    return key
+                self._store(key, data)
+            finally:
+                with self._lock:
+                    self._key_locks.pop(key, None)
+        with self._lock:
+            self.stored += 1
+        return key
+
+    def _store(self, key, data):
+        # Pillow is only needed when an image is stored, not by workers that just build URLs.
+        from PIL import Image, UnidentifiedImageError
+
+        try:
+            with Image.open(io.BytesIO(data)) as image:
+                image.verify()
+        except UnidentifiedImageError:
+            raise ImageFetchError("Not a readable image.")
+        except (OSError, SyntaxError, ValueError, Image.DecompressionBombError) as e:
+            raise ImageFetchError(f"Not a readable image ({e}).")
+
+        directory = self.directory(key)
+        os.makedirs(directory, exist_ok=True)
+        original_path = os.path.join(directory, "original")
+        _write_atomically(original_path, lambda output: output.write(data))
+        arguments = (original_path, directory, THUMBNAIL_SIZES, self.quality)
+        try:
+            if not self.workers:
+                _make_thumbnails(*arguments)
+            else:
+                self._get_executor().submit(_make_thumbnails, *arguments).result()
+        except BrokenProcessPool as e:
+            # A worker died (e.g. killed for memory); start a fresh pool for the next image.
+            with self._lock:
+                self._executor = None
+            raise ImageFetchError(f"Could not render thumbnails ({e}).")
+        except (OSError, ValueError, Image.DecompressionBombError) as e:
+            raise ImageFetchError(f"Could not render thumbnails ({e}).")
+
+    def _check_url(self, url):
+        parts = urlsplit(url)
+        if parts.scheme.lower() not in ("http", "https") or not parts.hostname:
+            raise ImageFetchError("Only http and https image URLs can be fetched.")
+        if self.allowed_hosts and parts.hostname.lower() not in self.allowed_hosts:
+            raise ImageFetchError(f"Images cannot be fetched from {parts.hostname}.")
+
+    def fetch(self, url):
+        """
+        Download an http(s) image, refusing anything over ``max_bytes``.
+
+        The URL and every redirect are checked by host, and connections are only made to
+        public addresses. Proxy settings from the environment are ignored, since the address
+        check would then only see the proxy.
+        """
+        try:
+            self._check_url(url)
+        except ValueError:
+            raise ImageFetchError("Not a valid image URL.")
+        opener = urllib.request.build_opener(
+            urllib.request.ProxyHandler({}), _PublicHTTPHandler(), _PublicHTTPSHandler(),
+            _CheckedRedirectHandler(self._check_url)
+        )
+        try:
+            with opener.open(url, timeout=self.fetch_timeout) as response:
+                data = response.read(self.max_bytes + 1)
+        except (OSError, ValueError) as e:
+            raise ImageFetchError(f"Download failed ({e}).")
+        if len(data) > self.max_bytes:
+            raise ImageFetchError(f"Image is larger than {self.max_bytes} bytes.")
+        return data
+
+    def ingest_urls(self, urls):
+        """
+        Fetch and store each distinct URL concurrently.
+
+        Returns ``(keys, errors)``: url -> key for the images stored, url -> message for the rest.
+        """
+        def ingest(url):
+            try:
+                return url, self.put(self.fetch(url)), None
+            except (ImageFetchError, OSError) as e:
+                with self._lock:
+                    self.fetch_errors += 1
+                return url, None, str(e)
+
+        keys, errors = {}, {}
+        with ThreadPoolExecutor(max_workers=max(self.fetch_workers, 1)) as executor:
+            for url, key, error in executor.map(ingest, sorted(set(urls))):
+                if key is not None:
+                    keys[url] = key
+                else:
+                    errors[url] = error
+        return keys, errors
+
+    def lot_image_urls(self, image_key, image_url):
+        """
+        The ``image_url`` / ``thumbnail_url`` pair for a lot payload: store URLs once the
+        image is ingested, otherwise the manifest's original URL for both.
+        """
+        if image_key:
+            return {"image_url": self.url(image_key, "medium"), "thumbnail_url": self.url(image_key, "thumb")}
+        return {"image_url": image_url, "thumbnail_url": image_url}
+
+    def shutdown(self):
+        with self._lock:
+            if self._executor is not None and self._executor_pid == os.getpid():
+                self._executor.shutdown()
+            self._executor = None
+
+    def stats(self):
+        with self._lock:
+            return {
+                "workers": self.workers,
+                "stored": self.stored,
+                "duplicates": self.duplicates,
+                "fetch_errors": self.fetch_errors
+            }
@@ -0,0 +1,196 @@
+import threading
+import time
+
+from flask import Response, g, has_request_context, request
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+# Histogram bucket upper bounds.
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+STATEMENT_BUCKETS = (0, 1, 2, 3, 5, 10, 20, 50, 100, 500)
+
+
+def _label_value(value):
+    return str(value).replace("\\", "\\\\").replace("\"", "\\\"").replace("\n", "\\n")
+
+
+def _labels(**labels):
+    return "{" + ",".join(f'{name}="{_label_value(value)}"' for name, value in labels.items()) + "}"
+
+
+class Histogram:
+    def __init__(self, buckets):
+        self.buckets = buckets
+        self.counts = [0] * len(buckets)
+        self.total = 0
+        self.sum = 0.0
+
+    def observe(self, value):
+        for index, bound in enumerate(self.buckets):
+            if value <= bound:
+                self.counts[index] += 1
+                break
+        self.total += 1
+        self.sum += value
+
+    def render(self, name, labels):
+        cumulative = 0
+        for bound, count in zip(self.buckets, self.counts):
+            cumulative += count
+            yield f"{name}_bucket{_labels(**labels, le=bound)} {cumulative}"
+        yield f"{name}_bucket{_labels(**labels, le='+Inf')} {self.total}"
+        yield f"{name}_sum{_labels(**labels)} {self.sum}"
+        yield f"{name}_count{_labels(**labels)} {self.total}"
+
+
+class RouteStats:
+    def __init__(self):
+        self.latency = Histogram(LATENCY_BUCKETS)
+        self.statements = Histogram(STATEMENT_BUCKETS)
+        self.db_seconds = 0.0
+        self.responses = {}  # status code -> count
+
+
+class RequestMetrics:
+    """
+    Per-route request latency, SQL statement counts and database time, exported as
+    Prometheus text on ``/metrics``.
+
+    Flask request hooks time each request; SQLAlchemy cursor events on every engine add
+    each statement's count and duration to the request that issued it (statements from
+    background threads such as the scheduler are counted separately). A request whose
+    statement count grows with its result size shows up in the statements histogram,
+    which is how N+1 query regressions become visible. Statements slower than
+    ``slow_query_ms`` are logged with their route.
+
+    Other components' ``stats()`` dicts can be exported as gauges with :meth:`add_source`.
+    """
+
+    def __init__(self, app=None, slow_query_ms=0, token=None):
+        self.slow_query_ms = slow_query_ms
+        self.token = token
+        self.app = None
+        self._routes = {}  # (method, route) -> RouteStats
+        self._sources = {}  # name -> callable returning a dict of numbers
+        self._lock = threading.Lock()
+        self.background_statements = 0
+        self.background_db_seconds = 0.0
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        self.app = app
+        self.slow_query_ms = app.config.get("SLOW_QUERY_THRESHOLD_MS", self.slow_query_ms)
+        self.token = app.config.get("METRICS_TOKEN", self.token)
+        app.before_request(self._before_request)
+        app.after_request(self._after_request)
+        app.teardown_request(self._teardown_request)
+        app.add_url_rule("/metrics", "metrics", self.metrics_view, methods=["GET"])
+        # Listening on the Engine class covers every engine the app creates. The listeners
+        # are process-wide, so later apps (tests, CLI, benchmarks) must not add them again.
+        for name, listener in (("before_cursor_execute", self._before_cursor_execute),
+                               ("after_cursor_execute", self._after_cursor_execute),
+                               ("handle_error", self._handle_error)):
+            if not event.contains(Engine, name, listener):
+                event.listen(Engine, name, listener)
+
+    def add_source(self, name, stats):
+        """Export the numeric values of ``stats()`` as ``app_<name>_<key>`` gauges."""
+        self._sources[name] = stats
+
+    # --- Flask hooks ---
+    def _before_request(self):
+        g.metrics_started = time.perf_counter()
+        g.metrics_statements = 0
+        g.metrics_db_seconds = 0.0
+
+    def _after_request(self, response):
+        self._record(response.status_code)
+        return response
+
+    def _teardown_request(self, exc):
+        # Only reached unrecorded when the view raised past the error handlers.
+        if exc is not None:
+            self._record(500)
+
+    def _record(self, status_code):
+        started = g.pop("metrics_started", None)
+        if started is None:
+            return
+        elapsed = time.perf_counter() - started
+        route = request.url_rule.rule if request.url_rule is not None else "(unmatched)"
+        with self._lock:
+            stats = self._routes.get((request.method, route))
+            if stats is None:
+                stats = self._routes[(request.method, route)] = RouteStats()
+            stats.latency.observe(elapsed)
+            stats.statements.observe(g.metrics_statements)
+            stats.db_seconds += g.metrics_db_seconds
+            stats.responses[status_code] = stats.responses.get(status_code, 0) + 1
+
+    # --- SQLAlchemy events ---
+    def _before_cursor_execute(self, conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault("metrics_started", []).append(time.perf_counter())
+
+    def _after_cursor_execute(self, conn, cursor, statement, parameters, context, executemany):
+        started = conn.info["metrics_started"].pop()
+        elapsed = time.perf_counter() - started
+        in_request = has_request_context() and "metrics_started" in g
+        if in_request:
+            g.metrics_statements += 1
+            g.metrics_db_seconds += elapsed
+        else:
+            with self._lock:
+                self.background_statements += 1
+                self.background_db_seconds += elapsed
+        if self.slow_query_ms and elapsed * 1000.0 >= self.slow_query_ms:
+            route = request.url_rule.rule if in_request and request.url_rule is not None else "(background)"
+            self.app.logger.warning(f"Slow query ({elapsed * 1000.0:.1f} ms) in {route}: {' '.join(statement.split())[:2000]}")
+
+    def _handle_error(self, context):
+        # A failed statement never reaches after_cursor_execute; drop its start time.
+        if context.connection is not None and context.connection.info.get("metrics_started"):
+            context.connection.info["metrics_started"].pop()
+
+    # --- Exposition ---
+    def render(self):
+        lines = []
+        with self._lock:
+            routes = sorted(self._routes.items())
+            lines.append("# HELP http_request_duration_seconds Request latency by route.")
+            lines.append("# TYPE http_request_duration_seconds histogram")
+            for (method, route), stats in routes:
+                lines.extend(stats.latency.render("http_request_duration_seconds", {"method": method, "route": route}))
+            lines.append("# HELP http_request_sql_statements SQL statements issued per request, by route.")
+            lines.append("# TYPE http_request_sql_statements histogram")
+            for (method, route), stats in routes:
+                lines.extend(stats.statements.render("http_request_sql_statements", {"method": method, "route": route}))
+            lines.append("# HELP http_request_db_seconds_total Time spent executing SQL, by route.")
+            lines.append("# TYPE http_request_db_seconds_total counter")
+            for (method, route), stats in routes:
+                lines.append(f"http_request_db_seconds_total{_labels(method=method, route=route)} {stats.db_seconds}")
+            lines.append("# HELP http_requests_total Responses by route and status code.")
+            lines.append("# TYPE http_requests_total counter")
+            for (method, route), stats in routes:
+                for status, count in sorted(stats.responses.items()):
+                    lines.append(f"http_requests_total{_labels(method=method, route=route, status=status)} {count}")
+            lines.append("# HELP background_sql_statements_total SQL statements issued outside requests.")
+            lines.append("# TYPE background_sql_statements_total counter")
+            lines.append(f"background_sql_statements_total {self.background_statements}")
+            lines.append("# HELP background_db_seconds_total Time spent executing SQL outside requests.")
+            lines.append("# TYPE background_db_seconds_total counter")
+            lines.append(f"background_db_seconds_total {self.background_db_seconds}")
+
+        for name, stats in sorted(self._sources.items()):
+            for key, value in sorted(stats().items()):
+                if isinstance(value, bool) or not isinstance(value, (int, float)):
+                    continue
+                metric = f"app_{name}_{key}"
+                lines.append(f"# TYPE {metric} gauge")
+                lines.append(f"{metric} {value}")
+        return "\n".join(lines) + "\n"
+
+    def metrics_view(self):
+        if self.token and request.headers.get("Authorization") != f"Bearer {self.token}":
+            return Response("Unauthorized\n", status=401, mimetype="text/plain")
+        return Response(self.render(), mimetype="text/plain; version=0.0.4")
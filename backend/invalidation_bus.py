@@ -0,0 +1,265 @@
+import json
+import logging
+import os
+import re
+import select
+import threading
+import uuid
+import weakref
+
+from sqlalchemy import create_engine, func
+from sqlalchemy import select as sql_select
+from sqlalchemy.engine import make_url
+from sqlalchemy.pool import NullPool
+
+logger = logging.getLogger(__name__)
+
+# Event kinds; each is published with the ids it concerns, or None for "all of them".
+USER = "user"          # a user's role, status or deposit changed, or the user was deleted
+CARRIER = "carrier"    # a carrier was added or renamed
+AUCTION = "auction"    # an auction, its lots or its results changed
+EVENT_KINDS = (USER, CARRIER, AUCTION)
+# Relayed kinds carry a JSON payload to the other processes; they are not invalidations.
+AUCTION_EVENT = "auction_event"  # a live auction event for the SSE streams (see event_broker.py)
+RELAY_KINDS = (AUCTION_EVENT,)
+
+# Ids per NOTIFY; PostgreSQL payloads are limited to 8000 bytes.
+MAX_IDS_PER_MESSAGE = 500
+MAX_PAYLOAD_BYTES = 7900
+
+_CHANNEL = re.compile(r"^[a-z_][a-z0-9_]{0,62}$")
+# Buses of this process using the memory backend, so tests can run several "workers" side by side.
+_memory_buses = weakref.WeakSet()
+
+
+class InvalidationBus:
+    """
+    Broadcasts typed cache invalidation events to every worker process.
+
+    Components subscribe a handler per event kind; :meth:`publish` runs the handlers in
+    this process straight away and sends the event to all other processes, whose
+    handlers run on a listener thread. Handlers must only touch in-memory state.
+
+    The "postgresql" backend uses LISTEN/NOTIFY on ``channel``: each process keeps one
+    dedicated listening connection, and whenever it (re)connects it calls every handler
+    with ``None`` because events may have been missed meanwhile. The "memory" backend only
+    reaches the buses of the current process (single-process runs and tests). "auto"
+    picks by the database URL's dialect.
+
+    The same channel also relays small payloads between processes (:meth:`relay`), such
+    as live auction events for the SSE streams of every worker. Those are best effort:
+    one sent while a listener is reconnecting is lost, and they are not resynced.
+    """
+
+    def __init__(self, backend="auto", channel="cache_invalidation", reconnect_seconds=5):
+        self.backend = backend
+        self.channel = channel
+        self.reconnect_seconds = reconnect_seconds
+        self.database_url = None
+        self._handlers = {}
+        # Tells this process's own NOTIFYs apart from other workers' and hosts'.
+        self._token = uuid.uuid4().hex[:12]
+        self._lock = threading.Lock()
+        self._thread = None
+        self._thread_pid = None
+        self._stopping = threading.Event()
+        self._notify_engine = None
+        self._notify_engine_pid = None
+        self.connected = False
+        self.published = 0
+        self.received = 0
+        self.relayed = 0
+        self.publish_errors = 0
+        self.reconnects = 0
+
+    def init_app(self, app):
+        self.database_url = app.config.get("SQLALCHEMY_DATABASE_URI")
+        self.channel = app.config.get("INVALIDATION_BUS_CHANNEL", self.channel)
+        self.reconnect_seconds = app.config.get("INVALIDATION_BUS_RECONNECT_SECONDS", self.reconnect_seconds)
+        backend = app.config.get("INVALIDATION_BUS_BACKEND", self.backend)
+        if backend == "auto":
+            backend = "postgresql" if make_url(self.database_url).get_backend_name() == "postgresql" else "memory"
+        if backend not in ("postgresql", "memory"):
+            raise ValueError(f"Unknown INVALIDATION_BUS_BACKEND {backend!r}.")
+        if not _CHANNEL.match(self.channel):
+            raise ValueError(f"Invalid INVALIDATION_BUS_CHANNEL {self.channel!r}.")
+        self.backend = backend
+        if backend == "memory":
+            _memory_buses.add(self)
+        else:
+            # Each (forked) worker starts listening before it serves its first request.
+            app.before_request(self._ensure_listener)
+
+    def subscribe(self, kind, handler):
+        """
+        Call ``handler(ids)`` for every ``kind`` event, from any process; ``ids`` may be None.
+        For a relayed kind, ``handler(data)`` is called with each payload from other processes.
+        """
+        if kind not in EVENT_KINDS + RELAY_KINDS:
+            raise ValueError(f"Unknown invalidation event kind {kind!r}.")
+        self._handlers.setdefault(kind, []).append(handler)
+
+    @property
+    def origin(self):
+        return f"{self._token}:{os.getpid()}"
+
+    def publish(self, kind, ids=None):
+        """Apply an event here and broadcast it. Call after the change is committed."""
+        if kind not in EVENT_KINDS:
+            raise ValueError(f"Unknown invalidation event kind {kind!r}.")
+        ids = sorted(set(ids)) if ids is not None else None
+        if ids == []:
+            return
+        self._dispatch(kind, ids)
+        with self._lock:
+            self.published += 1
+        batches = [None] if ids is None else [ids[i:i + MAX_IDS_PER_MESSAGE] for i in range(0, len(ids), MAX_IDS_PER_MESSAGE)]
+        messages = [json.dumps({"origin": self.origin, "kind": kind, "ids": batch}, separators=(",", ":"))
+                    for batch in batches]
+        self._broadcast(kind, messages)
+
+    def relay(self, kind, data):
+        """Send a JSON-serialisable ``data`` to the ``kind`` handlers of the other processes only."""
+        if kind not in RELAY_KINDS:
+            raise ValueError(f"Unknown relay kind {kind!r}.")
+        message = json.dumps({"origin": self.origin, "kind": kind, "data": data}, separators=(",", ":"))
+        if len(message.encode("utf-8")) > MAX_PAYLOAD_BYTES:
+            with self._lock:
+                self.publish_errors += 1
+            logger.warning("Not relaying a %s message of %d bytes", kind, len(message))
+            return
+        with self._lock:
+            self.relayed += 1
+        self._broadcast(kind, [message])
+
+    def _broadcast(self, kind, messages):
+        if self.backend == "memory":
+            for bus in list(_memory_buses):
+                if bus is not self and bus.channel == self.channel:
+                    for message in messages:
+                        bus._receive(message)
+            return
+        try:
+            self._notify(messages)
+        except Exception:
+            # Invalidations are applied here already and other workers catch up within their
+            # cache TTLs; a relayed message is lost.
+            with self._lock:
+                self.publish_errors += 1
+            logger.exception("Could not publish %s message", kind)
+
+    def _dispatch(self, kind, ids):
+        for handler in self._handlers.get(kind, ()):
+            try:
+                handler(ids)
+            except Exception:
+                logger.exception("Invalidation handler for %s failed", kind)
+
+    def _receive(self, payload):
+        try:
+            message = json.loads(payload)
+            origin, kind = message["origin"], message["kind"]
+            ids = message["data"] if kind in RELAY_KINDS else message["ids"]
+        except (ValueError, TypeError, KeyError):
+            logger.warning("Ignoring malformed invalidation message %r", payload)
+            return
+        if origin == self.origin:
+            return
+        with self._lock:
+            self.received += 1
+        self._dispatch(kind, ids)
+
+    def _resync(self):
+        for kind in EVENT_KINDS:
+            self._dispatch(kind, None)
+
+    # --- PostgreSQL LISTEN/NOTIFY ---
+    def _notify(self, messages):
+        # A small pool of its own, so publishing never waits for a slot of the request pool.
+        with self._lock:
+            if self._notify_engine is None or self._notify_engine_pid != os.getpid():
+                self._notify_engine = create_engine(self.database_url, pool_size=1, max_overflow=4, pool_pre_ping=True)
+                self._notify_engine_pid = os.getpid()
+            engine = self._notify_engine
+        with engine.connect() as connection:
+            for message in messages:
+                connection.execute(sql_select(func.pg_notify(self.channel, message)))
+            connection.commit()
+
+    def _ensure_listener(self):
+        # Started lazily and per process, so forked web workers each run their own listener.
+        if self._thread_pid == os.getpid():
+            return
+        with self._lock:
+            if self._thread is None or self._thread_pid != os.getpid():
+                self._stopping.clear()
+                self._thread = threading.Thread(target=self._listen, name="invalidation-listener", daemon=True)
+                self._thread_pid = os.getpid()
+                self._thread.start()
+
+    def _listen(self):
+        engine = create_engine(self.database_url, poolclass=NullPool)
+        first = True
+        while not self._stopping.is_set():
+            connection = None
+            try:
+                connection = engine.raw_connection()
+                driver = connection.driver_connection
+                driver.autocommit = True
+                with driver.cursor() as cursor:
+                    cursor.execute(f"LISTEN {self.channel}")
+                self.connected = True
+                if not first:
+                    with self._lock:
+                        self.reconnects += 1
+                first = False
+                # Anything cached before LISTEN took effect may have missed an event.
+                self._resync()
+                while not self._stopping.is_set():
+                    payloads = self._wait_for_notifies(driver)
+                    if payloads is None:
+                        # Idle: a round trip makes a silently dropped connection raise here.
+                        with driver.cursor() as cursor:
+                            cursor.execute("SELECT 1")
+                    for payload in payloads or ():
+                        self._receive(payload)
+            except Exception:
+                logger.exception("Invalidation listener lost its connection; reconnecting")
+                first = False
+            finally:
+                self.connected = False
+                if connection is not None:
+                    try:
+                        connection.close()
+                    except Exception:
+                        pass
+            self._stopping.wait(self.reconnect_seconds)
+
+    def _wait_for_notifies(self, driver):
+        """Payloads received within ``reconnect_seconds``, or None if the connection stayed idle."""
+        if hasattr(driver, "poll"):
+            # psycopg2
+            if select.select([driver], [], [], self.reconnect_seconds) == ([], [], []):
+                return None
+            driver.poll()
+            payloads = [notify.payload for notify in driver.notifies]
+            driver.notifies.clear()
+            return payloads
+        # psycopg 3
+        payloads = [notify.payload for notify in driver.notifies(timeout=self.reconnect_seconds)]
+        return payloads or None
+
+    def shutdown(self):
+        self._stopping.set()
+
+    def stats(self):
+        with self._lock:
+            return {
+                "backend": self.backend,
+                "connected": self.connected if self.backend == "postgresql" else True,
+                "published": self.published,
+                "received": self.received,
+                "relayed": self.relayed,
+                "publish_errors": self.publish_errors,
+                "reconnects": self.reconnects
+            }
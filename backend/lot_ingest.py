@@ -0,0 +1,269 @@
+import pandas as pd
+from sqlalchemy import insert, select, update
+
+from extensions import db
+from models import Lot
+
+# Accepted spellings for each Lot column, checked in order against the lower-cased file headers.
+EXPECTED_LOT_COLUMNS = {
+    "lot_identifier": ["lot id", "lot_id", "identifier", "lot_identifier"],
+    "device_name": ["device name", "device_name", "item name"],
+    "device_details": ["details", "description", "device_details"],
+    "image_url": ["image url", "image_url", "image"],
+    "condition": ["condition", "grade"],
+    "quantity": ["quantity", "qty"],
+    "min_bid": ["minimum bid", "min_bid", "start price"]
+}
+REQUIRED_LOT_COLUMNS = ["lot_identifier", "device_name"]
+OPTIONAL_TEXT_COLUMNS = ["device_details", "image_url", "condition"]
+
+# Rows per executemany batch when writing lots.
+LOT_INSERT_BATCH_SIZE = 5000
+# Default rows per parsed chunk; overridden by the LOT_UPLOAD_CHUNK_ROWS config value.
+DEFAULT_CHUNK_ROWS = 5000
+# Row errors kept for the report; the rest are only counted so a garbage file cannot grow memory.
+MAX_REPORTED_ERRORS = 500
+
+
+class LotFileError(Exception):
+    """Raised when a manifest cannot be processed at all (e.g. a required column is missing)."""
+
+
+def map_lot_columns(columns):
+    """Lower-case the file headers and map each Lot column to the header that supplies it."""
+    columns = [str(col).strip().lower() for col in columns]
+    mapped_cols = {}
+    for target_col, potential_names in EXPECTED_LOT_COLUMNS.items():
+        for potential_name in potential_names:
+            if potential_name in columns:
+                mapped_cols[target_col] = potential_name
+                break
+
+    for rmc in REQUIRED_LOT_COLUMNS:
+        if rmc not in mapped_cols:
+            raise LotFileError(f"Missing required column in file: one of {EXPECTED_LOT_COLUMNS[rmc]}")
+    return columns, mapped_cols
+
+
+def iter_csv_chunks(stream, chunk_rows=DEFAULT_CHUNK_ROWS):
+    """
+    Parse a CSV stream into DataFrames of at most ``chunk_rows`` rows, all cells as text.
+
+    Each frame is indexed by spreadsheet row number (the header is row 1), and rows with
+    no values are skipped.
+    """
+    for chunk in pd.read_csv(stream, dtype=str, chunksize=chunk_rows, skip_blank_lines=False):
+        chunk.index += 2
+        yield chunk.dropna(how="all")
+
+
+def iter_xlsx_chunks(stream, chunk_rows=DEFAULT_CHUNK_ROWS):
+    """
+    Stream the first worksheet of an XLSX file in read-only mode, ``chunk_rows`` rows at a time.
+
+    Each frame is indexed by sheet row number (the header is row 1). Like
+    ``pandas.read_excel``, rows with no values are skipped (read-only mode also returns
+    formatted but empty rows) and a sheet with only a header, or nothing at all, gives one
+    empty frame.
+    """
+    from openpyxl import load_workbook
+
+    workbook = load_workbook(stream, read_only=True, data_only=True)
+    try:
+        rows = workbook.active.iter_rows(values_only=True)
+        header = next(rows, None)
+        header = [] if header is None else ["" if col is None else str(col) for col in header]
+        batch, row_numbers = [], []
+        yielded = False
+        for row_number, row in enumerate(rows, start=2):
+            values = [None if value is None else str(value) for value in row[:len(header)]]
+            if all(value is None or not value.strip() for value in values):
+                continue
+            batch.append(values)
+            row_numbers.append(row_number)
+            if len(batch) >= chunk_rows:
+                yield pd.DataFrame(batch, columns=header, index=row_numbers)
+                yielded = True
+                batch, row_numbers = [], []
+        if batch or not yielded:
+            yield pd.DataFrame(batch, columns=header, index=row_numbers)
+    finally:
+        workbook.close()
+
+
+def _text_column(df, source_col):
+    # Strings are stripped and empty cells become <NA>, so "missing" has one representation.
+    values = df[source_col].astype("string").str.strip()
+    return values.mask(values == "")
+
+
+def normalise_lot_frame(df, mapped_cols):
+    """
+    Validate and coerce a manifest frame column-wise.
+
+    Returns ``(frame, errors, row_numbers)`` where ``frame`` holds the Lot columns for the
+    rows that passed validation, ``errors`` is a list of ``(row_number, message)`` tuples
+    and ``row_numbers`` gives the file row of each row kept in ``frame``.
+    Row numbers are taken from ``df``'s index, which the chunk iterators set to spreadsheet
+    rows (the header is row 1), so skipped blank rows do not shift them.
+    """
+    row_numbers = pd.Series(df.index.to_numpy(dtype="int64"))
+    df = df.reset_index(drop=True)
+    errors = []
+    bad = pd.Series(False, index=df.index)
+
+    def flag(mask, build_message):
+        nonlocal bad
+        mask = mask.fillna(False) & ~bad
+        for index in mask[mask].index:
+            errors.append((int(row_numbers[index]), build_message(index)))
+        bad = bad | mask
+
+    frame = pd.DataFrame(index=df.index)
+
+    frame["lot_identifier"] = _text_column(df, mapped_cols["lot_identifier"])
+    flag(frame["lot_identifier"].isna(), lambda i: "lot_identifier is missing or empty.")
+
+    frame["device_name"] = _text_column(df, mapped_cols["device_name"])
+    flag(frame["device_name"].isna(), lambda i: "device_name is missing or empty.")
+
+    for target_col in OPTIONAL_TEXT_COLUMNS:
+        if target_col in mapped_cols:
+            frame[target_col] = _text_column(df, mapped_cols[target_col])
+        else:
+            frame[target_col] = pd.Series(pd.NA, index=df.index, dtype="string")
+
+    if "quantity" in mapped_cols:
+        raw = _text_column(df, mapped_cols["quantity"])
+        quantity = pd.to_numeric(raw, errors="coerce")
+        flag(raw.notna() & (quantity.isna() | (quantity % 1 != 0) | (quantity < 0)),
+             lambda i: f"Invalid quantity '{raw[i]}'.")
+        frame["quantity"] = quantity.fillna(1)
+    else:
+        frame["quantity"] = 1
+
+    if "min_bid" in mapped_cols:
+        raw = _text_column(df, mapped_cols["min_bid"])
+        min_bid = pd.to_numeric(raw, errors="coerce")
+        flag(raw.notna() & (min_bid.isna() | (min_bid < 0)),
+             lambda i: f"Invalid min_bid '{raw[i]}'.")
+        frame["min_bid"] = min_bid.fillna(0.00).round(2)
+    else:
+        frame["min_bid"] = 0.00
+
+    return frame[~bad], errors, row_numbers[~bad]
+
+
+def find_duplicate_identifiers(identifiers, row_numbers, existing_identifiers, seen_in_file):
+    """
+    Flag identifiers already present in the auction or earlier in the same file.
+
+    ``seen_in_file`` maps identifier -> first row number and is updated in place so the
+    check can span several chunks of one manifest.
+    """
+    errors = []
+    in_auction = identifiers.isin(existing_identifiers)
+    for index in in_auction[in_auction].index:
+        errors.append((int(row_numbers[index]), f"Lot with identifier {identifiers[index]} already exists in this auction."))
+
+    candidates = identifiers[~in_auction]
+    first_rows = row_numbers[~in_auction].groupby(candidates, sort=False).transform("first")
+    repeated = (first_rows != row_numbers[~in_auction]) | candidates.isin(seen_in_file)
+    for index in repeated[repeated].index:
+        first_row = seen_in_file.get(candidates[index], first_rows[index])
+        errors.append((int(row_numbers[index]), f"Duplicate lot_identifier {candidates[index]} in file (first seen on row {int(first_row)})."))
+
+    for index, first_row in first_rows[~repeated].items():
+        seen_in_file.setdefault(candidates[index], int(first_row))
+    return in_auction | repeated.reindex(identifiers.index, fill_value=False), errors
+
+
+def existing_lot_identifiers(auction_id, identifiers):
+    """The subset of ``identifiers`` already stored for the auction, fetched in a single query."""
+    if len(identifiers) == 0:
+        return set()
+    return set(db.session.scalars(
+        select(Lot.lot_identifier)
+        .where(Lot.auction_id == auction_id, Lot.lot_identifier.in_(list(identifiers)))
+    ))
+
+
+def bulk_insert_lots(auction_id, frame):
+    """Write validated lots with batched executemany INSERTs. The caller owns the commit."""
+    records = frame.assign(auction_id=auction_id)
+    records["quantity"] = records["quantity"].astype(int)
+    records = records.astype(object).where(records.notna(), None).to_dict("records")
+    for start in range(0, len(records), LOT_INSERT_BATCH_SIZE):
+        db.session.execute(insert(Lot), records[start:start + LOT_INSERT_BATCH_SIZE])
+    return len(records)
+
+
+def format_errors(errors, error_count=None):
+    messages = [f"Row {row}: {message}" for row, message in sorted(errors, key=lambda e: e[0])]
+    if error_count is not None and error_count > len(errors):
+        messages.append(f"... and {error_count - len(errors)} more errors.")
+    return messages
+
+
+def ingest_lot_chunks(auction_id, chunks):
+    """
+    Validate a manifest chunk by chunk and bulk insert its lots as it goes.
+
+    Returns ``(lots_added, errors)``. Once any row fails, later chunks are still validated
+    so the report is complete, but no further lots are written; the caller must roll back
+    when ``errors`` is non-empty so the upload stays all-or-nothing.
+    """
+    columns = mapped_cols = None
+    seen_in_file = {}
+    errors = []
+    error_count = 0
+    lots_added = 0
+
+    for chunk in chunks:
+        if mapped_cols is None:
+            columns, mapped_cols = map_lot_columns(chunk.columns)
+        chunk.columns = columns
+        frame, chunk_errors, row_numbers = normalise_lot_frame(chunk, mapped_cols)
+
+        identifiers = frame["lot_identifier"]
+        # Identifiers written from earlier chunks of this file are reported as in-file duplicates.
+        existing = existing_lot_identifiers(auction_id, identifiers.unique()) - seen_in_file.keys()
+        duplicates, duplicate_errors = find_duplicate_identifiers(identifiers, row_numbers, existing, seen_in_file)
+        chunk_errors.extend(duplicate_errors)
+
+        error_count += len(chunk_errors)
+        errors.extend(chunk_errors[:max(MAX_REPORTED_ERRORS - len(errors), 0)])
+        if error_count == 0:
+            lots_added += bulk_insert_lots(auction_id, frame[~duplicates])
+
+    if mapped_cols is None:
+        raise LotFileError("The uploaded file contains no rows.")
+    if error_count:
+        return 0, format_errors(errors, error_count)
+    return lots_added, []
+
+
+def ingest_lot_images(store, auction_id):
+    """
+    Copy the auction's lot images into ``store`` and link each lot to its image key.
+
+    Only lots with an ``image_url`` and no ``image_key`` yet are considered, and each
+    distinct URL is fetched once. Failed images are reported, not fatal: those lots keep
+    their original URL. The caller commits.
+
+    Returns ``(lots_linked, errors)``.
+    """
+    lots = db.session.execute(
+        select(Lot.lot_id, Lot.image_url)
+        .where(Lot.auction_id == auction_id, Lot.image_url.isnot(None), Lot.image_key.is_(None))
+    ).all()
+    if not lots:
+        return 0, []
+    keys, failures = store.ingest_urls(lot.image_url for lot in lots)
+    rows = [{"lot_id": lot.lot_id, "image_key": keys[lot.image_url]} for lot in lots if lot.image_url in keys]
+    for start in range(0, len(rows), LOT_INSERT_BATCH_SIZE):
+        db.session.execute(update(Lot), rows[start:start + LOT_INSERT_BATCH_SIZE])
+    errors = [f"{url}: {message}" for url, message in sorted(failures.items())]
+    if len(errors) > MAX_REPORTED_ERRORS:
+        errors = errors[:MAX_REPORTED_ERRORS] + [f"... and {len(failures) - MAX_REPORTED_ERRORS} more image errors."]
+    return len(rows), errors
@@ -0,0 +1,150 @@
+import threading
+import time
+from collections import namedtuple
+from datetime import timezone
+
+from sqlalchemy import select
+
+from extensions import db
+from models import Auction, Lot
+
+# What bid validation needs to know about a lot; ``status`` is its auction's status.
+LotEntry = namedtuple("LotEntry", ["auction_id", "min_bid", "status", "is_visible", "end_time"])
+
+
+def _utc(value):
+    # Times are stored in UTC; SQLite hands them back without tzinfo.
+    return value.replace(tzinfo=timezone.utc) if value is not None and value.tzinfo is None else value
+
+
+class LotRegistry:
+    """
+    Per-process map of lot_id -> (auction_id, min_bid) for active auctions, plus each
+    auction's status, visibility and end_time, so bids are validated without a query.
+
+    Auctions are loaded when they become active (scheduler listener, status processor)
+    or on the first bid against one of their lots. Auction events on the invalidation
+    bus evict them in every worker, and the worker making the change reloads them. An
+    auction is reloaded after ``ttl_seconds``, which bounds staleness if an event is lost.
+
+    Each eviction bumps the auction's generation, and a load only installs what it read if
+    the generation is unchanged, so an eviction that lands while a load is reading (e.g.
+    the auction closing) is never overwritten with the state from before it.
+    """
+
+    def __init__(self, ttl_seconds=60):
+        self.ttl_seconds = ttl_seconds
+        # auction_id -> (status, is_visible, end_time, expires_at)
+        self._auctions = {}
+        # lot_id -> (auction_id, min_bid)
+        self._lots = {}
+        # auction_id -> tuple of lot_ids, for eviction
+        self._auction_lots = {}
+        # auction_id -> evictions so far; with _clears, identifies what a load may install over
+        self._generations = {}
+        self._clears = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.loads = 0
+        self.stale_loads = 0
+
+    def init_app(self, app):
+        self.ttl_seconds = app.config.get("LOT_REGISTRY_TTL_SECONDS", self.ttl_seconds)
+
+    def lookup(self, lot_id):
+        """The registered :class:`LotEntry` for ``lot_id``, or None if unknown or expired."""
+        now = time.monotonic()
+        with self._lock:
+            lot = self._lots.get(lot_id)
+            auction = self._auctions.get(lot[0]) if lot is not None else None
+            if auction is None or auction[3] <= now:
+                self.misses += 1
+                return None
+            self.hits += 1
+            return LotEntry(lot[0], lot[1], auction[0], auction[1], auction[2])
+
+    def fetch(self, lot_id):
+        """
+        :meth:`lookup`, falling back to the database on a miss.
+
+        A lot of an active auction registers its whole auction; lots of other auctions
+        are returned but not kept. Returns None when the lot does not exist.
+        """
+        entry = self.lookup(lot_id)
+        if entry is not None:
+            return entry
+        row = db.session.execute(
+            select(Lot.auction_id, Lot.min_bid, Auction.status, Auction.is_visible, Auction.end_time)
+            .join(Auction, Lot.auction_id == Auction.auction_id)
+            .where(Lot.lot_id == lot_id)
+        ).first()
+        if row is None:
+            return None
+        entry = LotEntry(row.auction_id, row.min_bid, row.status, row.is_visible, _utc(row.end_time))
+        if entry.status == "active":
+            self.load(entry.auction_id)
+        return entry
+
+    def _generation(self, auction_id):
+        with self._lock:
+            return self._clears, self._generations.get(auction_id, 0)
+
+    def load(self, auction_id):
+        """(Re)load an auction and its lots if it is active, otherwise drop it. Returns True if registered."""
+        generation = self._generation(auction_id)
+        auction = db.session.execute(
+            select(Auction.status, Auction.is_visible, Auction.end_time).where(Auction.auction_id == auction_id)
+        ).first()
+        if auction is None or auction.status != "active":
+            self.evict(auction_id)
+            return False
+        lots = db.session.execute(
+            select(Lot.lot_id, Lot.min_bid).where(Lot.auction_id == auction_id)
+        ).all()
+        return self._install(auction_id, generation, auction, lots)
+
+    def _install(self, auction_id, generation, auction, lots):
+        expires_at = time.monotonic() + self.ttl_seconds
+        with self._lock:
+            if (self._clears, self._generations.get(auction_id, 0)) != generation:
+                # Evicted while we were reading: what we read may predate the change.
+                self.stale_loads += 1
+                return False
+            self._evict_locked(auction_id)
+            self._auctions[auction_id] = (auction.status, auction.is_visible, _utc(auction.end_time), expires_at)
+            for lot_id, min_bid in lots:
+                self._lots[lot_id] = (auction_id, min_bid)
+            self._auction_lots[auction_id] = tuple(lot_id for lot_id, _min_bid in lots)
+            self.loads += 1
+        return True
+
+    def _evict_locked(self, auction_id):
+        self._auctions.pop(auction_id, None)
+        for lot_id in self._auction_lots.pop(auction_id, ()):
+            self._lots.pop(lot_id, None)
+
+    def evict(self, auction_id):
+        with self._lock:
+            self._generations[auction_id] = self._generations.get(auction_id, 0) + 1
+            self._evict_locked(auction_id)
+
+    def clear(self):
+        with self._lock:
+            # Bumping _clears stales every load in flight, so the counters can start over.
+            self._clears += 1
+            self._generations.clear()
+            self._auctions.clear()
+            self._lots.clear()
+            self._auction_lots.clear()
+
+    def stats(self):
+        with self._lock:
+            return {
+                "auctions": len(self._auctions),
+                "lots": len(self._lots),
+                "hits": self.hits,
+                "misses": self.misses,
+                "loads": self.loads,
+                "stale_loads": self.stale_loads
+            }
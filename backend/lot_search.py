@@ -0,0 +1,301 @@
+import bisect
+import re
+import threading
+import time
+from collections import Counter, namedtuple
+
+from sqlalchemy import Float, and_, cast, func, literal, literal_column, or_, select
+
+from extensions import db, image_store
+from models import Carrier, Auction, Lot, LOT_SEARCH_DOCUMENT_SQL
+from pagination import PaginationError, decode_cursor, encode_cursor, page_size
+
+# Device names listed in the "devices" facet.
+MAX_DEVICE_FACETS = 20
+# Longest accepted search text.
+MAX_QUERY_LENGTH = 200
+# Vocabulary terms a prefix may expand to in the in-process index.
+MAX_PREFIX_TERMS = 100
+# In-process index: weight of a query term found in each field, and of a prefix-only match.
+FIELD_WEIGHTS = (("device_name", 3.0), ("condition", 2.0), ("device_details", 1.0))
+PREFIX_MATCH_FACTOR = 0.5
+
+_TOKEN = re.compile(r"[a-z0-9]+")
+
+SearchDocument = namedtuple("SearchDocument", [
+    "lot_id", "lot_identifier", "device_name", "device_details", "condition", "quantity",
+    "min_bid", "image_url", "image_key", "auction_id", "auction_name", "auction_end_time",
+    "carrier_id", "carrier_name"
+])
+
+
+def tokenize(text):
+    return _TOKEN.findall(text.lower()) if text else []
+
+
+def _searchable_lots():
+    # Lots clients can see: those of active, visible auctions.
+    return select(
+        Lot.lot_id, Lot.lot_identifier, Lot.device_name, Lot.device_details, Lot.condition,
+        Lot.quantity, Lot.min_bid, Lot.image_url, Lot.image_key, Lot.auction_id,
+        Auction.name.label("auction_name"), Auction.end_time.label("auction_end_time"),
+        Auction.carrier_id, Carrier.name.label("carrier_name")
+    ).join(Auction, Lot.auction_id == Auction.auction_id)\
+        .join(Carrier, Auction.carrier_id == Carrier.carrier_id)\
+        .where(Auction.status == "active", Auction.is_visible == True)
+
+
+def _result(document, score):
+    return {
+        "lot_id": document.lot_id,
+        "lot_identifier": document.lot_identifier,
+        "device_name": document.device_name,
+        "device_details": document.device_details,
+        "condition": document.condition,
+        "quantity": document.quantity,
+        "min_bid": float(document.min_bid) if document.min_bid is not None else None,
+        **image_store.lot_image_urls(document.image_key, document.image_url),
+        "auction_id": document.auction_id,
+        "auction_name": document.auction_name,
+        "auction_end_time": document.auction_end_time.isoformat() if document.auction_end_time else None,
+        "carrier_id": document.carrier_id,
+        "carrier_name": document.carrier_name,
+        "score": round(score, 6)
+    }
+
+
+def _facets(carriers, conditions, devices):
+    """Facet lists, largest count first, from ``(key, count)`` pairs."""
+    by_count = lambda item: (-item[1], str(item[0]))
+    return {
+        "carriers": [{"carrier_id": carrier_id, "carrier_name": name, "count": count}
+                     for (carrier_id, name), count in sorted(carriers, key=by_count)],
+        "conditions": [{"condition": condition, "count": count}
+                       for condition, count in sorted(conditions, key=by_count)],
+        "devices": [{"device_name": device_name, "count": count}
+                    for device_name, count in sorted(devices, key=by_count)[:MAX_DEVICE_FACETS]]
+    }
+
+
+class SearchSnapshot:
+    """An immutable inverted index over the searchable lots at one point in time."""
+
+    def __init__(self, documents):
+        self.documents = {document.lot_id: document for document in documents}
+        # term -> {lot_id: weight}, the best field weight the term reaches in that lot.
+        self.postings = {}
+        for document in documents:
+            for field, weight in FIELD_WEIGHTS:
+                for term in tokenize(getattr(document, field)):
+                    lots = self.postings.setdefault(term, {})
+                    if lots.get(document.lot_id, 0.0) < weight:
+                        lots[document.lot_id] = weight
+        self.vocabulary = sorted(self.postings)
+
+    def _term_scores(self, token):
+        """lot_id -> score for one query token: exact matches, then prefix matches at a discount."""
+        scores = dict(self.postings.get(token, {}))
+        start = bisect.bisect_left(self.vocabulary, token)
+        for term in self.vocabulary[start:start + MAX_PREFIX_TERMS]:
+            if not term.startswith(token):
+                break
+            if term == token:
+                continue
+            for lot_id, weight in self.postings[term].items():
+                weight *= PREFIX_MATCH_FACTOR
+                if scores.get(lot_id, 0.0) < weight:
+                    scores[lot_id] = weight
+        return scores
+
+    def matches(self, q):
+        """lot_id -> score for lots matching every token of ``q`` (all lots when ``q`` has none)."""
+        tokens = tokenize(q)
+        if not tokens:
+            return dict.fromkeys(self.documents, 0.0)
+        matched = None
+        for token in tokens:
+            term_scores = self._term_scores(token)
+            if matched is None:
+                matched = term_scores
+            else:
+                matched = {lot_id: score + term_scores[lot_id] for lot_id, score in matched.items() if lot_id in term_scores}
+            if not matched:
+                return {}
+        return matched
+
+
+class LotSearch:
+    """
+    Ranked, faceted search over the lots of active, visible auctions.
+
+    On PostgreSQL queries run against the GIN full-text and trigram indexes on ``lots``.
+    Elsewhere (local SQLite runs) an in-process inverted index is built from the
+    searchable lots and rebuilt when ``version()`` changes (the catalogue cache version,
+    bumped by every admin change) or after ``ttl_seconds``. ``backend`` forces either
+    ("database" or "memory"); "auto" picks by dialect.
+    """
+
+    def __init__(self, backend="auto", ttl_seconds=60, version=None):
+        self.backend = backend
+        self.ttl_seconds = ttl_seconds
+        self.version = version or (lambda: None)
+        self._snapshot = None
+        self._snapshot_key = None
+        self._build_lock = threading.Lock()
+        self._lock = threading.Lock()
+        self.searches = 0
+        self.builds = 0
+
+    def init_app(self, app):
+        self.backend = app.config.get("LOT_SEARCH_BACKEND", self.backend)
+        self.ttl_seconds = app.config.get("LOT_SEARCH_INDEX_TTL_SECONDS", self.ttl_seconds)
+
+    def uses_database(self):
+        if self.backend == "auto":
+            return db.engine.dialect.name == "postgresql"
+        return self.backend == "database"
+
+    def search(self, q=None, carrier_id=None, condition=None, auction_id=None, cursor=None, limit=None):
+        """
+        One page of matching lots, best first, with facet counts over all matches.
+
+        Returns a dict with ``results``, ``facets``, ``total`` and ``next_cursor``.
+        """
+        q = (q or "").strip()
+        if len(q) > MAX_QUERY_LENGTH:
+            raise PaginationError(f"q must be at most {MAX_QUERY_LENGTH} characters.")
+        limit = page_size(limit)
+        after = None
+        if cursor:
+            after = decode_cursor(cursor, [literal(0.0, Float), Lot.lot_id])
+        with self._lock:
+            self.searches += 1
+        filters = {"carrier_id": carrier_id, "condition": condition, "auction_id": auction_id}
+        if self.uses_database():
+            return self._search_database(q, filters, after, limit)
+        return self._search_memory(q, filters, after, limit)
+
+    # --- PostgreSQL ---
+    def _search_database(self, q, filters, after, limit):
+        query = _searchable_lots()
+        if filters["carrier_id"] is not None:
+            query = query.where(Auction.carrier_id == filters["carrier_id"])
+        if filters["condition"]:
+            query = query.where(func.lower(Lot.condition) == filters["condition"].lower())
+        if filters["auction_id"] is not None:
+            query = query.where(Lot.auction_id == filters["auction_id"])
+        if q:
+            document = literal_column(LOT_SEARCH_DOCUMENT_SQL)
+            ts_query = func.websearch_to_tsquery(literal_column("'simple'::regconfig"), q)
+            # Full-text for whole words; word similarity (trigrams) for partial words and typos.
+            query = query.where(or_(document.op("@@")(ts_query), literal(q).op("<%")(Lot.device_name)))
+            score = cast(func.ts_rank(document, ts_query) + func.word_similarity(q, Lot.device_name), Float)
+        else:
+            score = literal(0.0, Float)
+        matches = query.add_columns(score.label("score")).subquery("matches")
+
+        page_query = select(matches).order_by(matches.c.score.desc(), matches.c.lot_id.asc())
+        if after is not None:
+            page_query = page_query.where(or_(
+                matches.c.score < after[0],
+                and_(matches.c.score == after[0], matches.c.lot_id > after[1])
+            ))
+        rows = db.session.execute(page_query.limit(limit + 1)).all()
+
+        carriers = db.session.execute(
+            select(matches.c.carrier_id, matches.c.carrier_name, func.count())
+            .group_by(matches.c.carrier_id, matches.c.carrier_name)
+        ).all()
+        conditions = db.session.execute(
+            select(matches.c.condition, func.count()).group_by(matches.c.condition)
+        ).all()
+        devices = db.session.execute(
+            select(matches.c.device_name, func.count().label("lot_count"))
+            .group_by(matches.c.device_name)
+            .order_by(func.count().desc(), matches.c.device_name)
+            .limit(MAX_DEVICE_FACETS)
+        ).all()
+
+        next_cursor = None
+        if len(rows) > limit:
+            rows = rows[:limit]
+            next_cursor = encode_cursor([rows[-1].score, rows[-1].lot_id])
+        return {
+            "results": [_result(row, row.score) for row in rows],
+            "facets": _facets([((row[0], row[1]), row[2]) for row in carriers], conditions, devices),
+            "total": sum(row[2] for row in carriers),
+            "next_cursor": next_cursor
+        }
+
+    # --- In-process index ---
+    def _fresh_snapshot(self, key):
+        snapshot, snapshot_key = self._snapshot, self._snapshot_key
+        if snapshot is not None and snapshot_key[0] == key and snapshot_key[1] > time.monotonic():
+            return snapshot
+        return None
+
+    def snapshot(self):
+        """The current index, rebuilt first if the catalogue changed or it expired."""
+        key = self.version()
+        snapshot = self._fresh_snapshot(key)
+        if snapshot is not None:
+            return snapshot
+        with self._build_lock:
+            # Another thread may have rebuilt it while this one waited.
+            snapshot = self._fresh_snapshot(key)
+            if snapshot is not None:
+                return snapshot
+            expires_at = time.monotonic() + self.ttl_seconds
+            documents = [SearchDocument(*row) for row in db.session.execute(_searchable_lots())]
+            snapshot = SearchSnapshot(documents)
+            self._snapshot, self._snapshot_key = snapshot, (key, expires_at)
+            with self._lock:
+                self.builds += 1
+            return snapshot
+
+    def _search_memory(self, q, filters, after, limit):
+        snapshot = self.snapshot()
+        condition = filters["condition"].lower() if filters["condition"] else None
+        matched = []
+        for lot_id, score in snapshot.matches(q).items():
+            document = snapshot.documents[lot_id]
+            if filters["carrier_id"] is not None and document.carrier_id != filters["carrier_id"]:
+                continue
+            if condition is not None and (document.condition or "").lower() != condition:
+                continue
+            if filters["auction_id"] is not None and document.auction_id != filters["auction_id"]:
+                continue
+            matched.append((-score, lot_id))
+        matched.sort()
+
+        start = 0
+        if after is not None:
+            start = bisect.bisect_right(matched, (-after[0], after[1]))
+        page = matched[start:start + limit + 1]
+        next_cursor = None
+        if len(page) > limit:
+            page = page[:limit]
+            next_cursor = encode_cursor([-page[-1][0], page[-1][1]])
+
+        documents = [snapshot.documents[lot_id] for _score, lot_id in matched]
+        return {
+            "results": [_result(snapshot.documents[lot_id], -score) for score, lot_id in page],
+            "facets": _facets(
+                Counter((document.carrier_id, document.carrier_name) for document in documents).items(),
+                Counter(document.condition for document in documents).items(),
+                Counter(document.device_name for document in documents).items()
+            ),
+            "total": len(matched),
+            "next_cursor": next_cursor
+        }
+
+    def stats(self):
+        snapshot = self._snapshot
+        with self._lock:
+            return {
+                "backend": self.backend,
+                "searches": self.searches,
+                "builds": self.builds,
+                "indexed_lots": len(snapshot.documents) if snapshot is not None else 0,
+                "terms": len(snapshot.vocabulary) if snapshot is not None else 0
+            }
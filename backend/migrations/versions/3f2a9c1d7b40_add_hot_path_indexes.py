@@ -0,0 +1,71 @@
+"""add hot path indexes
+
+Indexes for the bid, auction and winner access paths used by winner determination,
+/my-bids, /my-wins, the client catalogue and the auction status processor.
+
+The tables themselves are still created by ``db.create_all()``; this revision only adds
+indexes, skipping any that ``create_all`` already made. On PostgreSQL the indexes are
+built CONCURRENTLY so the bids table stays writable while they build.
+
+Revision ID: 3f2a9c1d7b40
+Revises:
+Create Date: 2026-10-17 09:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '3f2a9c1d7b40'
+down_revision = None
+branch_labels = None
+depends_on = None
+
+
+# (name, table, columns, keyword arguments); mirrors __table_args__ in models.py.
+INDEXES = [
+    ('ix_bids_lot_id_amount_time', 'bids',
+     ['lot_id', sa.text('bid_amount DESC'), 'bid_time'],
+     {'postgresql_include': ['user_id']}),
+    ('ix_bids_user_id_bid_time', 'bids',
+     ['user_id', 'bid_time'],
+     {'postgresql_include': ['lot_id', 'bid_amount', 'status']}),
+    ('ix_auctions_status_visible_end_time', 'auctions',
+     ['status', 'is_visible', 'end_time'],
+     {'postgresql_include': ['carrier_id']}),
+    ('ix_auctions_scheduled_start_time', 'auctions',
+     ['start_time'],
+     {'postgresql_where': sa.text("status = 'scheduled'"),
+      'sqlite_where': sa.text("status = 'scheduled'")}),
+    ('ix_auction_winners_user_id_awarded_at', 'auction_winners',
+     ['user_id', 'awarded_at'],
+     {}),
+]
+
+
+def _is_postgresql():
+    return op.get_bind().dialect.name == 'postgresql'
+
+
+def upgrade():
+    if _is_postgresql():
+        # CREATE INDEX CONCURRENTLY cannot run inside a transaction block.
+        with op.get_context().autocommit_block():
+            for name, table, columns, kwargs in INDEXES:
+                op.create_index(name, table, columns, if_not_exists=True,
+                                postgresql_concurrently=True, **kwargs)
+        op.execute('ANALYZE bids, auctions, auction_winners')
+    else:
+        for name, table, columns, kwargs in INDEXES:
+            op.create_index(name, table, columns, if_not_exists=True, **kwargs)
+
+
+def downgrade():
+    if _is_postgresql():
+        with op.get_context().autocommit_block():
+            for name, table, _columns, _kwargs in reversed(INDEXES):
+                op.drop_index(name, table_name=table, if_exists=True, postgresql_concurrently=True)
+    else:
+        for name, table, _columns, _kwargs in reversed(INDEXES):
+            op.drop_index(name, table_name=table, if_exists=True)
@@ -0,0 +1,58 @@
+"""add lot search indexes
+
+GIN indexes for /lots/search on PostgreSQL: a full-text index over each lot's name,
+details and grade, and a pg_trgm index on device_name for partial words and typos.
+Other databases search with the in-process index instead, so this revision does
+nothing there. The indexes are built CONCURRENTLY so lot uploads are not blocked.
+
+Revision ID: 8c4e2b7a9d15
+Revises: 3f2a9c1d7b40
+Create Date: 2026-10-17 12:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '8c4e2b7a9d15'
+down_revision = '3f2a9c1d7b40'
+branch_labels = None
+depends_on = None
+
+
+# Must match LOT_SEARCH_DOCUMENT_SQL in models.py, which the search queries use.
+LOT_SEARCH_DOCUMENT_SQL = ("to_tsvector('simple'::regconfig, coalesce(device_name, '') || ' ' || "
+                           "coalesce(device_details, '') || ' ' || coalesce(condition, ''))")
+
+# (name, columns, keyword arguments) on the lots table; mirrors __table_args__ in models.py.
+INDEXES = [
+    ('ix_lots_search_document', [sa.text(LOT_SEARCH_DOCUMENT_SQL)],
+     {'postgresql_using': 'gin'}),
+    ('ix_lots_device_name_trgm', ['device_name'],
+     {'postgresql_using': 'gin', 'postgresql_ops': {'device_name': 'gin_trgm_ops'}}),
+]
+
+
+def _is_postgresql():
+    return op.get_bind().dialect.name == 'postgresql'
+
+
+def upgrade():
+    if not _is_postgresql():
+        return
+    op.execute('CREATE EXTENSION IF NOT EXISTS pg_trgm')
+    # CREATE INDEX CONCURRENTLY cannot run inside a transaction block.
+    with op.get_context().autocommit_block():
+        for name, columns, kwargs in INDEXES:
+            op.create_index(name, 'lots', columns, if_not_exists=True,
+                            postgresql_concurrently=True, **kwargs)
+    op.execute('ANALYZE lots')
+
+
+def downgrade():
+    if not _is_postgresql():
+        return
+    with op.get_context().autocommit_block():
+        for name, _columns, _kwargs in reversed(INDEXES):
+            op.drop_index(name, table_name='lots', if_exists=True, postgresql_concurrently=True)
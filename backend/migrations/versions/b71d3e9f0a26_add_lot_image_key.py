@@ -0,0 +1,36 @@
+"""add lot image key
+
+Adds ``lots.image_key``, the content hash of a lot's image in the local image store.
+
+Revision ID: b71d3e9f0a26
+Revises: 8c4e2b7a9d15
+Create Date: 2026-10-17 15:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'b71d3e9f0a26'
+down_revision = '8c4e2b7a9d15'
+branch_labels = None
+depends_on = None
+
+
+def _has_image_key():
+    return 'image_key' in {column['name'] for column in sa.inspect(op.get_bind()).get_columns('lots')}
+
+
+def upgrade():
+    # Tables made by db.create_all() from the current models already have the column.
+    if _has_image_key():
+        return
+    # Nullable with no default, so PostgreSQL adds it without rewriting the table.
+    with op.batch_alter_table('lots') as batch_op:
+        batch_op.add_column(sa.Column('image_key', sa.String(length=64), nullable=True))
+
+
+def downgrade():
+    with op.batch_alter_table('lots') as batch_op:
+        batch_op.drop_column('image_key')
@@ -1,4 +1,4 @@
-from app import db, bcrypt # Assuming db, bcrypt are initialized in app
+from extensions import db, password_hasher
 from sqlalchemy.sql import func
 from sqlalchemy.orm import relationship # For relationships
 
@@ -18,11 +18,12 @@ class User(db.Model):
     auctions_created = relationship('Auction', back_populates='creator')
     bids_placed = relationship('Bid', back_populates='bidder')
 
+    # Hashing runs in the password_hasher process pool rather than on the request thread.
     def set_password(self, password):
-        self.password_hash = bcrypt.generate_password_hash(password).decode('utf-8')
+        self.password_hash = password_hasher.hash(password)
 
     def check_password(self, password):
-        return bcrypt.check_password_hash(self.password_hash, password)
+        return password_hasher.verify(self.password_hash, password)
 
     def __repr__(self):
         return f'<User {self.email}>'
@@ -58,10 +59,25 @@ class Auction(db.Model):
     creator = relationship('User', back_populates='auctions_created')
     lots = relationship('Lot', back_populates='auction', cascade='all, delete-orphan')
 
+    # Index definitions are mirrored in migrations/versions; keep the two in sync.
+    __table_args__ = (
+        # Client catalogue (active + visible, by end_time) and the active -> closed transition.
+        db.Index('ix_auctions_status_visible_end_time', 'status', 'is_visible', 'end_time',
+                 postgresql_include=['carrier_id']),
+        # scheduled -> active transition; only the few not-yet-started auctions are indexed.
+        db.Index('ix_auctions_scheduled_start_time', 'start_time',
+                 postgresql_where=db.text("status = 'scheduled'"),
+                 sqlite_where=db.text("status = 'scheduled'")),
+    )
+
     def __repr__(self):
         return f'<Auction {self.name}>'
 
 # --- Lot Model ---
+# The text indexed for lot search; queries must use the identical expression to hit the index.
+LOT_SEARCH_DOCUMENT_SQL = ("to_tsvector('simple'::regconfig, coalesce(device_name, '') || ' ' || "
+                           "coalesce(device_details, '') || ' ' || coalesce(condition, ''))")
+
 class Lot(db.Model):
     __tablename__ = 'lots'
     lot_id = db.Column(db.Integer, primary_key=True)
@@ -70,6 +86,8 @@ class Lot(db.Model):
     device_name = db.Column(db.String(255), nullable=False)
     device_details = db.Column(db.Text, nullable=True)
     image_url = db.Column(db.String(255), nullable=True)
+    # SHA-256 of the image in the local image store, once image_url has been ingested.
+    image_key = db.Column(db.String(64), nullable=True)
     condition = db.Column(db.String(255), nullable=True)
     quantity = db.Column(db.Integer, default=1)
     min_bid = db.Column(db.Numeric(10, 2), default=0.00)
@@ -79,11 +97,23 @@ class Lot(db.Model):
     auction = relationship('Auction', back_populates='lots')
     bids = relationship('Bid', back_populates='lot', cascade='all, delete-orphan')
 
-    __table_args__ = (db.UniqueConstraint('auction_id', 'lot_identifier', name='_auction_lot_uc'),)
+    __table_args__ = (
+        db.UniqueConstraint('auction_id', 'lot_identifier', name='_auction_lot_uc'),
+        # Lot search on PostgreSQL: full-text over name, details and grade, plus trigram
+        # matching on the device name for partial words and typos (see lot_search.py).
+        db.Index('ix_lots_search_document', db.text(LOT_SEARCH_DOCUMENT_SQL),
+                 postgresql_using='gin').ddl_if(dialect='postgresql'),
+        db.Index('ix_lots_device_name_trgm', 'device_name', postgresql_using='gin',
+                 postgresql_ops={'device_name': 'gin_trgm_ops'}).ddl_if(dialect='postgresql'),
+    )
 
     def __repr__(self):
         return f'<Lot {self.device_name} - {self.lot_identifier}>'
 
+# gin_trgm_ops comes from the pg_trgm extension.
+db.event.listen(Lot.__table__, 'before_create',
+                db.DDL('CREATE EXTENSION IF NOT EXISTS pg_trgm').execute_if(dialect='postgresql'))
+
 # --- Bid Model (Forward declaration for relationships, will be fully defined later) ---
 class Bid(db.Model):
     __tablename__ = 'bids'
@@ -100,7 +130,15 @@ class Bid(db.Model):
     # Unique constraint: one active bid per user per lot
     # This might need adjustment if users can place multiple increasing bids
     # For sealed bids, this is usually one bid per user per lot.
-    __table_args__ = (db.UniqueConstraint('lot_id', 'user_id', name='_user_lot_bid_uc'),)
+    __table_args__ = (
+        db.UniqueConstraint('lot_id', 'user_id', name='_user_lot_bid_uc'),
+        # Winner determination and the leading-bidder lookup: a lot's bids best first.
+        db.Index('ix_bids_lot_id_amount_time', 'lot_id', db.text('bid_amount DESC'), 'bid_time',
+                 postgresql_include=['user_id']),
+        # Serves /my-bids: a user's bids newest first.
+        db.Index('ix_bids_user_id_bid_time', 'user_id', 'bid_time',
+                 postgresql_include=['lot_id', 'bid_amount', 'status']),
+    )
 
     def __repr__(self):
         return f'<Bid {self.bid_amount} by User {self.user_id} for Lot {self.lot_id}>'
@@ -121,5 +159,8 @@ class AuctionWinner(db.Model):
     user = relationship('User', backref=db.backref('won_lots_info'))
     bid = relationship('Bid', backref=db.backref('winning_info', uselist=False))
 
+    # Serves /my-wins: a user's wins newest first.
+    __table_args__ = (db.Index('ix_auction_winners_user_id_awarded_at', 'user_id', 'awarded_at'),)
+
     def __repr__(self):
         return f'<AuctionWinner User {self.user_id} Lot {self.lot_id} Amount {self.winning_amount}>'
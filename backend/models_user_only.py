@@ -1,4 +1,4 @@
-from app import db, bcrypt
+from extensions import db, bcrypt
 from sqlalchemy.sql import func
 
 class User(db.Model):
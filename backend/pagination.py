@@ -0,0 +1,74 @@
+import base64
+import binascii
+import json
+from datetime import datetime
+
+from flask import request
+from sqlalchemy import DateTime, literal, tuple_
+
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 200
+
+
+class PaginationError(ValueError):
+    """Raised for a malformed ``limit``, ``cursor``, ``fields`` or filter value; reported to the client as a 400."""
+
+
+def page_size(value=None):
+    """Parse a requested page size, defaulting to DEFAULT_PAGE_SIZE and capped at MAX_PAGE_SIZE."""
+    if value in (None, ""):
+        return DEFAULT_PAGE_SIZE
+    try:
+        size = int(value)
+    except (TypeError, ValueError):
+        raise PaginationError("limit must be an integer.")
+    if size < 1:
+        raise PaginationError("limit must be at least 1.")
+    return min(size, MAX_PAGE_SIZE)
+
+
+def encode_cursor(values):
+    payload = json.dumps([v.isoformat() if isinstance(v, datetime) else v for v in values], separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode("utf-8")).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor, columns):
+    try:
+        values = json.loads(base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)))
+        if not isinstance(values, list) or len(values) != len(columns):
+            raise ValueError("cursor does not match the sort key")
+        return [
+            datetime.fromisoformat(value) if value is not None and isinstance(column.type, DateTime) else value
+            for value, column in zip(values, columns)
+        ]
+    except (ValueError, TypeError, binascii.Error):
+        raise PaginationError("Invalid cursor.")
+
+
+def paginate(query, columns, descending=True, cursor=None, limit=None):
+    """
+    Keyset-paginate a query on ``columns``, whose last entry must be unique (e.g. the primary key).
+
+    ``cursor`` and ``limit`` default to the request's ``cursor`` and ``limit`` arguments.
+    The query must select attributes named like ``columns`` (ORM entities or labelled
+    columns), since the next cursor is read back from the last row.
+
+    Returns ``(rows, next_cursor)``; ``next_cursor`` is None on the last page.
+    """
+    limit = page_size(request.args.get("limit") if limit is None else limit)
+    cursor = request.args.get("cursor") if cursor is None else cursor
+
+    if cursor:
+        values = decode_cursor(cursor, columns)
+        key = tuple_(*columns)
+        bound = tuple_(*[literal(value, column.type) for value, column in zip(values, columns)])
+        query = query.filter(key < bound if descending else key > bound)
+
+    query = query.order_by(*[column.desc() if descending else column.asc() for column in columns])
+    rows = query.limit(limit + 1).all()
+
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        next_cursor = encode_cursor([getattr(rows[-1], column.key) for column in columns])
+    return rows, next_cursor
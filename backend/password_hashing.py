@@ -0,0 +1,165 @@
+import multiprocessing
+import os
+import threading
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+
+import bcrypt
+
+# Passwords per hash_many task: small, so an interactive hash never waits long behind one.
+HASH_MANY_CHUNK_SIZE = 8
+
+
+def _hash_password(password, rounds):
+    return bcrypt.hashpw(password.encode("utf-8"), bcrypt.gensalt(rounds)).decode("utf-8")
+
+
+def _hash_passwords(passwords, rounds):
+    return [_hash_password(password, rounds) for password in passwords]
+
+
+def _verify_password(password_hash, password):
+    return bcrypt.checkpw(password.encode("utf-8"), password_hash.encode("utf-8"))
+
+
+def hash_rounds(password_hash):
+    """The work factor encoded in a ``$2b$<rounds>$...`` hash, or None if it cannot be read."""
+    try:
+        return int(password_hash.split("$")[2])
+    except (AttributeError, IndexError, ValueError):
+        return None
+
+
+class PasswordHasherBusy(Exception):
+    """Raised when no hashing slot frees up within the configured timeout."""
+
+
+class PasswordHasher:
+    """
+    Runs bcrypt in a dedicated process pool so request threads are not tied up hashing.
+
+    At most ``max_pending`` operations may be queued or running at once; callers beyond
+    that wait up to ``acquire_timeout`` seconds and then get :class:`PasswordHasherBusy`.
+    With ``workers=0`` hashing runs on the calling thread (still bounded by ``max_pending``).
+    Hashes are standard ``$2b$`` bcrypt, interchangeable with Flask-Bcrypt's.
+    """
+
+    def __init__(self, workers=None, max_pending=64, rounds=12, acquire_timeout=10):
+        self.workers = os.cpu_count() if workers is None else workers
+        self.max_pending = max_pending
+        self.rounds = rounds
+        self.acquire_timeout = acquire_timeout
+        self._slots = threading.BoundedSemaphore(max_pending)
+        self._lock = threading.Lock()
+        self._executor = None
+        self._executor_pid = None
+        self.pending = 0
+        self.completed = 0
+        self.rejected = 0
+
+    def init_app(self, app):
+        self.workers = app.config.get("PASSWORD_HASH_WORKERS", self.workers)
+        self.max_pending = app.config.get("PASSWORD_HASH_MAX_PENDING", self.max_pending)
+        self.rounds = app.config.get("BCRYPT_LOG_ROUNDS", self.rounds)
+        self.acquire_timeout = app.config.get("PASSWORD_HASH_TIMEOUT_SECONDS", self.acquire_timeout)
+        self._slots = threading.BoundedSemaphore(self.max_pending)
+
+    def _get_executor(self):
+        # Created lazily and per process, so forked web workers each get their own pool.
+        with self._lock:
+            if self._executor is None or self._executor_pid != os.getpid():
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.workers,
+                    mp_context=multiprocessing.get_context("spawn")
+                )
+                self._executor_pid = os.getpid()
+            return self._executor
+
+    def _run(self, fn, *args):
+        if not self._slots.acquire(timeout=self.acquire_timeout):
+            with self._lock:
+                self.rejected += 1
+            raise PasswordHasherBusy("Password hashing is at capacity, please retry shortly.")
+        with self._lock:
+            self.pending += 1
+        try:
+            if not self.workers:
+                return fn(*args)
+            return self._get_executor().submit(fn, *args).result()
+        finally:
+            with self._lock:
+                self.pending -= 1
+                self.completed += 1
+            self._slots.release()
+
+    def hash(self, password):
+        return self._run(_hash_password, password, self.rounds)
+
+    def hash_many(self, passwords):
+        """
+        Hash a batch of passwords on the pool; results keep the input order.
+
+        The batch takes one pending slot and keeps at most ``workers - 1`` chunks in the
+        pool at a time, so a bulk import cannot starve logins of slots or of workers: one
+        worker is always free for interactive hashes (with a single worker, they wait at
+        most one small chunk).
+        """
+        passwords = list(passwords)
+        if not passwords:
+            return []
+        chunks = [passwords[start:start + HASH_MANY_CHUNK_SIZE]
+                  for start in range(0, len(passwords), HASH_MANY_CHUNK_SIZE)]
+        if not self._slots.acquire(timeout=self.acquire_timeout):
+            with self._lock:
+                self.rejected += 1
+            raise PasswordHasherBusy("Password hashing is at capacity, please retry shortly.")
+        with self._lock:
+            self.pending += 1
+        try:
+            if not self.workers:
+                results = [_hash_passwords(chunk, self.rounds) for chunk in chunks]
+            else:
+                results = self._hash_chunks(chunks, max(self.workers - 1, 1))
+            return [password_hash for chunk in results for password_hash in chunk]
+        finally:
+            with self._lock:
+                self.pending -= 1
+                self.completed += len(passwords)
+            self._slots.release()
+
+    def _hash_chunks(self, chunks, max_in_flight):
+        executor = self._get_executor()
+        results = [None] * len(chunks)
+        in_flight = {}  # future -> chunk index
+        next_chunk = 0
+        while next_chunk < len(chunks) or in_flight:
+            while next_chunk < len(chunks) and len(in_flight) < max_in_flight:
+                in_flight[executor.submit(_hash_passwords, chunks[next_chunk], self.rounds)] = next_chunk
+                next_chunk += 1
+            done, _not_done = wait(in_flight, return_when=FIRST_COMPLETED)
+            for future in done:
+                results[in_flight.pop(future)] = future.result()
+        return results
+
+    def verify(self, password_hash, password):
+        return self._run(_verify_password, password_hash, password)
+
+    def needs_rehash(self, password_hash):
+        """True when the hash was made with a different work factor than the configured one."""
+        return hash_rounds(password_hash) != self.rounds
+
+    def shutdown(self):
+        with self._lock:
+            if self._executor is not None and self._executor_pid == os.getpid():
+                self._executor.shutdown()
+            self._executor = None
+
+    def stats(self):
+        with self._lock:
+            return {
+                "workers": self.workers,
+                "max_pending": self.max_pending,
+                "queue_depth": self.pending,
+                "completed": self.completed,
+                "rejected": self.rejected,
+                "rounds": self.rounds
+            }
@@ -0,0 +1,70 @@
+import threading
+import time
+from collections import OrderedDict, namedtuple
+
+# The subset of a User row that the auth decorators and bid intake need.
+Principal = namedtuple("Principal", ["user_id", "role", "is_active", "deposit_status"])
+
+
+class PrincipalCache:
+    """
+    Bounded LRU cache of :class:`Principal` entries keyed by user_id, each valid for ``ttl_seconds``.
+
+    Admin changes to a user publish a ``user`` event on the invalidation bus, which calls
+    :meth:`invalidate` in every worker; the TTL bounds staleness if an event is lost.
+    """
+
+    def __init__(self, max_entries=10000, ttl_seconds=30):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def init_app(self, app):
+        self.max_entries = app.config.get("PRINCIPAL_CACHE_MAX_ENTRIES", self.max_entries)
+        self.ttl_seconds = app.config.get("PRINCIPAL_CACHE_TTL_SECONDS", self.ttl_seconds)
+
+    def get(self, user_id):
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(user_id)
+            if entry is None or entry[0] <= now:
+                if entry is not None:
+                    del self._entries[user_id]
+                self.misses += 1
+                return None
+            self._entries.move_to_end(user_id)
+            self.hits += 1
+            return entry[1]
+
+    def put(self, principal):
+        if self.max_entries <= 0:
+            return
+        expires_at = time.monotonic() + self.ttl_seconds
+        with self._lock:
+            self._entries[principal.user_id] = (expires_at, principal)
+            self._entries.move_to_end(principal.user_id)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def invalidate(self, user_id):
+        with self._lock:
+            self._entries.pop(user_id, None)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self):
+        with self._lock:
+            return {
+                "size": len(self._entries),
+                "max_entries": self.max_entries,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions
+            }
@@ -0,0 +1,192 @@
+import json
+import re
+from contextlib import contextmanager
+from datetime import datetime, timedelta, timezone
+
+import jwt
+from flask import current_app
+from sqlalchemy import event, func, select
+
+from extensions import db
+from models import User, Auction, Lot, Bid, AuctionWinner
+from auction_scheduler import apply_status_transitions
+from bid_writes import upsert_bids
+from lot_registry import LotRegistry
+from winners import determine_winners, leading_bidder_subquery
+from bench.seed import SCALES, seed_dataset
+
+# Tables whose queries must never fall back to a full scan.
+HOT_TABLES = ("auctions", "lots", "bids", "auction_winners")
+
+_SQLITE_SCAN = re.compile(r"^SCAN (\w+)")
+# The outer query's sort key and limit: "... ORDER BY table.column [ASC|DESC][, ...] LIMIT ..." at the end.
+_OUTER_ORDER_BY = re.compile(r"ORDER BY (\w+)\.(\w+)(?:\s+ASC|\s+DESC)?(?:,[^()]*)?\s+LIMIT [^()]*$")
+
+
+def _walks_rowid(table, statement):
+    """
+    Whether a bare SQLite scan of ``table`` is a walk of its rowid B-tree in the
+    outer ORDER BY ... LIMIT order, which stops early like an index scan on the pkey.
+    """
+    match = _OUTER_ORDER_BY.search(statement)
+    if not match or match.group(1) != table:
+        return False
+    primary_key = list(db.metadata.tables[table].primary_key.columns)
+    # Only a single INTEGER PRIMARY KEY is an alias for the rowid.
+    return len(primary_key) == 1 and primary_key[0].name == match.group(2) \
+        and primary_key[0].type.python_type is int
+
+
+@contextmanager
+def captured_statements():
+    """Record every single-row statement sent to the database while the block runs."""
+    statements = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        if not executemany:
+            statements.append((statement, parameters))
+
+    event.listen(db.engine, "before_cursor_execute", record)
+    try:
+        yield statements
+    finally:
+        event.remove(db.engine, "before_cursor_execute", record)
+
+
+def full_scans(statement, parameters):
+    """EXPLAIN ``statement`` and return the hot tables it reads with a full table scan."""
+    with db.engine.connect() as conn:
+        if conn.dialect.name == "postgresql":
+            # With seq scans priced out, any Seq Scan left in the plan has no usable index,
+            # so the verdict does not depend on how large the seeded tables are.
+            conn.exec_driver_sql("SET enable_seqscan = off")
+            plan = conn.exec_driver_sql("EXPLAIN (FORMAT JSON) " + statement, parameters).scalar()
+            if isinstance(plan, str):
+                plan = json.loads(plan)
+            scans = []
+            nodes = [entry["Plan"] for entry in plan]
+            while nodes:
+                node = nodes.pop()
+                if node.get("Node Type") == "Seq Scan" and node.get("Relation Name") in HOT_TABLES:
+                    scans.append(node["Relation Name"])
+                nodes.extend(node.get("Plans", []))
+            conn.rollback()
+            return scans
+
+        details = [row[-1] for row in conn.exec_driver_sql("EXPLAIN QUERY PLAN " + statement, parameters)]
+        # An outer scan needing no sort step may be walking the rowid for ORDER BY pk LIMIT n.
+        sorted_separately = any("FOR ORDER BY" in detail for detail in details)
+        scans = []
+        for position, detail in enumerate(details):
+            match = _SQLITE_SCAN.match(detail)
+            # "SCAN t USING [COVERING] INDEX ..." walks an index in order; only bare scans count.
+            if not match or match.group(1) not in HOT_TABLES or "USING" in detail:
+                continue
+            if position == 0 and not sorted_separately and _walks_rowid(match.group(1), statement):
+                continue
+            scans.append(match.group(1))
+        return scans
+
+
+def _token(user_id):
+    return jwt.encode({
+        "user_id": user_id,
+        "exp": datetime.now(timezone.utc) + timedelta(minutes=10)
+    }, current_app.config["JWT_SECRET_KEY"], algorithm="HS256")
+
+
+def collect_endpoint_statements():
+    """
+    Run the hot read endpoints and write paths against the current data, returning
+    ``[(label, statement, parameters)]`` for every SELECT/UPDATE/DELETE, winner INSERT ...
+    SELECT and bid upsert.
+
+    The write paths (bid writes, status transitions, winner determination) are rolled back.
+    """
+    admin_id = db.session.scalar(select(User.user_id).where(User.role == "admin").limit(1))
+    client_id = db.session.scalar(select(Bid.user_id).limit(1))
+    winner_id = db.session.scalar(select(AuctionWinner.user_id).limit(1)) or client_id
+    active_auction_id = db.session.scalar(
+        select(Auction.auction_id).where(Auction.status == "active", Auction.is_visible == True).limit(1)
+    )
+    closed_auction_id = db.session.scalar(
+        select(Auction.auction_id).where(Auction.status == "closed").limit(1)
+    )
+    if None in (admin_id, client_id, active_auction_id, closed_auction_id):
+        raise RuntimeError("The database needs an admin, bids, and active and closed auctions; run with --seed.")
+    db.session.commit()
+
+    requests = [
+        (client_id, "/auctions"),
+        (client_id, f"/auctions/{active_auction_id}"),
+        (client_id, f"/auctions/{active_auction_id}?limit=20"),
+        (client_id, "/my-bids"),
+        (client_id, "/my-bids?status=active"),
+        (client_id, f"/my-bids?auction_id={active_auction_id}"),
+        (winner_id, "/my-wins"),
+        (admin_id, "/admin/auctions"),
+        (admin_id, "/admin/auctions?status=active"),
+        (admin_id, f"/admin/auctions/{closed_auction_id}"),
+        (client_id, "/lots/search?q=iphone"),
+        (client_id, f"/lots/search?q=iphone&auction_id={active_auction_id}&limit=20"),
+    ]
+
+    collected = []
+    client = current_app.test_client()
+    for user_id, path in requests:
+        with captured_statements() as statements:
+            client.get(path, headers={"x-access-token": _token(user_id)})
+        collected.extend((f"GET {path}", statement, parameters) for statement, parameters in statements)
+
+    # submit_bid: a cold lot lookup, the leading bidder, and upserts of a new and a replaced bid.
+    bid_lot_id = db.session.scalar(select(Bid.lot_id).where(Bid.user_id == client_id).limit(1))
+    new_lot_id = db.session.scalar(
+        select(Lot.lot_id).where(Lot.auction_id == active_auction_id, Lot.lot_id != bid_lot_id).limit(1)
+    )
+    db.session.commit()
+    with current_app.app_context():
+        with captured_statements() as statements:
+            LotRegistry().fetch(new_lot_id)
+            db.session.scalar(select(leading_bidder_subquery(new_lot_id)))
+            bid_time = datetime.now(timezone.utc)
+            upsert_bids([{"lot_id": new_lot_id, "user_id": client_id, "bid_amount": 1, "bid_time": bid_time}])
+            upsert_bids([{"lot_id": bid_lot_id, "user_id": client_id, "bid_amount": 1, "bid_time": bid_time}])
+        db.session.rollback()
+    collected.extend(("POST bid", statement, parameters) for statement, parameters in statements)
+
+    with current_app.app_context():
+        with captured_statements() as statements:
+            apply_status_transitions()
+            determine_winners(closed_auction_id)
+        db.session.rollback()
+    collected.extend(("status transitions / winner determination", statement, parameters)
+                     for statement, parameters in statements)
+
+    return [
+        entry for entry in collected
+        if entry[1].lstrip().upper().startswith(("SELECT", "WITH", "UPDATE", "DELETE", "INSERT INTO AUCTION_WINNERS",
+                                                 "INSERT INTO BIDS"))
+    ]
+
+
+def check_query_plans(seed=False, echo=print):
+    """
+    EXPLAIN the queries behind the hot endpoints and report any full scan of a hot table.
+
+    Returns the number of offending statements (0 means every plan uses an index).
+    """
+    if seed:
+        if db.session.scalar(select(func.count()).select_from(Auction)):
+            raise RuntimeError("Refusing to seed: the database already has auctions.")
+        echo("Seeding plan dataset...")
+        seed_dataset(**SCALES["medium"])
+
+    failures = 0
+    statements = collect_endpoint_statements()
+    for label, statement, parameters in statements:
+        scans = full_scans(statement, parameters)
+        if scans:
+            failures += 1
+            echo(f"FULL SCAN on {', '.join(sorted(set(scans)))} in {label}:\n    {' '.join(statement.split())}")
+    echo(f"{failures} of {len(statements)} statement(s) fully scan one of {', '.join(HOT_TABLES)}.")
+    return failures
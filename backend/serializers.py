@@ -0,0 +1,230 @@
+"""
+Response serializers: API payloads built straight from row tuples.
+
+A :class:`Serializer` names the fields of a payload and the SQL expression behind each.
+Endpoints select only the columns of the fields a request asks for (``?fields=``),
+fetch plain rows rather than ORM objects, and turn them into dicts without per-field
+conversions: decimals are cast to floats in SQL and datetimes are left to the JSON
+provider, which encodes them as ISO 8601 (with orjson when it is installed).
+"""
+import datetime
+
+from flask import request
+from flask.json.provider import DefaultJSONProvider
+from sqlalchemy import Float, cast, func, select
+
+from extensions import image_store
+from models import User, Carrier, Auction, Lot, Bid, AuctionWinner
+from pagination import PaginationError
+
+try:
+    import orjson
+except ImportError:  # The stdlib encoder produces the same documents, only slower.
+    orjson = None
+
+
+class FastJSONProvider(DefaultJSONProvider):
+    """Flask's JSON provider on orjson when available, with datetimes as ISO 8601 either way."""
+
+    @staticmethod
+    def default(o):
+        if isinstance(o, (datetime.date, datetime.time)):
+            return o.isoformat()
+        return DefaultJSONProvider.default(o)
+
+    def _orjson_option(self, indent=False):
+        option = orjson.OPT_NON_STR_KEYS
+        if self.sort_keys:
+            option |= orjson.OPT_SORT_KEYS
+        if indent:
+            option |= orjson.OPT_INDENT_2
+        return option
+
+    def dumps(self, obj, **kwargs):
+        if orjson is None or kwargs:
+            return super().dumps(obj, **kwargs)
+        return orjson.dumps(obj, default=self.default, option=self._orjson_option()).decode("utf-8")
+
+    def response(self, *args, **kwargs):
+        if orjson is None:
+            return super().response(*args, **kwargs)
+        obj = self._prepare_response_obj(args, kwargs)
+        indent = self.compact is False or (self.compact is None and self._app.debug)
+        body = orjson.dumps(obj, default=self.default, option=self._orjson_option(indent))
+        return self._app.response_class(body + b"\n", mimetype=self.mimetype)
+
+
+class computed:
+    """A field encoded from several columns: ``encode(*values)`` gives its value."""
+
+    def __init__(self, *columns, encode):
+        self.columns = columns
+        self.encode = encode
+
+
+class Serializer:
+    """
+    Named fields, each a column expression or a :class:`computed`, in payload order.
+
+    ``columns(names)`` gives the expressions to select for ``names`` (simple fields are
+    labelled with their name) and ``dump(rows, names)`` turns the fetched rows into dicts.
+    """
+
+    def __init__(self, **fields):
+        self.fields = fields
+
+    def extend(self, **fields):
+        """A copy with ``fields`` added, or replaced where the name exists."""
+        return Serializer(**{**self.fields, **fields})
+
+    def only(self, *names):
+        return Serializer(**{name: self.fields[name] for name in names})
+
+    def requested(self, param="fields"):
+        """Field names asked for by the request's comma-separated ``param``; all of them by default."""
+        value = request.args.get(param)
+        if not value:
+            return tuple(self.fields)
+        names = {name.strip() for name in value.split(",") if name.strip()}
+        unknown = names - self.fields.keys()
+        if unknown:
+            raise PaginationError(f"Unknown {param}: {', '.join(sorted(unknown))}. "
+                                  f"Available: {', '.join(self.fields)}.")
+        return tuple(name for name in self.fields if name in names)
+
+    def columns(self, names, keys=()):
+        """
+        Expressions to select for ``names``, then for the simple fields ``keys`` that are
+        not among them (e.g. pagination sort keys), which ``dump`` leaves out.
+        """
+        selected = []
+        for name in names:
+            field = self.fields[name]
+            if isinstance(field, computed):
+                selected.extend(column.label(f"{name}__{i}") for i, column in enumerate(field.columns))
+            else:
+                selected.append(field.label(name))
+        selected.extend(self.fields[key].label(key) for key in keys if key not in names)
+        return selected
+
+    def dump(self, rows, names):
+        plan, position = [], 0
+        for name in names:
+            field = self.fields[name]
+            if isinstance(field, computed):
+                plan.append((name, position, position + len(field.columns), field.encode))
+                position += len(field.columns)
+            else:
+                plan.append((name, position, None, None))
+                position += 1
+        if position == len(names):
+            return [dict(zip(names, row)) for row in rows]
+        return [
+            {name: row[start] if encode is None else encode(*row[start:end]) for name, start, end, encode in plan}
+            for row in rows
+        ]
+
+    def dump_one(self, row, names):
+        return self.dump([row], names)[0]
+
+
+def _image_url(variant):
+    # Store URLs once the image is ingested, otherwise the manifest's original URL.
+    return computed(Lot.image_key, Lot.image_url,
+                    encode=lambda image_key, image_url: image_store.url(image_key, variant) if image_key else image_url)
+
+
+def _record(*names):
+    return lambda *values: dict(zip(names, values))
+
+
+USER = Serializer(
+    user_id=User.user_id,
+    email=User.email,
+    company_name=User.company_name,
+    role=User.role,
+    deposit_status=User.deposit_status,
+    is_active=User.is_active,
+    created_at=User.created_at,
+    last_login=User.last_login
+)
+
+# Correlated subqueries, so auctions need no join and the count runs only when asked for.
+_carrier_name = select(Carrier.name).where(Carrier.carrier_id == Auction.carrier_id).scalar_subquery()
+_lot_count = select(func.count(Lot.lot_id)).where(Lot.auction_id == Auction.auction_id).scalar_subquery()
+
+AUCTION = Serializer(
+    auction_id=Auction.auction_id,
+    name=Auction.name,
+    carrier_id=Auction.carrier_id,
+    carrier_name=_carrier_name,
+    start_time=Auction.start_time,
+    end_time=Auction.end_time,
+    status=Auction.status,
+    is_visible=Auction.is_visible,
+    grading_guide=Auction.grading_guide,
+    created_at=Auction.created_at,
+    updated_at=Auction.updated_at,
+    lot_count=_lot_count
+)
+ADMIN_AUCTION_LIST = AUCTION.only("auction_id", "name", "carrier_id", "carrier_name", "start_time", "end_time",
+                                  "status", "is_visible", "grading_guide", "created_at", "lot_count")
+ADMIN_AUCTION = AUCTION.only("auction_id", "name", "carrier_id", "carrier_name", "start_time", "end_time",
+                             "status", "is_visible", "grading_guide", "created_at", "updated_at")
+_client_carrier_name = func.coalesce(_carrier_name, "Unknown Carrier")
+CLIENT_AUCTION_LIST = AUCTION.only("auction_id", "name", "carrier_id", "carrier_name", "start_time", "end_time",
+                                   "grading_guide", "lot_count").extend(carrier_name=_client_carrier_name)
+CLIENT_AUCTION = AUCTION.only("auction_id", "name", "carrier_name", "start_time", "end_time", "status",
+                              "grading_guide").extend(carrier_name=_client_carrier_name)
+
+ADMIN_LOT = Serializer(
+    lot_id=Lot.lot_id,
+    lot_identifier=Lot.lot_identifier,
+    device_name=Lot.device_name,
+    device_details=Lot.device_details,
+    condition=Lot.condition,
+    quantity=Lot.quantity,
+    min_bid=cast(Lot.min_bid, Float),
+    image_url=Lot.image_url,
+    image_key=Lot.image_key,
+    thumbnail_url=_image_url("thumb")
+)
+LOT = Serializer(
+    lot_id=Lot.lot_id,
+    lot_identifier=Lot.lot_identifier,
+    device_name=Lot.device_name,
+    device_details=Lot.device_details,
+    image_url=_image_url("medium"),
+    thumbnail_url=_image_url("thumb"),
+    condition=Lot.condition,
+    quantity=Lot.quantity,
+    min_bid=cast(Lot.min_bid, Float)
+)
+
+# Selected from bids joined to their lot and auction; /my-bids adds its per-user is_leading field.
+BID = Serializer(
+    bid_id=Bid.bid_id,
+    lot_info=computed(Lot.lot_id, Lot.lot_identifier, Lot.device_name, Auction.name, Auction.auction_id,
+                      Auction.end_time, Auction.status,
+                      encode=_record("lot_id", "lot_identifier", "device_name", "auction_name", "auction_id",
+                                     "auction_end_time", "auction_status")),
+    bid_amount=cast(Bid.bid_amount, Float),
+    bid_time=Bid.bid_time,
+    status=Bid.status
+)
+
+# Selected from winners joined to their lot, its auction and the winning bid.
+WINNER = Serializer(
+    winner_id=AuctionWinner.winner_id,
+    awarded_at=AuctionWinner.awarded_at,
+    winning_amount=cast(AuctionWinner.winning_amount, Float),
+    lot_identifier=Lot.lot_identifier,
+    device_name=Lot.device_name,
+    device_details=Lot.device_details,
+    image_url=_image_url("medium"),
+    thumbnail_url=_image_url("thumb"),
+    auction_name=Auction.name,
+    auction_end_time=Auction.end_time,
+    winning_bid_time=Bid.bid_time,
+    invoice_placeholder_url=computed(Lot.lot_identifier, encode=lambda lot_identifier: f"/invoices/lot/{lot_identifier}")
+)
@@ -0,0 +1,213 @@
+import pandas as pd
+from sqlalchemy import insert, or_, select, update
+
+from extensions import db, password_hasher
+from models import User
+
+# Accepted spellings for each User column in an uploaded file, checked against the lower-cased headers.
+EXPECTED_USER_COLUMNS = {
+    "user_id": ["user id", "user_id", "id"],
+    "email": ["email", "email address", "e-mail"],
+    "password": ["password", "initial password"],
+    "company_name": ["company", "company name", "company_name"],
+    "role": ["role"],
+    "deposit_status": ["deposit status", "deposit_status", "deposit"],
+    "is_active": ["active", "is active", "is_active"],
+}
+USER_ROLES = ("client", "admin")
+BULK_UPDATE_FIELDS = ("deposit_status", "is_active")
+# Rows per request; larger onboarding runs are split into several files.
+MAX_BULK_USER_ROWS = 10000
+# Rows per executemany batch when writing users.
+USER_WRITE_BATCH_SIZE = 1000
+
+TRUE_VALUES = {"true", "yes", "y", "1"}
+FALSE_VALUES = {"false", "no", "n", "0"}
+
+
+class UserImportError(Exception):
+    """Raised when a bulk user request cannot be processed at all (e.g. no email column)."""
+
+
+def _text(value):
+    if value is None or (not isinstance(value, str) and pd.isna(value)):
+        return None
+    value = str(value).strip()
+    return value or None
+
+
+def _flag(value):
+    """A boolean from JSON or a spreadsheet cell; None when empty. Raises ValueError otherwise."""
+    if isinstance(value, bool) or value is None:
+        return value
+    text = _text(value)
+    if text is None:
+        return None
+    if text.lower() in TRUE_VALUES:
+        return True
+    if text.lower() in FALSE_VALUES:
+        return False
+    raise ValueError(f"Invalid is_active '{text}'.")
+
+
+def records_from_frames(chunks):
+    """``(row_number, record)`` pairs from the row-indexed DataFrames of an uploaded CSV/XLSX; the header is row 1."""
+    records = []
+    for chunk in chunks:
+        columns = {str(col).strip().lower(): col for col in chunk.columns}
+        mapped_cols = {}
+        for target_col, potential_names in EXPECTED_USER_COLUMNS.items():
+            for potential_name in potential_names:
+                if potential_name in columns:
+                    mapped_cols[target_col] = columns[potential_name]
+                    break
+        if "email" not in mapped_cols and "user_id" not in mapped_cols:
+            raise UserImportError(f"Missing required column in file: one of {EXPECTED_USER_COLUMNS['email']}")
+        for row_number, *values in chunk[list(mapped_cols.values())].itertuples():
+            records.append((int(row_number), dict(zip(mapped_cols, values))))
+            if len(records) > MAX_BULK_USER_ROWS:
+                raise UserImportError(f"At most {MAX_BULK_USER_ROWS} rows can be processed per request.")
+    return records
+
+
+def records_from_json(data):
+    """``(row_number, record)`` pairs from a JSON array of objects; row 1 is the first element."""
+    if not isinstance(data, list) or not all(isinstance(record, dict) for record in data):
+        raise UserImportError("Expected a JSON array of user objects.")
+    if len(data) > MAX_BULK_USER_ROWS:
+        raise UserImportError(f"At most {MAX_BULK_USER_ROWS} rows can be processed per request.")
+    return list(enumerate(data, start=1))
+
+
+def _error(row, email, message):
+    return {"row": row, "email": email, "status": "error", "message": message}
+
+
+def create_users(records):
+    """
+    Create users from validated records in a fixed number of statements.
+
+    Email uniqueness is checked with one query for the whole request plus a set for
+    duplicates within it, passwords are hashed in parallel by the password hasher pool,
+    and users are inserted in batches. Rows that fail validation are reported and
+    skipped. The caller commits.
+
+    Returns ``(results, created)`` where ``results`` has one entry per input row.
+    """
+    results = {}
+    pending = []  # (row, values, password)
+    first_rows = {}
+    for row, record in records:
+        email = _text(record.get("email"))
+        password = _text(record.get("password"))
+        role = _text(record.get("role")) or "client"
+        if email is None or "@" not in email:
+            results[row] = _error(row, email, "A valid email is required.")
+            continue
+        if email in first_rows:
+            results[row] = _error(row, email, f"Duplicate email in request (first seen on row {first_rows[email]}).")
+            continue
+        first_rows[email] = row
+        if password is None:
+            results[row] = _error(row, email, "A password is required.")
+            continue
+        if role not in USER_ROLES:
+            results[row] = _error(row, email, f"Invalid role '{role}'.")
+            continue
+        try:
+            is_active = _flag(record.get("is_active"))
+        except ValueError as e:
+            results[row] = _error(row, email, str(e))
+            continue
+        pending.append((row, {
+            "email": email,
+            "company_name": _text(record.get("company_name")),
+            "role": role,
+            "deposit_status": _text(record.get("deposit_status")) or "pending",
+            "is_active": True if is_active is None else is_active
+        }, password))
+
+    existing = set(db.session.scalars(
+        select(User.email).where(User.email.in_([values["email"] for _row, values, _password in pending]))
+    )) if pending else set()
+    accepted = []
+    for row, values, password in pending:
+        if values["email"] in existing:
+            results[row] = _error(row, values["email"], "User with this email already exists.")
+        else:
+            accepted.append((row, values, password))
+
+    password_hashes = password_hasher.hash_many(password for _row, _values, password in accepted)
+    user_ids = {}
+    for start in range(0, len(accepted), USER_WRITE_BATCH_SIZE):
+        batch = [
+            dict(values, password_hash=password_hash)
+            for (_row, values, _password), password_hash
+            in zip(accepted[start:start + USER_WRITE_BATCH_SIZE], password_hashes[start:start + USER_WRITE_BATCH_SIZE])
+        ]
+        user_ids.update(db.session.execute(insert(User).returning(User.email, User.user_id), batch).all())
+    for row, values, _password in accepted:
+        results[row] = {"row": row, "email": values["email"], "status": "created", "user_id": user_ids[values["email"]]}
+    return [results[row] for row in sorted(results)], len(accepted)
+
+
+def update_users(records):
+    """
+    Apply ``deposit_status`` / ``is_active`` changes to users identified by email or user_id.
+
+    Users are resolved with one query and updated with batched executemany UPDATEs by
+    primary key. Rows that fail validation are reported and skipped. The caller commits
+    and invalidates cached principals for the returned user ids.
+
+    Returns ``(results, updated_user_ids)``.
+    """
+    results = {}
+    pending = []  # (row, email, user_id, changes)
+    for row, record in records:
+        email = _text(record.get("email"))
+        user_id = _text(record.get("user_id"))
+        changes = {}
+        if _text(record.get("deposit_status")) is not None:
+            changes["deposit_status"] = _text(record.get("deposit_status"))
+        try:
+            is_active = _flag(record.get("is_active"))
+        except ValueError as e:
+            results[row] = _error(row, email, str(e))
+            continue
+        if is_active is not None:
+            changes["is_active"] = is_active
+        if user_id is not None:
+            try:
+                user_id = int(float(user_id))
+            except ValueError:
+                results[row] = _error(row, email, f"Invalid user_id '{user_id}'.")
+                continue
+        if email is None and user_id is None:
+            results[row] = _error(row, email, "An email or user_id is required.")
+        elif not changes:
+            results[row] = _error(row, email, f"Nothing to update; provide one of {', '.join(BULK_UPDATE_FIELDS)}.")
+        else:
+            pending.append((row, email, user_id, changes))
+
+    emails = [email for _row, email, user_id, _changes in pending if user_id is None]
+    user_ids = [user_id for _row, _email, user_id, _changes in pending if user_id is not None]
+    found = db.session.execute(
+        select(User.user_id, User.email).where(or_(User.email.in_(emails), User.user_id.in_(user_ids)))
+    ).all() if pending else []
+    ids_by_email = {user.email: user.user_id for user in found}
+    emails_by_id = {user.user_id: user.email for user in found}
+
+    changes_by_user = {}
+    for row, email, user_id, changes in pending:
+        user_id = ids_by_email.get(email) if user_id is None else user_id
+        if user_id not in emails_by_id:
+            results[row] = _error(row, email, "User not found.")
+            continue
+        # A later row for the same user wins, as if the rows were applied one by one.
+        changes_by_user.setdefault(user_id, {}).update(changes)
+        results[row] = {"row": row, "email": emails_by_id[user_id], "status": "updated", "user_id": user_id}
+
+    rows = [dict(changes, user_id=user_id) for user_id, changes in changes_by_user.items()]
+    for start in range(0, len(rows), USER_WRITE_BATCH_SIZE):
+        db.session.execute(update(User), rows[start:start + USER_WRITE_BATCH_SIZE])
+    return [results[row] for row in sorted(results)], list(changes_by_user)
@@ -0,0 +1,60 @@
+import datetime
+
+from flask import request
+
+from pagination import PaginationError
+
+ALLOWED_EXTENSIONS = {"csv", "xlsx"}
+
+
+def allowed_file(filename):
+    return "." in filename and filename.rsplit(".", 1)[1].lower() in ALLOWED_EXTENSIONS
+
+
+# Helper to parse datetimes from strings if needed
+def parse_datetime_string(dt_str):
+    if not dt_str:
+        return None
+    try:
+        # Attempt to parse ISO format with timezone
+        return datetime.datetime.fromisoformat(dt_str)
+    except ValueError:
+        try:
+            # Attempt to parse without milliseconds
+            return datetime.datetime.strptime(dt_str, "%Y-%m-%dT%H:%M:%S%z")
+        except ValueError:
+            try:
+                # Attempt to parse if it is naive and then make it aware (assuming UTC)
+                dt_naive = datetime.datetime.strptime(dt_str, "%Y-%m-%dT%H:%M:%S")
+                return dt_naive.replace(tzinfo=datetime.timezone.utc)
+            except ValueError:
+                return None # Or raise error
+
+# Helpers for optional list filters; bad values surface as a 400 through PaginationError.
+def filter_datetime_arg(name):
+    value = request.args.get(name)
+    if not value:
+        return None
+    parsed = parse_datetime_string(value)
+    if not parsed:
+        raise PaginationError(f"Invalid {name} format. Use ISO format like YYYY-MM-DDTHH:MM:SSZ")
+    return parsed
+
+def filter_bool_arg(name):
+    value = request.args.get(name)
+    if not value:
+        return None
+    if value.lower() in ("true", "1", "yes"):
+        return True
+    if value.lower() in ("false", "0", "no"):
+        return False
+    raise PaginationError(f"{name} must be true or false.")
+
+def filter_int_arg(name):
+    value = request.args.get(name)
+    if not value:
+        return None
+    try:
+        return int(value)
+    except ValueError:
+        raise PaginationError(f"Invalid {name} format.")
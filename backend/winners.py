@@ -0,0 +1,80 @@
+from sqlalchemy import case, delete, exists, func, insert, select, update
+from sqlalchemy.orm import aliased
+
+from extensions import db
+from models import User, Lot, Bid, AuctionWinner
+
+
+def ranked_bids_subquery(auction_id):
+    """
+    Bids from active users on the auction's lots, ranked per lot.
+
+    Rank 1 is the winner: highest ``bid_amount``, earliest ``bid_time`` on ties.
+    """
+    bid_rank = func.row_number().over(
+        partition_by=Bid.lot_id,
+        order_by=(Bid.bid_amount.desc(), Bid.bid_time.asc())
+    ).label("bid_rank")
+    return select(Bid.bid_id, Bid.lot_id, Bid.user_id, Bid.bid_amount, bid_rank)\
+        .join(Lot, Lot.lot_id == Bid.lot_id)\
+        .join(User, User.user_id == Bid.user_id)\
+        .where(Lot.auction_id == auction_id, User.is_active == True)\
+        .subquery("ranked_bids")
+
+
+def leading_bidder_subquery(lot_id):
+    """
+    Correlated scalar subquery giving the user_id currently leading on ``lot_id``.
+
+    Uses the same eligibility and tie-breaking as winner determination, and reads one
+    row of the (lot_id, bid_amount desc, bid_time) index per evaluated lot.
+    """
+    leading_bid = aliased(Bid)
+    return select(leading_bid.user_id)\
+        .join(User, User.user_id == leading_bid.user_id)\
+        .where(leading_bid.lot_id == lot_id, User.is_active == True)\
+        .order_by(leading_bid.bid_amount.desc(), leading_bid.bid_time.asc())\
+        .limit(1)\
+        .scalar_subquery()
+
+
+def determine_winners(auction_id):
+    """
+    Award every lot of an auction with a fixed number of statements, whatever its size.
+
+    Previous results for the auction are cleared, the rank-1 bid of each lot is copied
+    into ``auction_winners`` with one INSERT ... SELECT, and every bid on the auction
+    gets its final status (winning/outbid/lost) from one UPDATE. The caller commits.
+
+    Returns ``(lots_processed, winners_determined)``.
+    """
+    auction_lot_ids = select(Lot.lot_id).where(Lot.auction_id == auction_id)
+
+    db.session.execute(
+        delete(AuctionWinner).where(AuctionWinner.lot_id.in_(auction_lot_ids)),
+        execution_options={"synchronize_session": False}
+    )
+
+    ranked = ranked_bids_subquery(auction_id)
+    winners_determined = db.session.execute(
+        insert(AuctionWinner).from_select(
+            ["lot_id", "user_id", "winning_bid_id", "winning_amount"],
+            select(ranked.c.lot_id, ranked.c.user_id, ranked.c.bid_id, ranked.c.bid_amount)
+            .where(ranked.c.bid_rank == 1)
+        )
+    ).rowcount
+
+    final_status = case(
+        (exists().where(AuctionWinner.winning_bid_id == Bid.bid_id), "winning"),
+        (exists().where(AuctionWinner.lot_id == Bid.lot_id), "outbid"),
+        else_="lost"
+    )
+    db.session.execute(
+        update(Bid).where(Bid.lot_id.in_(auction_lot_ids)).values(status=final_status),
+        execution_options={"synchronize_session": False}
+    )
+
+    lots_processed = db.session.scalar(
+        select(func.count()).select_from(Lot).where(Lot.auction_id == auction_id)
+    )
+    return lots_processed, winners_determined
@@ -14,7 +14,15 @@ function AuctionForm({ onSubmit, initialData = {}, isEditMode = false }) {
 
   useEffect(() => {
     const fetchCarriers = async () => {
-      try { const response = await getAllCarriers(); setCarriers(response.data.carriers); } catch (err) { console.error('Failed to fetch carriers', err); setError('Failed to load carriers for selection.'); }
+      // The selector needs every carrier, so walk all pages at the maximum page size.
+      try {
+        let all = []; let cursor = null;
+        do {
+          const response = await getAllCarriers(cursor ? { limit: 200, cursor } : { limit: 200 });
+          all = all.concat(response.data.carriers); cursor = response.data.next_cursor;
+        } while (cursor);
+        setCarriers(all);
+      } catch (err) { console.error('Failed to fetch carriers', err); setError('Failed to load carriers for selection.'); }
     };
     fetchCarriers();
   }, []);
@@ -1,8 +1,9 @@
 import React, { useState, useEffect } from 'react';
 
-function CountdownTimer({ endTime }) {
+// serverOffsetMs corrects the local clock to server time (see serverClockOffset).
+function CountdownTimer({ endTime, serverOffsetMs = 0 }) {
   const calculateTimeLeft = () => {
-    const difference = +new Date(endTime) - +new Date();
+    const difference = +new Date(endTime) - (Date.now() + serverOffsetMs);
     let timeLeft = {};
 
     if (difference > 0) {
@@ -5,19 +5,26 @@ import '../../styles/TableStyles.css';
 
 function AuctionListPage() {
   const [auctions, setAuctions] = useState([]);
+  const [nextCursor, setNextCursor] = useState(null);
+  const [statusFilter, setStatusFilter] = useState('');
   const [loading, setLoading] = useState(true);
+  const [loadingMore, setLoadingMore] = useState(false);
   const [error, setError] = useState('');
 
-  const fetchAuctions = async () => {
-    setLoading(true); setError('');
+  const fetchAuctions = async (cursor = null) => {
+    cursor ? setLoadingMore(true) : setLoading(true); setError('');
     try {
-      const response = await getAllAuctions();
-      setAuctions(response.data.auctions);
+      const params = {};
+      if (statusFilter) params.status = statusFilter;
+      if (cursor) params.cursor = cursor;
+      const response = await getAllAuctions(params);
+      setAuctions(prev => (cursor ? [...prev, ...response.data.auctions] : response.data.auctions));
+      setNextCursor(response.data.next_cursor);
     } catch (err) { setError(err.response?.data?.message || 'Failed to fetch auctions.'); console.error(err); }
-    setLoading(false);
+    cursor ? setLoadingMore(false) : setLoading(false);
   };
 
-  useEffect(() => { fetchAuctions(); }, []);
+  useEffect(() => { fetchAuctions(); }, [statusFilter]); // eslint-disable-line react-hooks/exhaustive-deps
 
   const handleDelete = async (auctionId) => {
     if (window.confirm('Are you sure you want to delete this auction and all its lots?')) {
@@ -35,6 +42,15 @@ function AuctionListPage() {
       <h2>Auction Management</h2>
       {error && <p className='error-message' style={{color: 'red'}}>{error}</p>}
       <Link to='/admin/auctions/new' className='button-link'>Create New Auction</Link>
+      <div className='list-filters'>
+        <select value={statusFilter} onChange={(e) => setStatusFilter(e.target.value)}>
+          <option value=''>All statuses</option>
+          <option value='scheduled'>Scheduled</option>
+          <option value='active'>Active</option>
+          <option value='closed'>Closed</option>
+          <option value='cancelled'>Cancelled</option>
+        </select>
+      </div>
       <table className='data-table'>
         <thead><tr><th>Name</th><th>Carrier</th><th>End Time</th><th>Status</th><th>Visible</th><th>Lots</th><th>Actions</th></tr></thead>
         <tbody>
@@ -51,6 +67,11 @@ function AuctionListPage() {
           )) : (<tr><td colSpan='7'>No auctions found.</td></tr>)}
         </tbody>
       </table>
+      {nextCursor && (
+        <button onClick={() => fetchAuctions(nextCursor)} disabled={loadingMore} className='load-more-button'>
+          {loadingMore ? 'Loading...' : 'Load More'}
+        </button>
+      )}
     </div>
   );
 }
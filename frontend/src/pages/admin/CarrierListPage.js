@@ -37,14 +37,16 @@ function CarrierForm({ onCarrierCreated }) {
 
 function CarrierListPage() {
   const [carriers, setCarriers] = useState([]);
+  const [nextCursor, setNextCursor] = useState(null);
   const [loading, setLoading] = useState(true);
   const [error, setError] = useState('');
 
-  const fetchCarriers = async () => {
-    setLoading(true);
+  const fetchCarriers = async (cursor = null) => {
+    if (!cursor) setLoading(true);
     try {
-      const response = await getAllCarriers();
-      setCarriers(response.data.carriers);
+      const response = await getAllCarriers(cursor ? { cursor } : {});
+      setCarriers(prev => (cursor ? [...prev, ...response.data.carriers] : response.data.carriers));
+      setNextCursor(response.data.next_cursor);
     } catch (err) { setError('Failed to fetch carriers.'); console.error(err); }
     setLoading(false);
   };
@@ -57,7 +59,7 @@ function CarrierListPage() {
     <div className='page-container'>
       <h2>Carrier Management</h2>
       {error && <p className='error-message' style={{color: 'red'}}>{error}</p>}
-      <CarrierForm onCarrierCreated={fetchCarriers} />
+      <CarrierForm onCarrierCreated={() => fetchCarriers()} />
       <table className='data-table'>
         <thead><tr><th>ID</th><th>Name</th><th>Created At</th></tr></thead>
         <tbody>
@@ -68,6 +70,7 @@ function CarrierListPage() {
           ))}
         </tbody>
       </table>
+      {nextCursor && <button onClick={() => fetchCarriers(nextCursor)} className='load-more-button'>Load More</button>}
     </div>
   );
 }
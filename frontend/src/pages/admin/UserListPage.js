@@ -5,25 +5,36 @@ import '../../styles/TableStyles.css'; // Assuming a common table style
 
 function UserListPage() {
   const [users, setUsers] = useState([]);
+  const [nextCursor, setNextCursor] = useState(null);
+  const [filters, setFilters] = useState({ role: '', deposit_status: '' });
   const [loading, setLoading] = useState(true);
+  const [loadingMore, setLoadingMore] = useState(false);
   const [error, setError] = useState('');
 
-  const fetchUsers = async () => {
-    setLoading(true);
+  // Pages are fetched on demand; passing a cursor appends the next page to the list.
+  const fetchUsers = async (cursor = null) => {
+    cursor ? setLoadingMore(true) : setLoading(true);
     setError('');
     try {
-      const response = await getAllUsers();
-      setUsers(response.data.users);
+      const params = { ...filters };
+      if (cursor) params.cursor = cursor;
+      const response = await getAllUsers(params);
+      setUsers(prev => (cursor ? [...prev, ...response.data.users] : response.data.users));
+      setNextCursor(response.data.next_cursor);
     } catch (err) {
       setError(err.response?.data?.message || 'Failed to fetch users.');
       console.error('Fetch users error:', err);
     }
-    setLoading(false);
+    cursor ? setLoadingMore(false) : setLoading(false);
   };
 
   useEffect(() => {
     fetchUsers();
-  }, []);
+  }, [filters]); // eslint-disable-line react-hooks/exhaustive-deps
+
+  const handleFilterChange = (e) => {
+    setFilters(prev => ({ ...prev, [e.target.name]: e.target.value }));
+  };
 
   const handleDelete = async (userId) => {
     if (window.confirm('Are you sure you want to delete this user?')) {
@@ -44,6 +55,19 @@ function UserListPage() {
       <h2>User Management</h2>
       {error && <p className='error-message' style={{color: 'red'}}>{error}</p>}
       <Link to='/admin/users/new' className='button-link'>Add New User</Link>
+      <div className='list-filters'>
+        <select name='role' value={filters.role} onChange={handleFilterChange}>
+          <option value=''>All roles</option>
+          <option value='client'>Client</option>
+          <option value='admin'>Admin</option>
+        </select>
+        <select name='deposit_status' value={filters.deposit_status} onChange={handleFilterChange}>
+          <option value=''>All deposit statuses</option>
+          <option value='pending'>Pending</option>
+          <option value='on_file'>On file</option>
+          <option value='cleared'>Cleared</option>
+        </select>
+      </div>
       <table className='data-table'>
         <thead>
           <tr>
@@ -73,6 +97,11 @@ function UserListPage() {
           )}
         </tbody>
       </table>
+      {nextCursor && (
+        <button onClick={() => fetchUsers(nextCursor)} disabled={loadingMore} className='load-more-button'>
+          {loadingMore ? 'Loading...' : 'Load More'}
+        </button>
+      )}
     </div>
   );
 }
@@ -1,6 +1,6 @@
-import React, { useEffect, useState } from 'react';
+import React, { useEffect, useState, useCallback } from 'react';
 import { Link } from 'react-router-dom';
-import { getActiveAuctions } from '../../services/clientAuctionService';
+import { getActiveAuctions, subscribeToAuctionEvents } from '../../services/clientAuctionService';
 import './AuctionBrowsePage.css'; // Specific styles
 
 function AuctionBrowsePage() {
@@ -9,29 +9,54 @@ function AuctionBrowsePage() {
   const [error, setError] = useState('');
   const [activeCarrierTab, setActiveCarrierTab] = useState('');
 
+  const fetchAuctions = useCallback(async () => {
+    setLoading(true);
+    try {
+      const response = await getActiveAuctions();
+      if (response.data && response.data.auctions_by_carrier) {
+        setAuctionsByCarrier(response.data.auctions_by_carrier);
+        // Keep the selected carrier tab if it still exists, otherwise select the first one
+        const carriers = Object.keys(response.data.auctions_by_carrier);
+        setActiveCarrierTab(prev => (carriers.includes(prev) ? prev : carriers[0] || ''));
+      } else {
+        setError('No auction data found in expected format.');
+      }
+    } catch (err) {
+      setError(err.response?.data?.message || 'Failed to fetch auctions.');
+      console.error('Fetch auctions error:', err);
+    }
+    setLoading(false);
+  }, []);
+
   useEffect(() => {
-    const fetchAuctions = async () => {
-      setLoading(true);
-      try {
-        const response = await getActiveAuctions();
-        if (response.data && response.data.auctions_by_carrier) {
-          setAuctionsByCarrier(response.data.auctions_by_carrier);
-          // Set the first carrier as active tab if available
-          const carriers = Object.keys(response.data.auctions_by_carrier);
-          if (carriers.length > 0) {
-            setActiveCarrierTab(carriers[0]);
-          }
+    fetchAuctions();
+  }, [fetchAuctions]);
+
+  // Apply pushed status/end-time changes to the loaded list; only a newly opened auction needs a refetch.
+  useEffect(() => {
+    const updateAuction = (auctionId, update) => setAuctionsByCarrier(prev => {
+      const next = {};
+      Object.keys(prev).forEach(carrierName => {
+        const auctions = prev[carrierName].auctions
+          .map(auction => (auction.auction_id === auctionId ? update(auction) : auction))
+          .filter(Boolean);
+        next[carrierName] = { ...prev[carrierName], auctions };
+      });
+      return next;
+    });
+    const source = subscribeToAuctionEvents(null, {
+      status: (data) => {
+        if (data.status === 'active' && data.is_visible !== false) {
+          fetchAuctions();
         } else {
-          setError('No auction data found in expected format.');
+          updateAuction(data.auction_id, () => null);
         }
-      } catch (err) {
-        setError(err.response?.data?.message || 'Failed to fetch auctions.');
-        console.error('Fetch auctions error:', err);
-      }
-      setLoading(false);
-    };
-    fetchAuctions();
-  }, []);
+      },
+      end_time: (data) => updateAuction(data.auction_id, auction => ({ ...auction, end_time: data.end_time })),
+      reconnect: fetchAuctions,
+    });
+    return () => source.close();
+  }, [fetchAuctions]);
 
   if (loading) return <p className='loading-message'>Loading auctions...</p>;
   if (error) return <p className='error-message'>{error}</p>;
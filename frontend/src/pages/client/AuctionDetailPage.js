@@ -1,6 +1,6 @@
 import React, { useEffect, useState, useCallback } from 'react';
 import { useParams, Link } from 'react-router-dom';
-import { getAuctionDetails, submitBid } from '../../services/clientAuctionService';
+import { getAuctionDetails, submitBid, subscribeToAuctionEvents, serverClockOffset, imageSrc } from '../../services/clientAuctionService';
 import { getClientInfo } from '../../utils/authClient';
 import CountdownTimer from '../../components/common/CountdownTimer';
 import './AuctionDetailPage.css'; // Specific styles
@@ -9,9 +9,11 @@ function AuctionDetailPage() {
   const { auctionId } = useParams();
   const [auction, setAuction] = useState(null);
   const [loading, setLoading] = useState(true);
+  const [loadingMoreLots, setLoadingMoreLots] = useState(false);
   const [error, setError] = useState('');
   const [bidAmounts, setBidAmounts] = useState({}); // Store bid amounts for each lot_id
   const [bidMessages, setBidMessages] = useState({}); // Store success/error messages for each lot_id
+  const [serverOffsetMs, setServerOffsetMs] = useState(0); // Local clock correction from the event stream
 
   const clientInfo = getClientInfo();
   const canBid = clientInfo && (clientInfo.deposit_status === 'on_file' || clientInfo.deposit_status === 'cleared');
@@ -28,10 +30,37 @@ function AuctionDetailPage() {
     setLoading(false);
   }, [auctionId]);
 
+  // Lots arrive a page at a time; later pages are appended to the loaded auction.
+  const loadMoreLots = async () => {
+    setLoadingMoreLots(true);
+    try {
+      const response = await getAuctionDetails(auctionId, { cursor: auction.lots_next_cursor });
+      setAuction(prev => ({ ...prev, lots: [...prev.lots, ...response.data.lots], lots_next_cursor: response.data.lots_next_cursor }));
+    } catch (err) {
+      setError(err.response?.data?.message || 'Failed to load more lots.');
+      console.error('Load more lots error:', err);
+    }
+    setLoadingMoreLots(false);
+  };
+
   useEffect(() => {
     fetchAuctionData();
   }, [fetchAuctionData]);
 
+  // Live updates are pushed by the server instead of re-fetching the whole auction.
+  useEffect(() => {
+    const source = subscribeToAuctionEvents(auctionId, {
+      status: (data) => setAuction(prev => prev && { ...prev, status: data.status, is_visible: data.is_visible ?? prev.is_visible }),
+      end_time: (data) => setAuction(prev => prev && { ...prev, end_time: data.end_time }),
+      bid_accepted: (data) => setBidMessages(prev => prev[data.lot_id]?.type === 'success' ? prev : {
+        ...prev, [data.lot_id]: { type: 'success', text: `Bid of $${data.bid_amount.toFixed(2)} received.` }
+      }),
+      time: (data) => setServerOffsetMs(serverClockOffset(data.server_time)),
+      reconnect: fetchAuctionData,
+    });
+    return () => source.close();
+  }, [auctionId, fetchAuctionData]);
+
   const handleBidChange = (lotId, amount) => {
     setBidAmounts(prev => ({ ...prev, [lotId]: amount }));
     setBidMessages(prev => ({...prev, [lotId]: ''})); // Clear previous message on new input
@@ -67,13 +96,15 @@ function AuctionDetailPage() {
   if (error) return <p className='error-message'>{error}</p>;
   if (!auction) return <p>Auction not found.</p>;
 
+  const auctionOpen = auction.status === 'active' && auction.is_visible !== false && new Date(auction.end_time) > new Date(Date.now() + serverOffsetMs);
+
   return (
     <div className='auction-detail-page'>
       <div className='auction-header-details'>
         <h2>{auction.name}</h2>
         <p><strong>Carrier:</strong> {auction.carrier_name}</p>
         <p><strong>Auction Ends:</strong> {new Date(auction.end_time).toLocaleString()}</p>
-        <CountdownTimer endTime={auction.end_time} />
+        <CountdownTimer endTime={auction.end_time} serverOffsetMs={serverOffsetMs} />
         {auction.grading_guide && <div className='grading-guide-full'><strong>Grading Guide:</strong> <pre>{auction.grading_guide}</pre></div>}
         {!canBid && <p className='bid-warning'>Your deposit status is '{clientInfo?.deposit_status}'. Bidding is disabled. Please contact support.</p>}
       </div>
@@ -83,36 +114,41 @@ function AuctionDetailPage() {
         {auction.lots && auction.lots.length > 0 ? auction.lots.map(lot => (
           <div key={lot.lot_id} className='lot-card'>
             <h4>Lot #{lot.lot_identifier} - {lot.device_name}</h4>
-            {lot.image_url && <img src={lot.image_url} alt={lot.device_name} className='lot-image' onError={(e) => e.target.style.display='none'}/>}
+            {lot.thumbnail_url && <img src={imageSrc(lot.thumbnail_url)} alt={lot.device_name} className='lot-image' loading='lazy' onError={(e) => e.target.style.display='none'}/>}
             <p><strong>Details:</strong> {lot.device_details}</p>
             <p><strong>Condition:</strong> {lot.condition}</p>
             <p><strong>Quantity:</strong> {lot.quantity}</p>
             {lot.min_bid > 0 && <p><strong>Minimum Bid:</strong> ${lot.min_bid.toFixed(2)}</p>}
 
-            {new Date(auction.end_time) > new Date() && auction.status === 'active' && (
+            {auctionOpen && (
               <div className='bid-form'>
                 <input
                   type='number'
                   placeholder='Your Bid (USD)'
                   value={bidAmounts[lot.lot_id] || ''}
                   onChange={(e) => handleBidChange(lot.lot_id, e.target.value)}
-                  disabled={!canBid || new Date(auction.end_time) <= new Date()}
+                  disabled={!canBid}
                   min={lot.min_bid > 0 ? lot.min_bid : '0.01'}
                   step='0.01'
                 />
                 <button
                   onClick={() => handleBidSubmit(lot.lot_id)}
-                  disabled={!canBid || new Date(auction.end_time) <= new Date() || bidMessages[lot.lot_id]?.type === 'loading'}
+                  disabled={!canBid || bidMessages[lot.lot_id]?.type === 'loading'}
                 >
                   {bidMessages[lot.lot_id]?.type === 'loading' ? 'Submitting...' : 'Submit Bid'}
                 </button>
                 {bidMessages[lot.lot_id] && <p className={`bid-message ${bidMessages[lot.lot_id].type}`}>{bidMessages[lot.lot_id].text}</p>}
               </div>
             )}
-             {new Date(auction.end_time) <= new Date() && <p className='auction-ended-message'>This auction has ended.</p>}
+             {!auctionOpen && <p className='auction-ended-message'>This auction has ended.</p>}
           </div>
         )) : <p>No lots found for this auction.</p>}
       </div>
+      {auction.lots_next_cursor && (
+        <button className='load-more-button' onClick={loadMoreLots} disabled={loadingMoreLots}>
+          {loadingMoreLots ? 'Loading...' : 'Load More Lots'}
+        </button>
+      )}
       <Link to='/dashboard/auctions' className='back-link'>Back to Auctions List</Link>
     </div>
   );
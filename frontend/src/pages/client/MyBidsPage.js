@@ -5,21 +5,26 @@ import './MyBidsPage.css'; // Specific styles
 
 function MyBidsPage() {
   const [bids, setBids] = useState([]);
+  const [nextCursor, setNextCursor] = useState(null);
   const [loading, setLoading] = useState(true);
+  const [loadingMore, setLoadingMore] = useState(false);
   const [error, setError] = useState('');
 
+  const fetchBids = async (cursor = null) => {
+    cursor ? setLoadingMore(true) : setLoading(true);
+    try {
+      const response = await getMyBids(cursor ? { cursor } : {});
+      const page = response.data.bids || [];
+      setBids(prev => (cursor ? [...prev, ...page] : page));
+      setNextCursor(response.data.next_cursor);
+    } catch (err) {
+      setError(err.response?.data?.message || 'Failed to fetch your bids.');
+      console.error('Fetch my bids error:', err);
+    }
+    cursor ? setLoadingMore(false) : setLoading(false);
+  };
+
   useEffect(() => {
-    const fetchBids = async () => {
-      setLoading(true);
-      try {
-        const response = await getMyBids();
-        setBids(response.data.bids || []);
-      } catch (err) {
-        setError(err.response?.data?.message || 'Failed to fetch your bids.');
-        console.error('Fetch my bids error:', err);
-      }
-      setLoading(false);
-    };
     fetchBids();
   }, []);
 
@@ -52,10 +57,18 @@ function MyBidsPage() {
               <p><strong>Auction Ends:</strong> {new Date(bid.lot_info.auction_end_time).toLocaleString()}</p>
               <p><strong>Auction Status:</strong> <span className={`auction-status ${bid.lot_info.auction_status?.toLowerCase()}`}>{bid.lot_info.auction_status}</span></p>
               <p><strong>Bid Status:</strong> <span className={`bid-status ${getStatusClass(bid.status)}`}>{bid.status}</span></p>
+              {bid.lot_info.auction_status === 'active' && (
+                <p><strong>Currently Leading:</strong> {bid.is_leading ? 'Yes' : 'No'}</p>
+              )}
             </div>
           ))}
         </div>
       )}
+      {nextCursor && (
+        <button className='load-more-button' onClick={() => fetchBids(nextCursor)} disabled={loadingMore}>
+          {loadingMore ? 'Loading...' : 'Load More'}
+        </button>
+      )}
     </div>
   );
 }
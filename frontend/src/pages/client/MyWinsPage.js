@@ -1,25 +1,30 @@
 import React, { useEffect, useState } from 'react';
 import { Link } from 'react-router-dom';
-import { getMyWins } from '../../services/clientAuctionService';
+import { getMyWins, imageSrc } from '../../services/clientAuctionService';
 import './MyWinsPage.css'; // Specific styles
 
 function MyWinsPage() {
   const [wins, setWins] = useState([]);
+  const [nextCursor, setNextCursor] = useState(null);
   const [loading, setLoading] = useState(true);
+  const [loadingMore, setLoadingMore] = useState(false);
   const [error, setError] = useState('');
 
+  const fetchWins = async (cursor = null) => {
+    cursor ? setLoadingMore(true) : setLoading(true);
+    try {
+      const response = await getMyWins(cursor ? { cursor } : {});
+      const page = response.data.wins || [];
+      setWins(prev => (cursor ? [...prev, ...page] : page));
+      setNextCursor(response.data.next_cursor);
+    } catch (err) {
+      setError(err.response?.data?.message || 'Failed to fetch your wins.');
+      console.error('Fetch my wins error:', err);
+    }
+    cursor ? setLoadingMore(false) : setLoading(false);
+  };
+
   useEffect(() => {
-    const fetchWins = async () => {
-      setLoading(true);
-      try {
-        const response = await getMyWins();
-        setWins(response.data.wins || []);
-      } catch (err) {
-        setError(err.response?.data?.message || 'Failed to fetch your wins.');
-        console.error('Fetch my wins error:', err);
-      }
-      setLoading(false);
-    };
     fetchWins();
   }, []);
 
@@ -33,10 +38,10 @@ function MyWinsPage() {
         <p>You haven't won any items yet. Keep bidding!</p>
       ) : (
         <div className='wins-list'>
-          {wins.map((win, index) => (
-            <div key={index} className='win-card'> {/* Assuming no unique win_id from backend for now, use index or ideally a proper ID */}
+          {wins.map(win => (
+            <div key={win.winner_id} className='win-card'>
               <h4>Lot #{win.lot_identifier} - {win.device_name}</h4>
-              {win.image_url && <img src={win.image_url} alt={win.device_name} className='win-lot-image' onError={(e) => e.target.style.display='none'}/>}
+              {win.thumbnail_url && <img src={imageSrc(win.thumbnail_url)} alt={win.device_name} className='win-lot-image' loading='lazy' onError={(e) => e.target.style.display='none'}/>}
               <p><strong>Auction:</strong> {win.auction_name}</p>
               <p><strong>Auction Ended:</strong> {new Date(win.auction_end_time).toLocaleString()}</p>
               <p><strong>Winning Bid:</strong> ${win.winning_amount.toFixed(2)}</p>
@@ -46,6 +51,11 @@ function MyWinsPage() {
           ))}
         </div>
       )}
+      {nextCursor && (
+        <button className='load-more-button' onClick={() => fetchWins(nextCursor)} disabled={loadingMore}>
+          {loadingMore ? 'Loading...' : 'Load More'}
+        </button>
+      )}
     </div>
   );
 }
@@ -8,11 +8,12 @@ const getAuthToken = () => localStorage.getItem('adminToken');
 const getAxiosConfig = () => ({ headers: { 'x-access-token': getAuthToken() } });
 
 // --- Carrier Methods ---
-export const getAllCarriers = async () => axios.get(ADMIN_CARRIERS_URL, getAxiosConfig());
+export const getAllCarriers = async (params = {}) => axios.get(ADMIN_CARRIERS_URL, { ...getAxiosConfig(), params });
 export const createCarrier = async (carrierData) => axios.post(ADMIN_CARRIERS_URL, carrierData, getAxiosConfig());
 
 // --- Auction Methods ---
-export const getAllAuctions = async () => axios.get(ADMIN_AUCTIONS_URL, getAxiosConfig());
+// params: { limit, cursor, status, carrier_id, is_visible, ends_after, ends_before }; responses carry next_cursor.
+export const getAllAuctions = async (params = {}) => axios.get(ADMIN_AUCTIONS_URL, { ...getAxiosConfig(), params });
 export const getAuctionById = async (auctionId) => axios.get(`${ADMIN_AUCTIONS_URL}/${auctionId}`, getAxiosConfig());
 export const createAuction = async (auctionData) => axios.post(ADMIN_AUCTIONS_URL, auctionData, getAxiosConfig());
 export const updateAuction = async (auctionId, auctionData) => axios.put(`${ADMIN_AUCTIONS_URL}/${auctionId}`, auctionData, getAxiosConfig());
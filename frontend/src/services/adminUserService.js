@@ -7,8 +7,9 @@ const getAuthToken = () => localStorage.getItem('adminToken');
 
 const getAxiosConfig = () => ({ headers: { 'x-access-token': getAuthToken() } });
 
-export const getAllUsers = async () => {
-  return axios.get(API_URL, getAxiosConfig());
+// params: { limit, cursor, role, deposit_status, is_active }; responses carry next_cursor.
+export const getAllUsers = async (params = {}) => {
+  return axios.get(API_URL, { ...getAxiosConfig(), params });
 };
 
 export const getUserById = async (userId) => {
@@ -16,9 +16,9 @@ export const getActiveAuctions = async (carrierId = null) => {
   return axios.get(url, getAxiosConfig());
 };
 
-// Fetch details for a single auction (for clients)
-export const getAuctionDetails = async (auctionId) => {
-  return axios.get(`${API_BASE_URL}/auctions/${auctionId}`, getAxiosConfig());
+// Fetch details for a single auction (for clients); lots are paged with { limit, cursor } and lots_next_cursor
+export const getAuctionDetails = async (auctionId, params = {}) => {
+  return axios.get(`${API_BASE_URL}/auctions/${auctionId}`, { ...getAxiosConfig(), params });
 };
 
 // Submit a bid for a lot
@@ -27,20 +27,79 @@ export const submitBid = async (auctionId, lotId, bidAmount) => {
   return axios.post(`${API_BASE_URL}/auctions/${auctionId}/lots/${lotId}/bid`, payload, getAxiosConfig());
 };
 
-// Fetch bids placed by the current client
-export const getMyBids = async () => {
-  return axios.get(`${API_BASE_URL}/my-bids`, getAxiosConfig());
+// Fetch bids placed by the current client; params: { limit, cursor, status, auction_id, placed_after, placed_before }
+export const getMyBids = async (params = {}) => {
+  return axios.get(`${API_BASE_URL}/my-bids`, { ...getAxiosConfig(), params });
 };
 
 // Fetch lots won by the current client (placeholder - backend endpoint TBD)
-export const getMyWins = async () => {
+export const getMyWins = async (params = {}) => {
   // This endpoint needs to be created in the backend first (e.g., GET /my-wins)
   // For now, returning a promise that resolves to an empty array or mock data.
   // console.warn('getMyWins service called - backend endpoint /my-wins is pending.');
   // Example: return axios.get(`${API_BASE_URL}/my-wins`, getAxiosConfig());
-  return axios.get(`${API_BASE_URL}/my-wins`, getAxiosConfig());
+  return axios.get(`${API_BASE_URL}/my-wins`, { ...getAxiosConfig(), params });
 };
 
+// Stored lot images come back as paths under the API (/images/...); originals are absolute URLs.
+export const imageSrc = (url) => (url && url.startsWith('/') ? `${API_BASE_URL}${url}` : url);
+
+// Delay before reopening a dropped event stream.
+const EVENT_STREAM_RETRY_MS = 3000;
+
+// Subscribe to live auction events (Server-Sent Events). auctionId null follows status/end-time changes of every auction.
+// handlers: { status, end_time, bid_accepted, time, reconnect }; each event handler receives the parsed event data,
+// reconnect is called once the stream is back after a drop (events may have been missed, so refetch).
+// Returns { close }.
+export const subscribeToAuctionEvents = (auctionId, handlers) => {
+  const path = auctionId ? `/auctions/${auctionId}/events` : '/auctions/events';
+  let source = null;
+  let closed = false;
+  let dropped = false;
+  let retryTimer = null;
+  const retry = () => {
+    dropped = true;
+    if (!closed) retryTimer = setTimeout(connect, EVENT_STREAM_RETRY_MS);
+  };
+  const connect = async () => {
+    // EventSource cannot send headers, so streams are opened with a short-lived ticket rather than the login token.
+    let ticket;
+    try {
+      ({ data: { ticket } } = await axios.post(`${API_BASE_URL}/auctions/events/ticket`, null, getAxiosConfig()));
+    } catch (err) {
+      retry();
+      return;
+    }
+    if (closed) return;
+    source = new EventSource(`${API_BASE_URL}${path}?ticket=${encodeURIComponent(ticket)}`);
+    ['status', 'end_time', 'bid_accepted', 'time'].forEach(type => {
+      if (handlers[type]) {
+        source.addEventListener(type, (event) => handlers[type](JSON.parse(event.data)));
+      }
+    });
+    // The browser would retry with the same, by then expired, ticket; reconnect with a new one instead.
+    source.onerror = () => {
+      source.close();
+      retry();
+    };
+    source.onopen = () => {
+      if (dropped && handlers.reconnect) handlers.reconnect();
+      dropped = false;
+    };
+  };
+  connect();
+  return {
+    close: () => {
+      closed = true;
+      clearTimeout(retryTimer);
+      if (source) source.close();
+    },
+  };
+};
+
+// Milliseconds to add to the local clock to get server time, from a 'time' event.
+export const serverClockOffset = (serverTime) => Date.parse(serverTime) - Date.now();
+
 // Fetch client's own profile
 export const getClientProfile = async () => {
  return axios.get(`${API_BASE_URL}/profile`, getAxiosConfig());
@@ -52,5 +111,7 @@ export default {
   submitBid,
   getMyBids,
   getMyWins,
+  subscribeToAuctionEvents,
+  serverClockOffset,
   getClientProfile
 };